@@ -0,0 +1,71 @@
+# Copyright (c) 2026 Aldo Hoeben / fieldOfView
+# The MaterialSettingsPlugin is released under the terms of the AGPLv3 or higher.
+
+from UM.Application import Application
+from UM.Settings.Interfaces import ContainerInterface
+
+from typing import Dict, Optional
+
+from .PluginProfiler import PluginProfiler
+
+
+class ContainerIdCache:
+    """Shared cache of container id lookups in the container registry.
+
+    The cache is kept correct by the registry signals: removed containers are dropped, and
+    lookups for containers that were not found or not loaded yet are retried once the
+    registry adds or finishes loading a container with that id.
+    """
+
+    __instance = None  # type: Optional[ContainerIdCache]
+
+    @classmethod
+    def getInstance(cls) -> "ContainerIdCache":
+        if cls.__instance is None:
+            cls.__instance = cls()
+        return cls.__instance
+
+    def __init__(self) -> None:
+        self._containers = {}  # type: Dict[str, ContainerInterface]
+        self._hits = 0
+        self._misses = 0
+
+        self._container_registry = Application.getInstance().getContainerRegistry()
+        self._container_registry.containerAdded.connect(self._onContainerAdded)
+        self._container_registry.containerRemoved.connect(self._onContainerRemoved)
+        self._container_registry.containerLoadComplete.connect(
+            self._onContainerLoadComplete
+        )
+
+    def findContainer(self, container_id: str) -> Optional[ContainerInterface]:
+        try:
+            container = self._containers[container_id]
+            self._hits += 1
+            return container
+        except KeyError:
+            pass
+
+        self._misses += 1
+        PluginProfiler.getInstance().increment("registry_queries")
+        containers = self._container_registry.findContainers(id=container_id)
+        if not containers:
+            return None
+
+        self._containers[container_id] = containers[0]
+        return containers[0]
+
+    def getStats(self) -> Dict[str, int]:
+        return {"size": len(self._containers), "hits": self._hits, "misses": self._misses}
+
+    def clear(self) -> None:
+        self._containers.clear()
+
+    def _onContainerAdded(self, container: ContainerInterface) -> None:
+        # A container with the same id replaces the cached container
+        self._containers.pop(container.getId(), None)
+
+    def _onContainerRemoved(self, container: ContainerInterface) -> None:
+        self._containers.pop(container.getId(), None)
+
+    def _onContainerLoadComplete(self, container_id: str) -> None:
+        self._containers.pop(container_id, None)
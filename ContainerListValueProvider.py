@@ -0,0 +1,45 @@
+# Copyright (c) 2026 Aldo Hoeben / fieldOfView
+# The MaterialSettingsPlugin is released under the terms of the AGPLv3 or higher.
+
+from UM.Settings.DefinitionContainer import DefinitionContainer
+from UM.Settings.Interfaces import ContainerInterface
+from UM.Settings.SettingDefinition import SettingDefinition
+from UM.Settings.SettingFunction import SettingFunction
+
+from typing import Any, List, Optional
+
+
+class ContainerListValueProvider:
+    """Resolves setting properties over a list of containers, from the top container down.
+
+    Properties are resolved like a ContainerStack does, so it can be passed to setting
+    functions and validators, but it is not a QObject and it does not connect to the
+    signals of its containers. This makes it cheap to create for a container that is only
+    looked at once.
+    """
+
+    def __init__(self, containers: List[ContainerInterface]) -> None:
+        self._containers = containers
+
+    def getContainers(self) -> List[ContainerInterface]:
+        return self._containers
+
+    def getRawProperty(self, key: str, property_name: str, context: Any = None) -> Any:
+        for container in self._containers:
+            value = container.getProperty(key, property_name, context)
+            if value is not None:
+                return value
+        return None
+
+    def getProperty(self, key: str, property_name: str, context: Any = None) -> Any:
+        value = self.getRawProperty(key, property_name, context)
+        if isinstance(value, SettingFunction):
+            value = value(self, context)
+        return value
+
+    def getSettingDefinition(self, key: str) -> Optional[SettingDefinition]:
+        bottom = self._containers[-1] if self._containers else None
+        if not isinstance(bottom, DefinitionContainer):
+            return None
+        definitions = bottom.findDefinitions(key=key)
+        return definitions[0] if definitions else None
@@ -0,0 +1,124 @@
+# Copyright (c) 2026 Aldo Hoeben / fieldOfView
+# The MaterialSettingsPlugin is released under the terms of the AGPLv3 or higher.
+
+from collections import OrderedDict
+import itertools
+
+from UM.Settings.ContainerRegistry import ContainerRegistry
+from UM.Settings.ContainerStack import ContainerStack
+
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class CustomStackPool:
+    """Hands out the container stacks used by CustomStackProxy objects.
+
+    Released stacks are kept for reuse, keyed by the container ids they hold. Only a
+    limited number of idle stacks is kept; the least recently released stacks are removed
+    from the container registry when that limit is exceeded.
+    """
+
+    def __init__(
+        self, container_registry: ContainerRegistry, max_idle_stacks: int = 4
+    ) -> None:
+        self._container_registry = container_registry
+        self._max_idle_stacks = max_idle_stacks
+
+        self._idle_stacks = (
+            OrderedDict()
+        )  # type: OrderedDict[Tuple[str, ...], ContainerStack]
+        self._stack_counter = itertools.count()
+
+        self._stacks_in_use = 0
+        self._hits = 0
+        self._misses = 0
+        self._created = 0
+        self._evicted = 0
+
+    def acquire(self, container_ids: List[str]) -> ContainerStack:
+        """Get a stack, preferably one that already holds the specified containers.
+
+        A stack holding other containers may be returned; the caller is expected to
+        update its containers.
+        """
+        stack = self._idle_stacks.pop(tuple(container_ids), None)
+        if stack is not None:
+            self._hits += 1
+        else:
+            self._misses += 1
+            if self._idle_stacks:
+                _, stack = self._idle_stacks.popitem(last=False)
+            else:
+                stack = self._createStack()
+
+        self._stacks_in_use += 1
+        return stack
+
+    def release(self, stack: ContainerStack, container_ids: List[str]) -> None:
+        self._stacks_in_use -= 1
+
+        key = tuple(container_ids)
+        displaced_stack = self._idle_stacks.pop(key, None)
+        if displaced_stack is not None and displaced_stack is not stack:
+            self._evict(displaced_stack)
+        self._idle_stacks[key] = stack
+
+        while len(self._idle_stacks) > self._max_idle_stacks:
+            _, evicted_stack = self._idle_stacks.popitem(last=False)
+            self._evict(evicted_stack)
+
+    def clear(self) -> None:
+        while self._idle_stacks:
+            _, stack = self._idle_stacks.popitem(last=False)
+            self._evict(stack)
+
+    def getStats(self) -> Dict[str, Any]:
+        requests = self._hits + self._misses
+        return {
+            "size": self._stacks_in_use + len(self._idle_stacks),
+            "in_use": self._stacks_in_use,
+            "idle": len(self._idle_stacks),
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_rate": self._hits / requests if requests else 0.0,
+            "created": self._created,
+            "evicted": self._evicted,
+        }
+
+    def _createStack(self) -> ContainerStack:
+        stack = ContainerStack("CustomStack%d" % next(self._stack_counter))
+        stack.setDirty(False)  # never save this stack
+        self._container_registry.addContainer(stack)
+        self._created += 1
+        return stack
+
+    def _evict(self, stack: ContainerStack) -> None:
+        self._container_registry.removeContainer(stack.getId())
+        self._evicted += 1
+
+
+class CustomStackLease:
+    """A stack taken from a CustomStackPool, together with the container ids it holds.
+
+    The stack is only acquired when it is first needed, so the pool can hand out a stack
+    that already holds the requested containers.
+    """
+
+    def __init__(self, stack_pool: CustomStackPool) -> None:
+        self._stack_pool = stack_pool
+        self._stack = None  # type: Optional[ContainerStack]
+        self.container_ids = []  # type: List[str]
+
+    def hasStack(self) -> bool:
+        return self._stack is not None
+
+    def getStack(self) -> ContainerStack:
+        if self._stack is None:
+            self._stack = self._stack_pool.acquire(self.container_ids)
+        return self._stack
+
+    def release(self, *args) -> None:
+        if self._stack is None:
+            return
+        self._stack_pool.release(self._stack, self.container_ids)
+        self._stack = None
@@ -2,67 +2,206 @@
 # The MaterialSettingsPlugin is released under the terms of the AGPLv3 or higher.
 
 from UM.Settings.ContainerStack import ContainerStack
-from UM.Application import Application
+from UM.Settings.Interfaces import ContainerInterface
 
 try:
     from cura.ApplicationMetadata import CuraSDKVersion
 except ImportError:  # Cura <= 3.6
     CuraSDKVersion = "6.0.0"
 if CuraSDKVersion >= "8.0.0":
-    from PyQt6.QtCore import QObject, pyqtProperty, pyqtSignal, pyqtSlot
+    from PyQt6.QtCore import QObject, QTimer, pyqtProperty, pyqtSignal, pyqtSlot
 else:
-    from PyQt5.QtCore import QObject, pyqtProperty, pyqtSignal, pyqtSlot
+    from PyQt5.QtCore import QObject, QTimer, pyqtProperty, pyqtSignal, pyqtSlot
 
-from typing import List
+from typing import List, Optional, Set
+
+from .ContainerIdCache import ContainerIdCache
+from .CustomStackPool import CustomStackPool, CustomStackLease
+from .MaterialSettingPropertiesModel import MaterialSettingPropertiesModel
+from .MaterialWriteCoalescer import MaterialWriteCoalescer
+from .PluginProfiler import PluginProfiler, profiled
 
 
 class CustomStackProxy(QObject):
-    def __init__(self, parent: QObject = None) -> None:
+    def __init__(
+        self,
+        stack_pool: CustomStackPool,
+        write_coalescer: MaterialWriteCoalescer,
+        parent: QObject = None,
+    ) -> None:
         super().__init__(parent)
 
-        self._container_ids = []  # type: List[str]
+        self._write_coalescer = write_coalescer
+        self._properties_model = None  # type: Optional[MaterialSettingPropertiesModel]
+        # Once the stack is returned to the pool, this proxy no longer uses or changes it
+        self._released = False
 
-        self._stack = ContainerStack("CustomStack" + str(id(self)))
-        self._stack_id = self._stack.id
-        self._stack.setDirty(False)  # never save this stack
+        # The machine, variant and material can change one after another; the container ids set
+        # in the same event loop turn are applied to the stack together
+        self._pending_container_ids = None  # type: Optional[List[str]]
+        self._apply_timer = QTimer(self)
+        self._apply_timer.setInterval(0)
+        self._apply_timer.setSingleShot(True)
+        self._apply_timer.timeout.connect(self._applyPendingContainerIds)
 
-        Application.getInstance().getContainerRegistry().addContainer(self._stack)
+        self._stack_lease = CustomStackLease(stack_pool)
+        # The lease is a plain Python object, so it can still return the stack to the pool when only
+        # the QObject part of this proxy is left
+        self.destroyed.connect(self._stack_lease.release)
 
     @pyqtProperty(str, constant=True)
     def stackId(self):
-        return self._stack_id
+        stack = self.getStack()
+        return stack.getId() if stack is not None else ""
 
-    # Set the containerIds property.
+    # Set the containerIds property. The stack is updated at the end of the event loop turn, or
+    # when it is used before that.
     def setContainerIds(self, container_ids: List[str]):
-        if container_ids == self._container_ids:
+        if self._released:
             return
-        self._container_ids = container_ids
-
-        while self._stack.getContainers():
-            self._stack.removeContainer(0)
-
+        if self._pending_container_ids is not None:
+            # The previous configuration was not applied yet, and never will be
+            PluginProfiler.getInstance().increment("suppressed_stack_rebuilds")
+        self._pending_container_ids = list(container_ids)
+        self._apply_timer.start()
+
+    def _applyPendingContainerIds(self) -> None:
+        if self._pending_container_ids is None:
+            return
+        self._apply_timer.stop()
+        container_ids = self._pending_container_ids
+        self._pending_container_ids = None
+        self._updateStack(container_ids)
+
+    @profiled("CustomStackProxy.updateStack")
+    def _updateStack(self, container_ids: List[str]) -> None:
+        if (
+            container_ids == self._stack_lease.container_ids
+            and self._stack_lease.hasStack()
+        ):
+            return
+        self._stack_lease.container_ids = container_ids
+        stack = self._stack_lease.getStack()
+
+        # Containers that are already in the stack do not need to be looked up again
+        current_containers = {
+            container.getId(): container for container in stack.getContainers()
+        }
+        container_id_cache = ContainerIdCache.getInstance()
+        new_containers = []  # type: List[ContainerInterface]
         for container_id in container_ids:
-            containers = (
-                Application.getInstance()
-                .getContainerRegistry()
-                .findContainers(id=container_id)
-            )
-            if containers:
-                self._stack.addContainer(containers[0])
+            container = current_containers.get(container_id)
+            if container is None:
+                container = container_id_cache.findContainer(container_id)
+            if container is not None:
+                new_containers.append(container)
 
-        self._stack.setDirty(False)  # never save this stack
+        changed_keys = self._updateContainers(stack, new_containers)
 
+        stack.setDirty(False)  # never save this stack
+
+        profiler = PluginProfiler.getInstance()
+        profiler.increment("signals.CustomStackProxy.containerIdsChanged")
         self.containerIdsChanged.emit()
+        if changed_keys:
+            profiler.increment("signals.CustomStackProxy.settingsChanged")
+            self.settingsChanged.emit(sorted(changed_keys))
+
+    def _updateContainers(
+        self, stack: ContainerStack, new_containers: List[ContainerInterface]
+    ) -> Set[str]:
+        """Update the stack to hold new_containers (bottom to top), touching only the containers that differ.
+
+        Returns the keys whose value differs between the containers that were swapped in and out.
+        """
+        # The stack lists its containers top to bottom, container ids are specified bottom to top
+        current_containers = stack.getContainers()[::-1]
+
+        unchanged = 0
+        while (
+            unchanged < min(len(current_containers), len(new_containers))
+            and current_containers[unchanged] is new_containers[unchanged]
+        ):
+            unchanged += 1
+
+        changed_keys = set()  # type: Set[str]
+        for old_container, new_container in zip(
+            current_containers[unchanged:], new_containers[unchanged:]
+        ):
+            for key in set(old_container.getAllKeys()) | set(new_container.getAllKeys()):
+                if old_container.getProperty(key, "value") != new_container.getProperty(
+                    key, "value"
+                ):
+                    changed_keys.add(key)
+        for container in (
+            current_containers[len(new_containers) :]
+            + new_containers[len(current_containers) :]
+        ):
+            changed_keys.update(container.getAllKeys())
+
+        PluginProfiler.getInstance().increment(
+            "stack_container_swaps",
+            max(len(current_containers), len(new_containers)) - unchanged,
+        )
+        for index in range(unchanged, min(len(current_containers), len(new_containers))):
+            stack.replaceContainer(
+                len(current_containers) - 1 - index,
+                new_containers[index],
+                postpone_emit=True,
+            )
+        for _ in range(len(current_containers) - len(new_containers)):
+            stack.removeContainer(0)
+        for container in new_containers[len(current_containers) :]:
+            stack.addContainer(container)
+        stack.sendPostponedEmits()
+
+        return changed_keys
 
     # Emitted when the containerIds property changes.
     containerIdsChanged = pyqtSignal()
 
+    # Emitted after the containerIds property changes with the keys that may have changed value.
+    settingsChanged = pyqtSignal("QVariantList")
+
     # The ID of the container we should query for property values.
     @pyqtProperty("QVariantList", fset=setContainerIds, notify=containerIdsChanged)
     def containerIds(self):
-        return self._container_ids
+        return self._stack_lease.container_ids
+
+    def getStack(self) -> Optional[ContainerStack]:
+        if self._released:
+            return None
+        self._applyPendingContainerIds()
+        return self._stack_lease.getStack()
+
+    # Properties of the settings in the stack, shared by all setting items that show them
+    @pyqtProperty(QObject, constant=True)
+    def propertiesModel(self) -> MaterialSettingPropertiesModel:
+        if self._properties_model is None:
+            self._properties_model = MaterialSettingPropertiesModel(self, parent=self)
+        return self._properties_model
+
+    def markContainerDirty(self, container: ContainerInterface) -> None:
+        """Mark a material container in the stack as changed, so it is saved."""
+        container.setDirty(True)
+        self._write_coalescer.markDirty(container.getMetaDataEntry("base_file"))
+
+    # Return the stack to the pool before this proxy is garbage collected
+    @pyqtSlot()
+    def releaseStack(self):
+        self._released = True
+        self._pending_container_ids = None
+        self._apply_timer.stop()
+        if self._properties_model is not None:
+            self._properties_model.stopUpdates()
+        self._stack_lease.release()
 
     @pyqtSlot(str)
+    @profiled("CustomStackProxy.removeInstanceFromTop")
     def removeInstanceFromTop(self, key):
-        self._stack.getTop().removeInstance(key)
-        self._stack.getTop().setDirty(True)
+        stack = self.getStack()
+        if stack is None:
+            return
+        container = stack.getTop()
+        container.removeInstance(key)
+        self.markContainerDirty(container)
@@ -0,0 +1,335 @@
+# Copyright (c) 2026 Aldo Hoeben / fieldOfView
+# The MaterialSettingsPlugin is released under the terms of the AGPLv3 or higher.
+
+try:
+    from cura.ApplicationMetadata import CuraSDKVersion
+except ImportError:  # Cura <= 3.6
+    CuraSDKVersion = "6.0.0"
+if CuraSDKVersion >= "8.0.0":
+    from PyQt6.QtCore import (
+        QAbstractListModel,
+        QModelIndex,
+        QObject,
+        Qt,
+        pyqtProperty,
+        pyqtSignal,
+        pyqtSlot,
+    )
+else:
+    from PyQt5.QtCore import (
+        QAbstractListModel,
+        QModelIndex,
+        QObject,
+        Qt,
+        pyqtProperty,
+        pyqtSignal,
+        pyqtSlot,
+    )
+
+from UM.Application import Application
+from UM.Settings.ContainerRegistry import ContainerRegistry
+from UM.Settings.DefinitionContainer import DefinitionContainer
+from UM.Settings.Interfaces import ContainerInterface
+from cura.Settings.ExtruderManager import ExtruderManager
+
+from typing import Any, Dict, List, Optional
+
+from .ContainerIdCache import ContainerIdCache
+from .ContainerListValueProvider import ContainerListValueProvider
+from .MaterialSettingsPluginVisibilityHandler import (
+    MaterialSettingsPluginVisibilityHandler,
+)
+from .PluginProfiler import PluginProfiler, profiled
+
+
+class MaterialComparisonModel(QAbstractListModel):
+    """Compares the values of the visible material settings across a number of materials.
+
+    Each material is resolved on top of the active variant and definition, like CustomStackProxy
+    does. The materials are listed from their metadata, and a material container is only loaded
+    when the first rows of its column are resolved. The values are stored per material, as a
+    column of values with one entry per key. Rows are added as the view asks for them; each
+    chunk of rows is resolved for all materials together. A cell is marked when its value
+    differs from the value of the reference material, which is the first material unless
+    another one is specified.
+    """
+
+    KeyRole = Qt.ItemDataRole.UserRole + 1
+    LabelRole = Qt.ItemDataRole.UserRole + 2
+    ValuesRole = Qt.ItemDataRole.UserRole + 3
+    DifferingRole = Qt.ItemDataRole.UserRole + 4
+    OverriddenRole = Qt.ItemDataRole.UserRole + 5
+    DiffersRole = Qt.ItemDataRole.UserRole + 6
+
+    # Number of keys resolved for all materials when the view asks for more rows
+    ROWS_PER_FETCH = 50
+
+    def __init__(
+        self,
+        container_registry: ContainerRegistry,
+        visibility_handler: MaterialSettingsPluginVisibilityHandler,
+        parent: QObject = None,
+    ) -> None:
+        super().__init__(parent)
+
+        self._container_registry = container_registry
+        self._visibility_handler = visibility_handler
+
+        self._definition = None  # type: Optional[DefinitionContainer]
+        self._base_files = []  # type: List[str]
+        self._material_names = []  # type: List[str]
+        # The column that the values of the other materials are compared with
+        self._reference_column = 0
+        self._variant = None  # type: Optional[ContainerInterface]
+        # The id of the container that is compared for each material, and its value provider once it is loaded
+        self._container_ids = []  # type: List[str]
+        self._value_providers = []  # type: List[Optional[ContainerListValueProvider]]
+        self._keys = []  # type: List[str]
+        self._show_only_differences = False
+
+        # Columns of resolved values per material, filled up to _resolved_count keys
+        self._value_columns = []  # type: List[List[str]]
+        self._overridden_columns = []  # type: List[List[bool]]
+        self._resolved_count = 0
+        # Indices in _keys of the rows that are shown
+        self._rows = []  # type: List[int]
+
+    materialsChanged = pyqtSignal()
+    showOnlyDifferencesChanged = pyqtSignal()
+
+    def roleNames(self) -> Dict[int, bytes]:
+        return {
+            self.KeyRole: b"key",
+            self.LabelRole: b"label",
+            self.ValuesRole: b"values",
+            self.DifferingRole: b"differing",
+            self.OverriddenRole: b"overridden",
+            self.DiffersRole: b"differs",
+        }
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self._rows)
+
+    def data(self, index: QModelIndex, role: int) -> Any:
+        if not index.isValid() or index.row() >= len(self._rows):
+            return None
+        key_index = self._rows[index.row()]
+        key = self._keys[key_index]
+
+        if role == self.KeyRole:
+            return key
+        if role == self.LabelRole:
+            definitions = self._definition.findDefinitions(key=key)
+            return definitions[0].label if definitions else key
+        if role == self.ValuesRole:
+            return [column[key_index] for column in self._value_columns]
+        if role == self.DifferingRole:
+            return self._getDiffering(key_index)
+        if role == self.OverriddenRole:
+            return [column[key_index] for column in self._overridden_columns]
+        if role == self.DiffersRole:
+            return self._differsFromReference(key_index)
+        return None
+
+    def canFetchMore(self, parent: QModelIndex = QModelIndex()) -> bool:
+        return not parent.isValid() and self._resolved_count < len(self._keys)
+
+    @profiled("MaterialComparisonModel.fetchMore")
+    def fetchMore(self, parent: QModelIndex = QModelIndex()) -> None:
+        if parent.isValid():
+            return
+        rows = []  # type: List[int]
+        # When only differences are shown, keep resolving until there is something to show
+        while self._resolved_count < len(self._keys) and not rows:
+            rows = [
+                key_index
+                for key_index in self._resolveNextKeys()
+                if not self._show_only_differences or self._differsFromReference(key_index)
+            ]
+        if not rows:
+            return
+
+        self.beginInsertRows(QModelIndex(), len(self._rows), len(self._rows) + len(rows) - 1)
+        self._rows.extend(rows)
+        self.endInsertRows()
+
+    @pyqtProperty("QStringList", notify=materialsChanged)
+    def baseFiles(self) -> List[str]:
+        return self._base_files
+
+    @pyqtProperty("QStringList", notify=materialsChanged)
+    def materialNames(self) -> List[str]:
+        return self._material_names
+
+    @pyqtProperty(int, notify=materialsChanged)
+    def referenceColumn(self) -> int:
+        return self._reference_column
+
+    def setShowOnlyDifferences(self, show_only_differences: bool) -> None:
+        if show_only_differences == self._show_only_differences:
+            return
+        self._show_only_differences = show_only_differences
+        self.showOnlyDifferencesChanged.emit()
+
+        # The keys that were resolved are shown again without resolving them again
+        self.beginResetModel()
+        self._rows = [
+            key_index
+            for key_index in range(self._resolved_count)
+            if not show_only_differences or self._differsFromReference(key_index)
+        ]
+        self.endResetModel()
+
+    @pyqtProperty(bool, fset=setShowOnlyDifferences, notify=showOnlyDifferencesChanged)
+    def showOnlyDifferences(self) -> bool:
+        return self._show_only_differences
+
+    @pyqtSlot(str)
+    def compareFamily(self, base_file: str) -> None:
+        """Compare a material with the other materials of the same brand and type, eg all PLAs of a brand."""
+        metadata = self._container_registry.findInstanceContainersMetadata(id=base_file)
+        if not metadata:
+            self.compare([])
+            return
+        base_files = sorted(
+            (
+                str(family_metadata.get("name", "")),
+                family_metadata["id"],
+            )
+            for family_metadata in self._container_registry.findInstanceContainersMetadata(
+                type="material",
+                brand=metadata[0].get("brand"),
+                material=metadata[0].get("material"),
+            )
+            if family_metadata["id"] == family_metadata.get("base_file")
+        )
+        self.compare([family_base_file for _, family_base_file in base_files], base_file)
+
+    @pyqtSlot("QStringList")
+    @profiled("MaterialComparisonModel.compare")
+    def compare(self, base_files: List[str], reference_base_file: str = "") -> None:
+        """Compare a set of materials in the active definition and variant.
+
+        The values are compared with those of reference_base_file, or of the first material.
+        """
+        self.beginResetModel()
+
+        self._definition = None
+        self._base_files = []
+        self._material_names = []
+        self._reference_column = 0
+        self._variant = None
+        self._container_ids = []
+        self._value_providers = []
+        self._keys = []
+        self._value_columns = []
+        self._overridden_columns = []
+        self._resolved_count = 0
+        self._rows = []
+
+        global_stack = Application.getInstance().getGlobalContainerStack()
+        if global_stack:
+            definition = global_stack.getBottom()
+            extruder_stack = ExtruderManager.getInstance().getActiveExtruderStack()
+            self._variant = extruder_stack.variant if extruder_stack else None
+
+            for base_file in base_files:
+                metadata = self._container_registry.findInstanceContainersMetadata(id=base_file)
+                if not metadata:
+                    continue
+
+                self._base_files.append(base_file)
+                self._material_names.append(str(metadata[0].get("name", base_file)))
+                self._container_ids.append(
+                    self._findMaterialContainerId(base_file, definition.getId(), self._variant)
+                )
+                self._value_providers.append(None)
+                self._value_columns.append([])
+                self._overridden_columns.append([])
+
+        if self._base_files:
+            self._definition = definition
+            if reference_base_file in self._base_files:
+                self._reference_column = self._base_files.index(reference_base_file)
+            # The keys are compared in the order in which they are listed in the definition
+            visible_keys = set(self._visibility_handler.getVisible())
+            self._keys = [
+                setting_definition.key
+                for setting_definition in definition.findDefinitions()
+                if setting_definition.key in visible_keys
+            ]
+
+        self.endResetModel()
+        self.materialsChanged.emit()
+
+    def _findMaterialContainerId(
+        self, base_file: str, definition_id: str, variant: Optional[ContainerInterface]
+    ) -> str:
+        """Find the id of the container of a material that the active definition and variant would use."""
+        queries = []  # type: List[Dict[str, str]]
+        if variant is not None:
+            queries.append({"variant_name": variant.getName()})
+        queries.append({})
+
+        for query in queries:
+            for metadata in self._container_registry.findInstanceContainersMetadata(
+                base_file=base_file, definition=definition_id, **query
+            ):
+                if query or not metadata.get("variant_name"):
+                    return metadata["id"]
+        return base_file
+
+    def _getValueProvider(self, column: int) -> Optional[ContainerListValueProvider]:
+        """Load the material container of a column, the first time the column is resolved."""
+        value_provider = self._value_providers[column]
+        if value_provider is None:
+            material = ContainerIdCache.getInstance().findContainer(self._container_ids[column])
+            if material is None:
+                return None
+            containers = [material]  # type: List[ContainerInterface]
+            if self._variant is not None:
+                containers.append(self._variant)
+            containers.append(self._definition)
+            value_provider = ContainerListValueProvider(containers)
+            self._value_providers[column] = value_provider
+        return value_provider
+
+    def _resolveNextKeys(self) -> List[int]:
+        """Resolve the next chunk of keys for all materials. Returns the indices of those keys."""
+        start = self._resolved_count
+        keys = self._keys[start : start + self.ROWS_PER_FETCH]
+        for column, (values, overridden) in enumerate(
+            zip(self._value_columns, self._overridden_columns)
+        ):
+            value_provider = self._getValueProvider(column)
+            if value_provider is None:
+                # The material container could not be loaded
+                values.extend([""] * len(keys))
+                overridden.extend([False] * len(keys))
+                continue
+            material = value_provider.getContainers()[0]
+            for key in keys:
+                values.append(self._formatValue(value_provider.getProperty(key, "value")))
+                overridden.append(material.getProperty(key, "value") is not None)
+        self._resolved_count += len(keys)
+
+        PluginProfiler.getInstance().increment(
+            "comparison_cells_resolved", len(keys) * len(self._value_columns)
+        )
+        return list(range(start, self._resolved_count))
+
+    def _formatValue(self, value: Any) -> str:
+        if isinstance(value, float):
+            return "%g" % value
+        return str(value) if value is not None else ""
+
+    def _getDiffering(self, key_index: int) -> List[bool]:
+        """Mark the cells of a row whose value differs from the value of the reference material."""
+        reference_value = self._value_columns[self._reference_column][key_index]
+        return [column[key_index] != reference_value for column in self._value_columns]
+
+    def _differsFromReference(self, key_index: int) -> bool:
+        reference_value = self._value_columns[self._reference_column][key_index]
+        return any(column[key_index] != reference_value for column in self._value_columns)
@@ -0,0 +1,70 @@
+# Copyright (c) 2026 Aldo Hoeben / fieldOfView
+# The MaterialSettingsPlugin is released under the terms of the AGPLv3 or higher.
+
+from UM.Settings.ContainerRegistry import ContainerRegistry
+from UM.Settings.ContainerStack import ContainerStack
+from UM.Util import parseBool
+
+from typing import Any, Dict, List, Optional
+
+
+def findCompatibleMaterials(
+    container_registry: ContainerRegistry,
+    global_stack: ContainerStack,
+    extruder_stack: Optional[ContainerStack] = None,
+) -> Dict[str, List[Dict[str, Any]]]:
+    """Find the materials that a machine can use, like the materials list of Cura does.
+
+    Returns the metadata of the material containers per base_file: the containers for the
+    machine definition and its variants if the machine has them, or else the base material.
+    Materials for another filament diameter than that of the extruder are left out, as are
+    the materials that the machine definition excludes. Only metadata is queried, so no
+    material containers are loaded.
+    """
+    definition = global_stack.getBottom()
+    if not parseBool(definition.getMetaDataEntry("has_materials", True)):
+        return {}
+
+    materials = {}  # type: Dict[str, List[Dict[str, Any]]]
+    for metadata in container_registry.findInstanceContainersMetadata(
+        type="material", definition="fdmprinter"
+    ):
+        base_file = metadata.get("base_file")
+        if metadata["id"] == base_file:
+            materials[base_file] = [metadata]
+
+    if parseBool(definition.getMetaDataEntry("has_machine_materials", False)):
+        machine_materials = {}  # type: Dict[str, List[Dict[str, Any]]]
+        for metadata in container_registry.findInstanceContainersMetadata(
+            type="material", definition=definition.getId()
+        ):
+            base_file = metadata.get("base_file")
+            if base_file:
+                machine_materials.setdefault(base_file, []).append(metadata)
+        # The containers for the machine take the place of the base material
+        materials.update(machine_materials)
+
+    exclude_materials = definition.getMetaDataEntry("exclude_materials", [])
+    approximate_diameter = _getApproximateDiameter(extruder_stack or global_stack)
+    return {
+        base_file: material_metadata
+        for base_file, material_metadata in materials.items()
+        if not any(excluded in base_file for excluded in exclude_materials)
+        and _hasDiameter(material_metadata[0], approximate_diameter)
+    }
+
+
+def _getApproximateDiameter(stack: ContainerStack) -> Optional[int]:
+    try:
+        return round(float(stack.getProperty("material_diameter", "value")))
+    except (TypeError, ValueError):
+        return None
+
+
+def _hasDiameter(metadata: Dict[str, Any], approximate_diameter: Optional[int]) -> bool:
+    if approximate_diameter is None or "approximate_diameter" not in metadata:
+        return True
+    try:
+        return round(float(metadata["approximate_diameter"])) == approximate_diameter
+    except (TypeError, ValueError):
+        return False
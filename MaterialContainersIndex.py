@@ -0,0 +1,56 @@
+# Copyright (c) 2026 Aldo Hoeben / fieldOfView
+# The MaterialSettingsPlugin is released under the terms of the AGPLv3 or higher.
+
+from UM.Settings.ContainerRegistry import ContainerRegistry
+from UM.Settings.Interfaces import ContainerInterface
+
+from typing import Dict, List
+
+from .PluginProfiler import PluginProfiler
+
+
+class MaterialContainersIndex:
+    """Maps a material base_file to the instance containers derived from it.
+
+    Entries are filled on first lookup and kept up to date from the container registry
+    signals, so repeated edits to the same material do not query the registry again.
+    """
+
+    def __init__(self, container_registry: ContainerRegistry) -> None:
+        self._container_registry = container_registry
+        self._containers_by_base_file = {}  # type: Dict[str, List[ContainerInterface]]
+
+        self._container_registry.containerAdded.connect(self._onContainerAdded)
+        self._container_registry.containerRemoved.connect(self._onContainerRemoved)
+
+    def getContainers(self, base_file: str) -> List[ContainerInterface]:
+        try:
+            return self._containers_by_base_file[base_file]
+        except KeyError:
+            pass
+
+        PluginProfiler.getInstance().increment("registry_queries")
+        containers = list(
+            self._container_registry.findInstanceContainers(base_file=base_file)
+        )
+        self._containers_by_base_file[base_file] = containers
+        return containers
+
+    def clear(self) -> None:
+        self._containers_by_base_file.clear()
+
+    def _onContainerAdded(self, container: ContainerInterface) -> None:
+        base_file = container.getMetaDataEntry("base_file")
+        containers = self._containers_by_base_file.get(base_file)
+        if containers is not None and container not in containers:
+            containers.append(container)
+
+    def _onContainerRemoved(self, container: ContainerInterface) -> None:
+        base_file = container.getMetaDataEntry("base_file")
+        containers = self._containers_by_base_file.get(base_file)
+        if containers is None:
+            return
+        try:
+            containers.remove(container)
+        except ValueError:
+            pass
@@ -0,0 +1,261 @@
+# Copyright (c) 2026 Aldo Hoeben / fieldOfView
+# The MaterialSettingsPlugin is released under the terms of the AGPLv3 or higher.
+
+try:
+    from cura.ApplicationMetadata import CuraSDKVersion
+except ImportError:  # Cura <= 3.6
+    CuraSDKVersion = "6.0.0"
+if CuraSDKVersion >= "8.0.0":
+    from PyQt6.QtCore import QObject, QTimer, pyqtProperty, pyqtSignal, pyqtSlot
+else:
+    from PyQt5.QtCore import QObject, QTimer, pyqtProperty, pyqtSignal, pyqtSlot
+
+import collections
+import time
+
+from UM.Application import Application
+from UM.Logger import Logger
+from UM.Settings.ContainerRegistry import ContainerRegistry
+from UM.Settings.ContainerStack import ContainerStack
+from UM.Settings.DefinitionContainer import DefinitionContainer
+from UM.Settings.Interfaces import ContainerInterface
+from UM.Settings.SettingDefinition import SettingDefinition
+from UM.Settings.SettingFunction import SettingFunction
+from UM.Settings.Validator import ValidatorState
+from cura.Settings.ExtruderManager import ExtruderManager
+
+from typing import Any, Deque, Dict, FrozenSet, List, Optional, Tuple
+
+from .ContainerIdCache import ContainerIdCache
+from .ContainerListValueProvider import ContainerListValueProvider
+from .MaterialCompatibility import findCompatibleMaterials
+from .MaterialSettableKeysIndex import MaterialSettableKeysIndex
+from .PluginProfiler import PluginProfiler, profiled
+
+# A material container to validate, with the variant to validate it in: (base_file, container_id, variant)
+ValidationTask = Tuple[str, str, Optional[ContainerInterface]]
+
+
+class MaterialLibraryValidator(QObject):
+    """Checks the setting values of the materials of the active machine against its definition and variants.
+
+    Each material container is validated in the layout of CustomStackProxy: the material on
+    top of a variant and the machine definition. The container registry and the containers
+    are not thread-safe, so the containers are validated on the main thread, a few at a time
+    per timer tick. Material containers are only loaded when it is their turn.
+    """
+
+    ERROR_STATES = frozenset(
+        [
+            ValidatorState.Exception,
+            ValidatorState.Invalid,
+            ValidatorState.MinimumError,
+            ValidatorState.MaximumError,
+        ]
+    )
+    WARNING_STATES = frozenset(
+        [ValidatorState.MinimumWarning, ValidatorState.MaximumWarning]
+    )
+
+    # Time spent validating per timer tick, in seconds, so the interface stays responsive
+    TIME_SLICE = 0.01
+
+    def __init__(self, container_registry: ContainerRegistry, parent: QObject = None) -> None:
+        super().__init__(parent)
+
+        self._container_registry = container_registry
+
+        self._definition = None  # type: Optional[DefinitionContainer]
+        self._keys = frozenset()  # type: FrozenSet[str]
+        self._tasks = collections.deque()  # type: Deque[ValidationTask]
+        self._total_tasks = 0
+        self._finished_tasks = 0
+        self._results = {}  # type: Dict[str, Dict[str, Any]]
+
+        self._validate_timer = QTimer(self)
+        self._validate_timer.setInterval(0)
+        self._validate_timer.timeout.connect(self._validateNextTasks)
+
+        # Notify QML of new results at most once per interval
+        self._results_timer = QTimer(self)
+        self._results_timer.setInterval(100)
+        self._results_timer.setSingleShot(True)
+        self._results_timer.timeout.connect(self.resultsChanged)
+
+    runningChanged = pyqtSignal()
+    resultsChanged = pyqtSignal()
+
+    # Emitted with the result of each validated material container
+    materialValidated = pyqtSignal("QVariantMap")
+
+    @pyqtProperty(bool, notify=runningChanged)
+    def running(self) -> bool:
+        return self._validate_timer.isActive()
+
+    @pyqtProperty(int, notify=resultsChanged)
+    def totalCount(self) -> int:
+        return self._total_tasks
+
+    @pyqtProperty(int, notify=resultsChanged)
+    def finishedCount(self) -> int:
+        return self._finished_tasks
+
+    # Materials with errors or warnings, sorted by the number of errors
+    @pyqtProperty("QVariantList", notify=resultsChanged)
+    def results(self) -> List[Dict[str, Any]]:
+        return sorted(
+            self._results.values(),
+            key=lambda result: (-result["errors"], -result["warnings"], result["name"]),
+        )
+
+    @pyqtSlot()
+    @profiled("MaterialLibraryValidator.start")
+    def start(self) -> None:
+        self.cancel()
+
+        global_stack = Application.getInstance().getGlobalContainerStack()
+        if not global_stack:
+            return
+        self._definition = global_stack.getBottom()
+        self._keys = MaterialSettableKeysIndex.getInstance().getKeys(self._definition)
+
+        self._results = {}
+        self._finished_tasks = 0
+        extruder_manager = ExtruderManager.getInstance()
+        extruder_stack = extruder_manager.getActiveExtruderStack() if extruder_manager else None
+        self._tasks = collections.deque(self._createTasks(global_stack, extruder_stack))
+        self._total_tasks = len(self._tasks)
+        PluginProfiler.getInstance().increment("material_validation_tasks", len(self._tasks))
+
+        if self._tasks:
+            self._validate_timer.start()
+            self.runningChanged.emit()
+        self.resultsChanged.emit()
+
+    @pyqtSlot()
+    def cancel(self) -> None:
+        self._tasks.clear()
+        if not self._validate_timer.isActive():
+            return
+        self._validate_timer.stop()
+        self._results_timer.stop()
+        self.runningChanged.emit()
+        self.resultsChanged.emit()
+
+    def _createTasks(
+        self, global_stack: ContainerStack, extruder_stack: Optional[ContainerStack]
+    ) -> List[ValidationTask]:
+        """List the material containers that the machine can use, with the variant to validate them in."""
+        variants_by_name = {
+            variant.getName(): variant
+            for variant in self._container_registry.findInstanceContainers(
+                type="variant", definition=global_stack.getBottom().getId()
+            )
+        }
+
+        tasks = []  # type: List[ValidationTask]
+        for base_file, material_metadata in findCompatibleMaterials(
+            self._container_registry, global_stack, extruder_stack
+        ).items():
+            if material_metadata[0]["id"] != base_file:
+                # Containers of the material for this machine, or for a variant of this machine
+                for metadata in material_metadata:
+                    variant = variants_by_name.get(metadata.get("variant_name"))
+                    tasks.append((base_file, metadata["id"], variant))
+                continue
+
+            # The machine uses the base material, in any of its variants
+            for variant in list(variants_by_name.values()) or [None]:
+                tasks.append((base_file, base_file, variant))
+
+        return tasks
+
+    def _validateNextTasks(self) -> None:
+        end_time = time.perf_counter() + self.TIME_SLICE
+        while self._tasks and time.perf_counter() < end_time:
+            base_file, container_id, variant = self._tasks.popleft()
+            self._onMaterialValidated(self._validateMaterial(base_file, container_id, variant))
+
+        if not self._tasks:
+            self._validate_timer.stop()
+            self._results_timer.stop()
+            self.runningChanged.emit()
+            self.resultsChanged.emit()
+
+    def _validateMaterial(
+        self, base_file: str, container_id: str, variant: Optional[ContainerInterface]
+    ) -> Dict[str, Any]:
+        entries = []  # type: List[Dict[str, Any]]
+        material = ContainerIdCache.getInstance().findContainer(container_id)
+        if material is not None:
+            containers = [material]  # type: List[ContainerInterface]
+            if variant is not None:
+                containers.append(variant)
+            containers.append(self._definition)
+            value_provider = ContainerListValueProvider(containers)
+
+            for key in sorted(self._keys.intersection(material.getAllKeys())):
+                state = self._validate(value_provider, key)
+                if state in self.ERROR_STATES or state in self.WARNING_STATES:
+                    value = material.getProperty(key, "value")
+                    if isinstance(value, SettingFunction):
+                        value = str(value)
+                    entries.append(
+                        {
+                            "key": key,
+                            "state": state.name,
+                            "error": state in self.ERROR_STATES,
+                            "value": value,
+                        }
+                    )
+
+        return {
+            "base_file": base_file,
+            "container_id": container_id,
+            "variant": variant.getName() if variant is not None else "",
+            "entries": entries,
+        }
+
+    def _validate(
+        self, value_provider: ContainerListValueProvider, key: str
+    ) -> Optional[ValidatorState]:
+        # Like the MachineErrorChecker of Cura, validate with the validator for the type of the setting
+        try:
+            definition = value_provider.getSettingDefinition(key)
+            if definition is None:
+                return None
+            validator_type = SettingDefinition.getValidatorForType(definition.type)
+            if validator_type is None:
+                return None
+            return validator_type(key)(value_provider)
+        except Exception:
+            Logger.logException("w", "Could not validate setting %s" % key)
+            return ValidatorState.Exception
+
+    def _onMaterialValidated(self, result: Dict[str, Any]) -> None:
+        self._finished_tasks += 1
+        self.materialValidated.emit(result)
+
+        if result["entries"]:
+            base_file = result["base_file"]
+            material_result = self._results.get(base_file)
+            if material_result is None:
+                metadata = self._container_registry.findInstanceContainersMetadata(id=base_file)
+                material_result = {
+                    "base_file": base_file,
+                    "name": metadata[0].get("name", base_file) if metadata else base_file,
+                    "errors": 0,
+                    "warnings": 0,
+                    "entries": [],
+                }
+                self._results[base_file] = material_result
+
+            for entry in result["entries"]:
+                if entry["error"]:
+                    material_result["errors"] += 1
+                else:
+                    material_result["warnings"] += 1
+                material_result["entries"].append(dict(entry, variant=result["variant"]))
+
+        if not self._results_timer.isActive():
+            self._results_timer.start()
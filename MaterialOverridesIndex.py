@@ -0,0 +1,277 @@
+# Copyright (c) 2026 Aldo Hoeben / fieldOfView
+# The MaterialSettingsPlugin is released under the terms of the AGPLv3 or higher.
+
+import functools
+
+try:
+    from cura.ApplicationMetadata import CuraSDKVersion
+except ImportError:  # Cura <= 3.6
+    CuraSDKVersion = "6.0.0"
+if CuraSDKVersion >= "8.0.0":
+    from PyQt6.QtCore import QObject, QTimer, pyqtProperty, pyqtSignal, pyqtSlot
+else:
+    from PyQt5.QtCore import QObject, QTimer, pyqtProperty, pyqtSignal, pyqtSlot
+
+from UM.Settings.ContainerRegistry import ContainerRegistry
+from UM.Settings.Interfaces import ContainerInterface
+from UM.Settings.SettingFunction import SettingFunction
+
+from typing import Any, Callable, Dict, List, Set, Tuple
+
+from .ContainerIdCache import ContainerIdCache
+from .MaterialSettingsPluginVisibilityHandler import (
+    MaterialSettingsPluginVisibilityHandler,
+)
+from .PluginProfiler import PluginProfiler, profiled
+
+
+class MaterialOverridesIndex(QObject):
+    """Knows which materials set which of the visible material settings, and to what value.
+
+    The index holds key -> {base_file: {container_id: value}} and base_file -> keys, so a
+    material counts as setting a value if its base container or any of its derived
+    containers does. It is built on first use, and then kept up to date from the
+    propertyChanged signals of the material containers and the container registry signals.
+
+    Building the index does not load any containers. It starts out with the material
+    containers that the container registry has already loaded, and adds the others as they
+    are loaded, eg when a material is shown or prefetched. Until then the results are
+    partial; unloadedMaterialsCount tells how many materials are not included yet.
+    """
+
+    def __init__(
+        self,
+        container_registry: ContainerRegistry,
+        visibility_handler: MaterialSettingsPluginVisibilityHandler,
+        parent: QObject = None,
+    ) -> None:
+        super().__init__(parent)
+
+        self._container_registry = container_registry
+        self._visibility_handler = visibility_handler
+
+        self._built = False
+        self._visible_keys = set()  # type: Set[str]
+        self._values_by_key = {}  # type: Dict[str, Dict[str, Dict[str, Any]]]
+        self._keys_by_base_file = {}  # type: Dict[str, Set[str]]
+        # container_id -> base_file of the material containers that are not loaded, and so not indexed yet
+        self._unloaded_base_files = {}  # type: Dict[str, str]
+        # The signals of containers keep weak references, so the connected callbacks are kept here
+        self._connected_containers = {}  # type: Dict[str, Tuple[ContainerInterface, Callable]]
+
+        self._revision = 0
+        # Notify QML once after a batch of changes
+        self._changed_timer = QTimer(self)
+        self._changed_timer.setInterval(0)
+        self._changed_timer.setSingleShot(True)
+        self._changed_timer.timeout.connect(self._emitOverridesChanged)
+
+        self._container_registry.containerAdded.connect(self._onContainerAdded)
+        self._container_registry.containerRemoved.connect(self._onContainerRemoved)
+        self._container_registry.containerLoadComplete.connect(
+            self._onContainerLoadComplete
+        )
+        self._visibility_handler.visibilityChanged.connect(self._onVisibilityChanged)
+
+    overridesChanged = pyqtSignal()
+
+    # Changes whenever the index changes, so QML bindings that use the slots below are re-evaluated
+    @pyqtProperty(int, notify=overridesChanged)
+    def revision(self) -> int:
+        return self._revision
+
+    # The number of materials that have containers that are not indexed yet, because they are not loaded
+    @pyqtProperty(int, notify=overridesChanged)
+    def unloadedMaterialsCount(self) -> int:
+        self._ensureBuilt()
+        return len(set(self._unloaded_base_files.values()))
+
+    @pyqtSlot(str, result="QVariantMap")
+    def getOverridingMaterials(self, key: str) -> Dict[str, Any]:
+        """Return the base_files of the materials that set a value for key, with their values.
+
+        The value of the base container is preferred over the values of derived containers.
+        """
+        self._ensureBuilt()
+        result = {}  # type: Dict[str, Any]
+        for base_file, values in self._values_by_key.get(key, {}).items():
+            value = values.get(base_file, next(iter(values.values())))
+            if isinstance(value, SettingFunction):
+                value = str(value)
+            result[base_file] = value
+        return result
+
+    @pyqtSlot(str, result=int)
+    def getOverridingMaterialsCount(self, key: str) -> int:
+        self._ensureBuilt()
+        return len(self._values_by_key.get(key, {}))
+
+    @pyqtSlot(str, result="QStringList")
+    def getOverriddenKeys(self, container_id: str) -> List[str]:
+        """Return the keys that the material of a container, or a base_file, sets a value for."""
+        self._ensureBuilt()
+        return sorted(self._keys_by_base_file.get(self._getBaseFile(container_id), set()))
+
+    @pyqtSlot(str, str, result=bool)
+    def isOverridden(self, container_id: str, key: str) -> bool:
+        self._ensureBuilt()
+        return key in self._keys_by_base_file.get(self._getBaseFile(container_id), set())
+
+    def _getBaseFile(self, container_id: str) -> str:
+        try:
+            return self._connected_containers[container_id][0].getMetaDataEntry(
+                "base_file", container_id
+            )
+        except KeyError:
+            pass
+        metadata = self._container_registry.findInstanceContainersMetadata(id=container_id)
+        if not metadata:
+            return container_id
+        return metadata[0].get("base_file", container_id)
+
+    @profiled("MaterialOverridesIndex.build")
+    def _ensureBuilt(self) -> None:
+        if self._built:
+            return
+        self._built = True
+
+        PluginProfiler.getInstance().increment("overrides_index_builds")
+        self._visible_keys = set(self._visibility_handler.getVisible())
+        container_id_cache = ContainerIdCache.getInstance()
+        for metadata in self._container_registry.findInstanceContainersMetadata(
+            type="material"
+        ):
+            # Containers that are not loaded yet are added when they are loaded
+            if not self._container_registry.isLoaded(metadata["id"]):
+                self._unloaded_base_files[metadata["id"]] = metadata.get(
+                    "base_file", metadata["id"]
+                )
+                continue
+            container = container_id_cache.findContainer(metadata["id"])
+            if container is not None:
+                self._addContainer(container)
+
+    def _addContainer(self, container: ContainerInterface) -> None:
+        callback = functools.partial(self._onPropertyChanged, container)
+        self._connected_containers[container.getId()] = (container, callback)
+        container.propertyChanged.connect(callback)
+
+        for key in self._visible_keys.intersection(container.getAllKeys()):
+            self._updateValue(container, key)
+
+    def _removeContainer(self, container_id: str) -> None:
+        try:
+            container, callback = self._connected_containers.pop(container_id)
+        except KeyError:
+            return
+        container.propertyChanged.disconnect(callback)
+
+        base_file = container.getMetaDataEntry("base_file")
+        for key in list(self._keys_by_base_file.get(base_file, set())):
+            self._removeValue(container_id, base_file, key)
+
+    def _updateValue(self, container: ContainerInterface, key: str) -> None:
+        container_id = container.getId()
+        base_file = container.getMetaDataEntry("base_file")
+        value = container.getProperty(key, "value")
+        if value is None:
+            self._removeValue(container_id, base_file, key)
+            return
+
+        materials = self._values_by_key.setdefault(key, {})
+        materials.setdefault(base_file, {})[container_id] = value
+        self._keys_by_base_file.setdefault(base_file, set()).add(key)
+
+    def _removeValue(self, container_id: str, base_file: str, key: str) -> None:
+        materials = self._values_by_key.get(key)
+        if materials is None:
+            return
+        values = materials.get(base_file)
+        if values is None:
+            return
+        values.pop(container_id, None)
+        if values:
+            return  # other containers of the material still set a value
+
+        del materials[base_file]
+        if not materials:
+            del self._values_by_key[key]
+        keys = self._keys_by_base_file[base_file]
+        keys.discard(key)
+        if not keys:
+            del self._keys_by_base_file[base_file]
+
+    def _scheduleOverridesChanged(self) -> None:
+        if not self._changed_timer.isActive():
+            self._changed_timer.start()
+
+    def _emitOverridesChanged(self) -> None:
+        self._revision += 1
+        self.overridesChanged.emit()
+
+    def _onPropertyChanged(
+        self, container: ContainerInterface, key: str, property_name: str
+    ) -> None:
+        if property_name != "value" or key not in self._visible_keys:
+            return
+        PluginProfiler.getInstance().increment("overrides_index_updates")
+        self._updateValue(container, key)
+        self._scheduleOverridesChanged()
+
+    def _onContainerAdded(self, container: ContainerInterface) -> None:
+        if not self._built or container.getMetaDataEntry("type") != "material":
+            return
+        self._unloaded_base_files.pop(container.getId(), None)
+        self._removeContainer(container.getId())
+        self._addContainer(container)
+        self._scheduleOverridesChanged()
+
+    def _onContainerLoadComplete(self, container_id: str) -> None:
+        if not self._built:
+            return
+        if self._unloaded_base_files.pop(container_id, None) is not None:
+            self._scheduleOverridesChanged()
+        containers = self._container_registry.findContainers(id=container_id)
+        if not containers or containers[0].getMetaDataEntry("type") != "material":
+            return
+        container = containers[0]
+        connected_container = self._connected_containers.get(container_id)
+        if connected_container is not None and connected_container[0] is container:
+            return  # the container was already added when the registry announced it
+        self._removeContainer(container_id)
+        self._addContainer(container)
+        self._scheduleOverridesChanged()
+
+    def _onContainerRemoved(self, container: ContainerInterface) -> None:
+        if not self._built:
+            return
+        if self._unloaded_base_files.pop(container.getId(), None) is not None:
+            self._scheduleOverridesChanged()
+        if container.getId() not in self._connected_containers:
+            return
+        self._removeContainer(container.getId())
+        self._scheduleOverridesChanged()
+
+    def _onVisibilityChanged(self) -> None:
+        if not self._built:
+            return
+
+        visible_keys = set(self._visibility_handler.getVisible())
+        removed_keys = self._visible_keys - visible_keys
+        added_keys = visible_keys - self._visible_keys
+        self._visible_keys = visible_keys
+
+        for key in removed_keys:
+            for base_file in self._values_by_key.pop(key, {}):
+                keys = self._keys_by_base_file[base_file]
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_base_file[base_file]
+
+        if added_keys:
+            # Only the newly visible keys are looked up in the material containers
+            for container, _ in self._connected_containers.values():
+                for key in added_keys.intersection(container.getAllKeys()):
+                    self._updateValue(container, key)
+
+        self._scheduleOverridesChanged()
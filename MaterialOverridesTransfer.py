@@ -0,0 +1,195 @@
+# Copyright (c) 2026 Aldo Hoeben / fieldOfView
+# The MaterialSettingsPlugin is released under the terms of the AGPLv3 or higher.
+
+import ast
+import csv
+import json
+
+from UM.Application import Application
+from UM.Settings.ContainerRegistry import ContainerRegistry
+from UM.Settings.SettingFunction import SettingFunction
+
+from typing import Any, Dict, IO, Iterable, Iterator, Optional, Set
+
+from .ContainerIdCache import ContainerIdCache
+from .MaterialSettingsCore import MaterialSettingsCore, OverrideRecord
+
+
+class MaterialOverridesTransfer:
+    """Exports and imports the setting values of materials as JSON Lines or CSV records.
+
+    Each record holds a base_file, a setting key and a value. Exports stream over the
+    material containers one at a time. Imports check every record in a first pass over the
+    file, so a malformed file does not leave the materials partly changed, and then read the
+    file again while MaterialSettingsCore applies the records in chunks. Neither pass holds
+    the whole file in memory. CSV values are strings, so they are converted to the type of
+    their setting.
+    """
+
+    CSV_HEADER = ["base_file", "key", "value"]
+
+    # Setting types whose values are stored as Python literals, eg a list of points
+    LITERAL_TYPES = frozenset(["polygon", "polygons"])
+
+    def __init__(
+        self,
+        container_registry: ContainerRegistry,
+        core: MaterialSettingsCore,
+    ) -> None:
+        self._container_registry = container_registry
+        self._core = core
+
+    @staticmethod
+    def isCsvFile(file_path: str) -> bool:
+        return file_path.lower().endswith(".csv")
+
+    def iterOverrides(self, keys: Set[str]) -> Iterator[OverrideRecord]:
+        """Yield the values that base material containers hold for the specified keys."""
+        for metadata in self._container_registry.findInstanceContainersMetadata(
+            type="material"
+        ):
+            base_file = metadata.get("base_file")
+            if metadata["id"] != base_file:
+                continue  # derived containers share the values of their base file
+
+            container = ContainerIdCache.getInstance().findContainer(base_file)
+            if container is None:
+                continue
+
+            for key in sorted(keys.intersection(container.getAllKeys())):
+                value = container.getProperty(key, "value")
+                if isinstance(value, SettingFunction):
+                    value = str(value)
+                yield base_file, key, value
+
+    def exportToFile(self, file_path: str, keys: Set[str]) -> int:
+        """Write the overrides to a file. Returns the number of records written."""
+        count = 0
+        with open(file_path, "w", encoding="utf-8", newline="") as stream:
+            if self.isCsvFile(file_path):
+                writer = csv.writer(stream)
+                writer.writerow(self.CSV_HEADER)
+                for base_file, key, value in self.iterOverrides(keys):
+                    writer.writerow([base_file, key, value])
+                    count += 1
+            else:
+                for base_file, key, value in self.iterOverrides(keys):
+                    stream.write(
+                        json.dumps(
+                            {"base_file": base_file, "key": key, "value": value},
+                            default=str,
+                        )
+                    )
+                    stream.write("\n")
+                    count += 1
+        return count
+
+    def readOverrides(self, stream: IO[str], csv_format: bool) -> Iterator[OverrideRecord]:
+        """Read override records from a stream. Raises ValueError for a malformed record."""
+        if csv_format:
+            setting_types = {}  # type: Dict[str, Optional[str]]
+            reader = csv.DictReader(stream)
+            for row in reader:
+                base_file, key, value = self._checkRecord(row, reader.line_num)
+                if key not in setting_types:
+                    setting_types[key] = self._getSettingType(key)
+                yield base_file, key, self._convertCsvValue(
+                    key, value, setting_types[key], reader.line_num
+                )
+        else:
+            for line_number, line in enumerate(stream, start=1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError as e:
+                    raise ValueError("Line %d is not valid JSON: %s" % (line_number, e))
+                yield self._checkRecord(record, line_number)
+
+    def importRecords(
+        self, records: Iterable[OverrideRecord], chunk_size: int = 1000
+    ) -> Dict[str, Any]:
+        """Apply override records in chunks, skipping keys that can not be set per material.
+
+        All records are checked before any of them is applied. Raises ValueError if a record
+        is malformed, in which case no material is changed. Records that are not passed as a
+        list or tuple are collected first, because they are iterated twice.
+        """
+        if not isinstance(records, (list, tuple)):
+            records = list(records)
+        for record_number, record in enumerate(records, start=1):
+            self._checkOverrideRecord(record, record_number)
+        return self._core.applyOverrides(
+            (
+                self._checkOverrideRecord(record, record_number)
+                for record_number, record in enumerate(records, start=1)
+            ),
+            chunk_size,
+        )
+
+    def importFromFile(self, file_path: str, chunk_size: int = 1000) -> Dict[str, Any]:
+        """Apply the override records of a file. Raises ValueError if any record is malformed."""
+        csv_format = self.isCsvFile(file_path)
+        with open(file_path, "r", encoding="utf-8", newline="") as stream:
+            for _ in self.readOverrides(stream, csv_format):
+                pass  # check all records before any is applied
+
+            stream.seek(0)
+            return self._core.applyOverrides(
+                self.readOverrides(stream, csv_format), chunk_size
+            )
+
+    def _checkOverrideRecord(self, record: Any, record_number: int) -> OverrideRecord:
+        if not isinstance(record, (tuple, list)) or len(record) != 3:
+            raise ValueError("Record %d is not a (base_file, key, value) record" % record_number)
+        return self._checkRecord(
+            {"base_file": record[0], "key": record[1], "value": record[2]}, record_number
+        )
+
+    def _checkRecord(self, record: Any, line_number: int) -> OverrideRecord:
+        if not isinstance(record, dict):
+            raise ValueError("Line %d is not a record with a base_file, key and value" % line_number)
+        for field in self.CSV_HEADER:
+            if field not in record or record[field] is None:
+                raise ValueError("Line %d has no %s" % (line_number, field))
+        base_file = record["base_file"]
+        key = record["key"]
+        if not isinstance(base_file, str) or not base_file:
+            raise ValueError("Line %d has an invalid base_file" % line_number)
+        if not isinstance(key, str) or not key:
+            raise ValueError("Line %d has an invalid key" % line_number)
+        return base_file, key, record["value"]
+
+    def _convertCsvValue(
+        self, key: str, value: str, setting_type: Optional[str], line_number: int
+    ) -> Any:
+        """Convert a value read from a CSV file to the type of its setting."""
+        if value.startswith("="):
+            return value  # a formula
+        try:
+            if setting_type == "int":
+                return int(value)
+            if setting_type == "float":
+                return float(value)
+            if setting_type == "bool":
+                if value.lower() in ("true", "1"):
+                    return True
+                if value.lower() in ("false", "0"):
+                    return False
+                raise ValueError("not a boolean")
+            if setting_type in self.LITERAL_TYPES:
+                return ast.literal_eval(value)
+        except (ValueError, SyntaxError) as e:
+            raise ValueError(
+                "Line %d: %r is not a valid %s value for %s (%s)"
+                % (line_number, value, setting_type, key, e)
+            )
+        return value
+
+    def _getSettingType(self, key: str) -> Optional[str]:
+        global_stack = Application.getInstance().getGlobalContainerStack()
+        if not global_stack:
+            return None
+        definitions = global_stack.getBottom().findDefinitions(key=key)
+        return definitions[0].type if definitions else None
@@ -0,0 +1,168 @@
+# Copyright (c) 2026 Aldo Hoeben / fieldOfView
+# The MaterialSettingsPlugin is released under the terms of the AGPLv3 or higher.
+
+try:
+    from cura.ApplicationMetadata import CuraSDKVersion
+except ImportError:  # Cura <= 3.6
+    CuraSDKVersion = "6.0.0"
+if CuraSDKVersion >= "8.0.0":
+    from PyQt6.QtCore import QObject, QTimer, pyqtProperty, pyqtSignal, pyqtSlot
+else:
+    from PyQt5.QtCore import QObject, QTimer, pyqtProperty, pyqtSignal, pyqtSlot
+
+from UM.Application import Application
+from UM.Logger import Logger
+from UM.Settings.ContainerRegistry import ContainerRegistry
+from UM.Settings.ContainerStack import ContainerStack
+from cura.Settings.ExtruderManager import ExtruderManager
+
+from typing import Any, Dict, List, Optional
+
+from .MaterialCompatibility import findCompatibleMaterials
+from .PluginProfiler import PluginProfiler, profiled
+
+
+class MaterialPrefetcher(QObject):
+    """Loads the containers of the materials of the active machine before they are selected.
+
+    Containers are loaded lazily by the container registry, so selecting a material for the
+    first time blocks while its files are parsed. While the Materials page is shown, the
+    materials that are compatible with the active machine and variant are loaded one
+    material per timer tick, starting with the materials closest to the selected material in
+    the list. The container registry is not thread-safe, so loading happens on the main
+    thread in small steps that leave the event loop free in between.
+    """
+
+    # Interval between loading two materials, in milliseconds
+    LOAD_INTERVAL = 10
+
+    def __init__(self, container_registry: ContainerRegistry, parent: QObject = None) -> None:
+        super().__init__(parent)
+
+        self._container_registry = container_registry
+
+        self._materials = []  # type: List[str]
+        # The ids of the containers of each material that the machine uses
+        self._container_ids = {}  # type: Dict[str, List[str]]
+        self._pending_base_files = []  # type: List[str]
+        self._total_count = 0
+        self._finished_count = 0
+
+        self._load_timer = QTimer(self)
+        self._load_timer.setInterval(self.LOAD_INTERVAL)
+        self._load_timer.timeout.connect(self._loadNextMaterial)
+
+        Application.getInstance().globalContainerStackChanged.connect(self.cancel)
+
+    runningChanged = pyqtSignal()
+
+    @pyqtProperty(bool, notify=runningChanged)
+    def running(self) -> bool:
+        return self._load_timer.isActive()
+
+    @pyqtSlot(str)
+    @profiled("MaterialPrefetcher.start")
+    def start(self, current_base_file: str) -> None:
+        """Start loading the materials of the active machine, nearest to current_base_file first."""
+        self.cancel()
+
+        global_stack = Application.getInstance().getGlobalContainerStack()
+        if not global_stack:
+            return
+        extruder_manager = ExtruderManager.getInstance()
+        extruder_stack = extruder_manager.getActiveExtruderStack() if extruder_manager else None
+
+        self._materials = self._getMaterials(global_stack, extruder_stack)
+        self._total_count = len(self._materials)
+        self._finished_count = 0
+        self._pending_base_files = self._sortByDistance(self._materials, current_base_file)
+
+        if self._pending_base_files:
+            self._load_timer.start()
+            self.runningChanged.emit()
+
+    @pyqtSlot(str)
+    def setCurrentMaterial(self, base_file: str) -> None:
+        """Load the materials near a newly selected material first."""
+        if not self._pending_base_files:
+            return
+        pending_base_files = set(self._pending_base_files)
+        self._pending_base_files = [
+            pending_base_file
+            for pending_base_file in self._sortByDistance(self._materials, base_file)
+            if pending_base_file in pending_base_files
+        ]
+
+    @pyqtSlot()
+    def cancel(self) -> None:
+        self._pending_base_files = []
+        if not self._load_timer.isActive():
+            return
+        self._load_timer.stop()
+        self.runningChanged.emit()
+
+    def getStats(self) -> Dict[str, Any]:
+        return {
+            "total": self._total_count,
+            "finished": self._finished_count,
+            "pending": len(self._pending_base_files),
+        }
+
+    def _getMaterials(
+        self, global_stack: ContainerStack, extruder_stack: Optional[ContainerStack]
+    ) -> List[str]:
+        """List the base_files of the materials that the machine can use, in the order of the materials list."""
+        materials = findCompatibleMaterials(self._container_registry, global_stack, extruder_stack)
+        variant_name = extruder_stack.variant.getName() if extruder_stack else None
+        self._container_ids = {
+            base_file: [
+                metadata["id"]
+                for metadata in material_metadata
+                if metadata.get("variant_name") in (None, variant_name)
+            ]
+            or [base_file]
+            for base_file, material_metadata in materials.items()
+        }
+        return sorted(
+            materials,
+            key=lambda base_file: (
+                str(materials[base_file][0].get("brand", "")),
+                str(materials[base_file][0].get("material", "")),
+                str(materials[base_file][0].get("name", "")),
+            ),
+        )
+
+    def _sortByDistance(self, base_files: List[str], current_base_file: str) -> List[str]:
+        """Order base_files by their distance to current_base_file, alternating after and before it."""
+        try:
+            current_index = base_files.index(current_base_file)
+        except ValueError:
+            return list(base_files)
+
+        result = [current_base_file]
+        for distance in range(1, len(base_files)):
+            if current_index + distance < len(base_files):
+                result.append(base_files[current_index + distance])
+            if current_index - distance >= 0:
+                result.append(base_files[current_index - distance])
+        return result
+
+    def _loadNextMaterial(self) -> None:
+        if not self._pending_base_files:
+            self.cancel()
+            return
+
+        base_file = self._pending_base_files.pop(0)
+        loaded_count = 0
+        for container_id in self._container_ids.get(base_file, [base_file]):
+            if self._container_registry.isLoaded(container_id):
+                continue
+            try:
+                loaded_count += len(self._container_registry.findContainers(id=container_id))
+            except Exception:
+                Logger.logException("w", "Could not load material container %s" % container_id)
+        self._finished_count += 1
+        PluginProfiler.getInstance().increment("prefetched_containers", loaded_count)
+
+        if not self._pending_base_files:
+            self.cancel()
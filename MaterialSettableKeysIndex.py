@@ -0,0 +1,74 @@
+# Copyright (c) 2026 Aldo Hoeben / fieldOfView
+# The MaterialSettingsPlugin is released under the terms of the AGPLv3 or higher.
+
+from UM.Application import Application
+from UM.Settings.DefinitionContainer import DefinitionContainer
+from UM.Settings.SettingDefinition import SettingDefinition
+
+from typing import Dict, FrozenSet, Optional
+
+from .PluginProfiler import PluginProfiler
+
+
+class MaterialSettableKeysIndex:
+    """Caches which settings of a definition container can be set per material.
+
+    The set of keys is computed once per definition container and shared by all users.
+    Entries for other definitions are dropped when the active machine changes.
+    """
+
+    __instance = None  # type: Optional[MaterialSettableKeysIndex]
+
+    @classmethod
+    def getInstance(cls) -> "MaterialSettableKeysIndex":
+        if cls.__instance is None:
+            cls.__instance = cls()
+        return cls.__instance
+
+    def __init__(self) -> None:
+        self._keys_by_definition_id = {}  # type: Dict[str, FrozenSet[str]]
+
+        Application.getInstance().globalContainerStackChanged.connect(
+            self._onGlobalContainerStackChanged
+        )
+
+    @staticmethod
+    def isMaterialSettable(definition: SettingDefinition) -> bool:
+        # filter out any setting that is irrelevant for an extruder/material
+        if (
+            getattr(definition, "settable_per_extruder") == False
+            and getattr(definition, "resolve") is None
+        ):
+            return False
+
+        if definition.key == "material_diameter":
+            return False
+
+        return True
+
+    def getKeys(self, definition_container: DefinitionContainer) -> FrozenSet[str]:
+        definition_id = definition_container.getId()
+        try:
+            return self._keys_by_definition_id[definition_id]
+        except KeyError:
+            pass
+
+        PluginProfiler.getInstance().increment("material_settable_keys_index_builds")
+        keys = frozenset(
+            definition.key
+            for definition in definition_container.findDefinitions()
+            if self.isMaterialSettable(definition)
+        )
+        self._keys_by_definition_id[definition_id] = keys
+        return keys
+
+    def clear(self) -> None:
+        self._keys_by_definition_id.clear()
+
+    def _onGlobalContainerStackChanged(self) -> None:
+        global_stack = Application.getInstance().getGlobalContainerStack()
+        active_definition_id = global_stack.getBottom().getId() if global_stack else None
+
+        for definition_id in list(self._keys_by_definition_id.keys()):
+            if definition_id != active_definition_id:
+                del self._keys_by_definition_id[definition_id]
@@ -1,22 +1,78 @@
 # Copyright (c) 2026 Aldo Hoeben / fieldOfView
 # The MaterialSettingsPlugin is released under the terms of the AGPLv3 or higher.
 
+from UM.Settings.DefinitionContainer import DefinitionContainer
 from UM.Settings.Models.SettingDefinitionsModel import SettingDefinitionsModel
 
+try:
+    from cura.ApplicationMetadata import CuraSDKVersion
+except ImportError:  # Cura <= 3.6
+    CuraSDKVersion = "6.0.0"
+if CuraSDKVersion >= "8.0.0":
+    from PyQt6.QtCore import pyqtProperty, pyqtSignal
+else:
+    from PyQt5.QtCore import pyqtProperty, pyqtSignal
+
+from typing import FrozenSet, Optional
+
+from .MaterialSettableKeysIndex import MaterialSettableKeysIndex
+from .MaterialSettingsSearchIndex import MaterialSettingsSearchIndex
+
 
 class MaterialSettingDefinitionsModel(SettingDefinitionsModel):
     def __init__(self, parent=None, *args, **kwargs):
         super().__init__(parent=parent, *args, **kwargs)
 
+        self._search_text = ""
+        self._search_keys = None  # type: Optional[FrozenSet[str]]
+        # The definition container that _search_keys were found in
+        self._search_container = None  # type: Optional[DefinitionContainer]
+
+    searchTextChanged = pyqtSignal()
+
+    def setSearchText(self, search_text: str) -> None:
+        if search_text == self._search_text:
+            return
+        self._search_text = search_text
+        self._updateSearchKeys()
+        self.searchTextChanged.emit()
+        self._update()
+
+    # Only show settings that match this text by label, key or description, and their ancestors
+    @pyqtProperty(str, fset=setSearchText, notify=searchTextChanged)
+    def searchText(self) -> str:
+        return self._search_text
+
+    def _updateSearchKeys(self) -> None:
+        self._search_container = self._container
+        if not self._search_text.strip() or self._container is None:
+            self._search_keys = None
+            return
+
+        self._search_keys = MaterialSettingsSearchIndex.getInstance().search(
+            self._container,
+            self._search_text,
+            getattr(self, "_i18n_catalog", None),
+        )
+
+    def _update(self) -> None:
+        # The keys that match the search text differ per definition container, eg when containerId changes
+        if self._container is not self._search_container:
+            self._updateSearchKeys()
+        super()._update()
+
     def _isDefinitionVisible(self, definition, **kwargs):
         # filter out any setting that is irrelevant for an extruder/material
-        if (
-            getattr(definition, "settable_per_extruder") == False
-            and getattr(definition, "resolve") is None
-        ):
+        if self._container is not None:
+            material_settable_keys = MaterialSettableKeysIndex.getInstance().getKeys(
+                self._container
+            )
+            if definition.key not in material_settable_keys:
+                return False
+        elif not MaterialSettableKeysIndex.isMaterialSettable(definition):
             return False
 
-        if definition.key == "material_diameter":
+        if self._search_keys is not None and definition.key not in self._search_keys:
             return False
 
         return super()._isDefinitionVisible(definition, **kwargs)
@@ -0,0 +1,297 @@
+# Copyright (c) 2026 Aldo Hoeben / fieldOfView
+# The MaterialSettingsPlugin is released under the terms of the AGPLv3 or higher.
+
+try:
+    from cura.ApplicationMetadata import CuraSDKVersion
+except ImportError:  # Cura <= 3.6
+    CuraSDKVersion = "6.0.0"
+if CuraSDKVersion >= "8.0.0":
+    from PyQt6.QtCore import QObject, QTimer, pyqtProperty, pyqtSignal, pyqtSlot
+else:
+    from PyQt5.QtCore import QObject, QTimer, pyqtProperty, pyqtSignal, pyqtSlot
+
+from UM.Application import Application
+from UM.Settings.ContainerStack import ContainerStack
+from UM.Settings.SettingDefinition import SettingDefinition
+from UM.Settings.SettingFunction import SettingFunction
+from UM.Settings.SettingRelation import RelationType
+
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from .PluginProfiler import PluginProfiler, profiled
+
+
+class MaterialSettingPropertyRow(QObject):
+    """The properties of one setting, with the part of the SettingPropertyProvider API that setting items use.
+
+    The row is used as both the propertyProvider and the globalPropertyProvider of a setting
+    item; limit_to_extruder is resolved in the global stack, the other properties in the
+    custom stack.
+    """
+
+    def __init__(self, model: "MaterialSettingPropertiesModel", key: str) -> None:
+        super().__init__(model)
+
+        self._model = model
+        self._key = key
+        self._properties = {}  # type: Dict[str, Any]
+        self._stack_levels = []  # type: List[int]
+
+    propertiesChanged = pyqtSignal()
+
+    @pyqtProperty(str, constant=True)
+    def key(self) -> str:
+        return self._key
+
+    @pyqtProperty(str, constant=True)
+    def containerStackId(self) -> str:
+        return self._model.containerStackId
+
+    @pyqtProperty("QVariantMap", notify=propertiesChanged)
+    def properties(self) -> Dict[str, Any]:
+        return self._properties
+
+    @pyqtProperty("QVariantList", notify=propertiesChanged)
+    def stackLevels(self) -> List[int]:
+        return self._stack_levels
+
+    @pyqtSlot(str, "QVariant")
+    def setPropertyValue(self, property_name: str, property_value: Any) -> None:
+        self._model.setPropertyValue(self._key, property_name, property_value)
+
+    @pyqtSlot(int)
+    def removeFromContainer(self, index: int) -> None:
+        self._model.removeFromContainer(self._key, index)
+
+    def update(self, properties: Dict[str, Any], stack_levels: List[int]) -> bool:
+        """Set new properties. Returns True if anything changed."""
+        if properties == self._properties and stack_levels == self._stack_levels:
+            return False
+        self._properties = properties
+        self._stack_levels = stack_levels
+        self.propertiesChanged.emit()
+        return True
+
+
+class MaterialSettingPropertiesModel(QObject):
+    """Resolves the watched properties of all shown settings in the stack of a CustomStackProxy.
+
+    Replaces a pair of SettingPropertyProviders per setting item. Changes reported by the
+    stack, the global stack and the CustomStackProxy are collected, and the rows for the
+    changed keys and the keys that depend on them are resolved in a single pass.
+    """
+
+    WATCHED_PROPERTIES = ["value", "enabled", "state", "validationState"]
+    GLOBAL_WATCHED_PROPERTIES = ["limit_to_extruder"]
+
+    def __init__(self, stack_proxy: QObject, parent: QObject = None) -> None:
+        super().__init__(parent)
+
+        self._stack_proxy = stack_proxy
+        self._stack = None  # type: Optional[ContainerStack]
+        self._global_stack = None  # type: Optional[ContainerStack]
+        self._rows = {}  # type: Dict[str, MaterialSettingPropertyRow]
+        self._dependent_keys = {}  # type: Dict[str, Set[str]]
+
+        self._dirty_keys = set()  # type: Set[str]
+        self._update_timer = QTimer(self)
+        self._update_timer.setInterval(0)
+        self._update_timer.setSingleShot(True)
+        self._update_timer.timeout.connect(self._updateRows)
+
+        self._stack_proxy.settingsChanged.connect(self._onSettingsChanged)
+        application = Application.getInstance()
+        application.globalContainerStackChanged.connect(self._onGlobalStackChanged)
+        self._onGlobalStackChanged()
+
+    @pyqtProperty(str, constant=True)
+    def containerStackId(self) -> str:
+        stack = self._getStack()
+        return stack.getId() if stack is not None else ""
+
+    @pyqtSlot(str, result=QObject)
+    def getRow(self, key: str) -> MaterialSettingPropertyRow:
+        row = self._rows.get(key)
+        if row is None:
+            row = MaterialSettingPropertyRow(self, key)
+            self._rows[key] = row
+            self._updateRow(row)
+        return row
+
+    def stopUpdates(self) -> None:
+        """Stop resolving rows and watching the stacks, because the stack is returned to the pool."""
+        self._update_timer.stop()
+        self._dirty_keys.clear()
+
+        self._stack_proxy.settingsChanged.disconnect(self._onSettingsChanged)
+        if self._stack is not None:
+            self._stack.propertiesChanged.disconnect(self._onPropertiesChanged)
+            self._stack = None
+        Application.getInstance().globalContainerStackChanged.disconnect(
+            self._onGlobalStackChanged
+        )
+        if self._global_stack is not None:
+            self._global_stack.propertiesChanged.disconnect(
+                self._onGlobalPropertiesChanged
+            )
+            self._global_stack = None
+
+    def setPropertyValue(self, key: str, property_name: str, property_value: Any) -> None:
+        # Like the SettingPropertyProvider, compare with the shown value, which is a string
+        row = self._rows.get(key)
+        if row is not None and row.properties.get(property_name) == str(property_value):
+            return
+        stack = self._getStack()
+        container = stack.getTop() if stack is not None else None
+        if container is None:
+            return
+        if property_name == "value" and self._isInheritedValue(stack, key, property_value):
+            # Like the SettingPropertyProvider with removeUnusedValue, remove a value that the material does not change
+            self.removeFromContainer(key, 0)
+            return
+        container.setProperty(key, property_name, property_value)
+        self._stack_proxy.markContainerDirty(container)
+
+    def _isInheritedValue(self, stack: ContainerStack, key: str, property_value: Any) -> bool:
+        """Check if a value is the same as the value the containers below the top container resolve to."""
+        if str(stack.getTop().getProperty(key, "state")) == "InstanceState.Calculated":
+            return False  # calculated values need to be stored
+        for container in stack.getContainers()[1:]:
+            value = container.getProperty(key, "value")
+            if value is None:
+                continue
+            if isinstance(value, SettingFunction):
+                value = value(stack)
+            # Compare as strings, because the value can be an int while the new value is a float
+            return str(value) == str(property_value)
+        return False
+
+    def removeFromContainer(self, key: str, index: int) -> None:
+        stack = self._getStack()
+        container = stack.getContainer(index) if stack is not None else None
+        if container is None or container.getProperty(key, "value") is None:
+            return
+        container.removeInstance(key)
+        self._stack_proxy.markContainerDirty(container)
+
+    def _getStack(self) -> Optional[ContainerStack]:
+        stack = self._stack_proxy.getStack()
+        if stack is not self._stack:
+            if self._stack is not None:
+                self._stack.propertiesChanged.disconnect(self._onPropertiesChanged)
+            self._stack = stack
+            if stack is None:
+                return None  # the stack was released
+            self._stack.propertiesChanged.connect(self._onPropertiesChanged)
+            self._dependent_keys.clear()
+            self._markDirty(self._rows.keys())
+        return stack
+
+    def _getDependentKeys(self, key: str) -> Set[str]:
+        """Return the keys of the settings whose properties are computed from the value of key."""
+        try:
+            return self._dependent_keys[key]
+        except KeyError:
+            pass
+
+        stack = self._getStack()
+        if stack is None:
+            return set()
+        keys = set()  # type: Set[str]
+        pending_keys = [key]
+        while pending_keys:
+            definition = stack.getSettingDefinition(pending_keys.pop())
+            if definition is None:
+                continue
+            for relation in definition.relations:
+                if relation.type != RelationType.RequiredByTarget:
+                    continue
+                target_key = relation.target.key
+                if target_key != key and target_key not in keys:
+                    keys.add(target_key)
+                    pending_keys.append(target_key)
+        self._dependent_keys[key] = keys
+        return keys
+
+    def _markDirty(self, keys: Iterable[str]) -> None:
+        for key in keys:
+            if key in self._rows:
+                self._dirty_keys.add(key)
+            for dependent_key in self._getDependentKeys(key):
+                if dependent_key in self._rows:
+                    self._dirty_keys.add(dependent_key)
+        if self._dirty_keys and not self._update_timer.isActive():
+            self._update_timer.start()
+
+    @profiled("MaterialSettingPropertiesModel.updateRows")
+    def _updateRows(self) -> None:
+        dirty_keys = self._dirty_keys
+        self._dirty_keys = set()
+
+        updated_rows = 0
+        for key in dirty_keys:
+            row = self._rows.get(key)
+            if row is not None and self._updateRow(row):
+                updated_rows += 1
+
+        profiler = PluginProfiler.getInstance()
+        profiler.increment("property_rows_resolved", len(dirty_keys))
+        profiler.increment("property_rows_changed", updated_rows)
+
+    def _updateRow(self, row: MaterialSettingPropertyRow) -> bool:
+        stack = self._getStack()
+        if stack is None:
+            return False
+        key = row.key
+
+        properties = {}  # type: Dict[str, Any]
+        for property_name in self.WATCHED_PROPERTIES:
+            value = stack.getProperty(key, property_name)
+            if property_name == "validationState" and value is None:
+                value = self._validate(stack, key)
+            if value is not None:
+                properties[property_name] = str(value)
+        if self._global_stack is not None:
+            for property_name in self.GLOBAL_WATCHED_PROPERTIES:
+                value = self._global_stack.getProperty(key, property_name)
+                if value is not None:
+                    properties[property_name] = str(value)
+
+        stack_levels = [
+            index
+            for index, container in enumerate(stack.getContainers())
+            if container.getProperty(key, "value") is not None
+        ]
+        return row.update(properties, stack_levels)
+
+    def _validate(self, stack: ContainerStack, key: str) -> Any:
+        # Settings that only have a definition are validated like the SettingPropertyProvider does
+        definition = stack.getSettingDefinition(key)
+        if definition is None:
+            return None
+        validator_type = SettingDefinition.getValidatorForType(definition.type)
+        if validator_type is None:
+            return None
+        return validator_type(key)(stack)
+
+    def _onPropertiesChanged(self, key: str, property_names: Iterable[str]) -> None:
+        self._markDirty([key])
+
+    def _onSettingsChanged(self, keys: List[str]) -> None:
+        self._markDirty(keys)
+
+    def _onGlobalPropertiesChanged(self, key: str, property_names: Iterable[str]) -> None:
+        if key in self._rows and "limit_to_extruder" in property_names:
+            self._markDirty([key])
+
+    def _onGlobalStackChanged(self) -> None:
+        if self._global_stack is not None:
+            self._global_stack.propertiesChanged.disconnect(
+                self._onGlobalPropertiesChanged
+            )
+        self._global_stack = Application.getInstance().getGlobalContainerStack()
+        if self._global_stack is not None:
+            self._global_stack.propertiesChanged.connect(
+                self._onGlobalPropertiesChanged
+            )
+        self._markDirty(self._rows.keys())
@@ -0,0 +1,188 @@
+# Copyright (c) 2026 Aldo Hoeben / fieldOfView
+# The MaterialSettingsPlugin is released under the terms of the AGPLv3 or higher.
+
+import itertools
+import time
+
+from UM.Application import Application
+from UM.Logger import Logger
+from UM.Settings.ContainerRegistry import ContainerRegistry
+from UM.Signal import postponeSignals, CompressTechnique
+
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from .MaterialContainersIndex import MaterialContainersIndex
+from .MaterialSettableKeysIndex import MaterialSettableKeysIndex
+from .PluginProfiler import PluginProfiler
+
+# A single material setting override: (base_file, key, value)
+OverrideRecord = Tuple[str, str, Any]
+
+
+class MaterialSettingsCore:
+    """Applies setting values to materials, without depending on QML or the preferences dialog.
+
+    This is what the MaterialSettingsPlugin context property uses to change materials, and
+    it can be used as is from a script:
+
+        core = MaterialSettingsCore(CuraApplication.getInstance().getContainerRegistry())
+        report = core.applyOverrides([("generic_pla", "material_flow", 95)])
+
+    Keys are validated against the settings that can be set per material for the active
+    printer. Containers are only marked dirty; they are saved by Cura as usual, or by the
+    on_containers_changed callback.
+    """
+
+    # Number of skipped records that are reported individually with the reason they were skipped
+    MAX_REPORTED_FAILURES = 1000
+
+    def __init__(
+        self,
+        container_registry: ContainerRegistry,
+        on_containers_changed: Optional[Callable[[str, int], None]] = None,
+        containers_index: Optional[MaterialContainersIndex] = None,
+    ) -> None:
+        self._container_registry = container_registry
+        self._on_containers_changed = on_containers_changed
+        if containers_index is None:
+            containers_index = MaterialContainersIndex(container_registry)
+        self._containers_index = containers_index
+
+    def getMaterialSettableKeys(self) -> FrozenSet[str]:
+        global_stack = Application.getInstance().getGlobalContainerStack()
+        if not global_stack:
+            return frozenset()
+        return MaterialSettableKeysIndex.getInstance().getKeys(global_stack.getBottom())
+
+    def validateKeys(self, keys: Iterable[str]) -> Tuple[List[str], List[str]]:
+        """Split keys into the ones that can and the ones that can not be set per material."""
+        material_settable_keys = self.getMaterialSettableKeys()
+        valid_keys = []  # type: List[str]
+        invalid_keys = []  # type: List[str]
+        for key in keys:
+            if key in material_settable_keys:
+                valid_keys.append(key)
+            else:
+                invalid_keys.append(key)
+        return valid_keys, invalid_keys
+
+    def setPropertyValues(self, base_file: str, values: Dict[str, Any]) -> int:
+        """Set a number of setting values on all containers derived from a base_file.
+
+        Values are not validated. Returns the number of containers that were changed.
+        """
+        profiler = PluginProfiler.getInstance()
+        changed_containers = 0
+        for container in self._containers_index.getContainers(base_file):
+            if container.isReadOnly():
+                continue
+            changed_values = {
+                key: value
+                for key, value in values.items()
+                if container.getProperty(key, "value") != value
+            }
+            if not changed_values:
+                continue
+
+            # Deliver the change notifications for this container in one go after all values are set
+            profiler.increment("signals.container.propertyChanged", len(changed_values))
+            with postponeSignals(
+                container.propertyChanged,
+                compress=CompressTechnique.CompressPerParameterValue,
+            ):
+                for key, value in changed_values.items():
+                    container.setProperty(key, "value", value)
+            changed_containers += 1
+
+        if changed_containers and self._on_containers_changed is not None:
+            self._on_containers_changed(base_file, changed_containers)
+        return changed_containers
+
+    def applyPropertyValues(self, edits: Iterable[Tuple[str, Dict[str, Any]]]) -> int:
+        """Apply a number of (base_file, values) edits. Edits to the same base_file are merged.
+
+        Returns the number of containers that were changed.
+        """
+        values_by_base_file = {}  # type: Dict[str, Dict[str, Any]]
+        for base_file, values in edits:
+            if not base_file:
+                continue
+            values_by_base_file.setdefault(base_file, {}).update(values)
+
+        changed_containers = 0
+        for base_file, values in values_by_base_file.items():
+            changed_containers += self.setPropertyValues(base_file, values)
+        return changed_containers
+
+    def applyOverrides(
+        self, records: Iterable[OverrideRecord], chunk_size: int = 1000
+    ) -> Dict[str, Any]:
+        """Validate and apply override records, reading at most chunk_size records at a time.
+
+        Returns a report with the number of records, skipped records and changed containers,
+        the changed containers and time spent per material, and why records were skipped.
+        """
+        material_settable_keys = self.getMaterialSettableKeys()
+        report = {
+            "records": 0,
+            "skipped": 0,
+            "containers": 0,
+            "materials": {},
+            "failures": [],
+        }  # type: Dict[str, Any]
+
+        records = iter(records)
+        while True:
+            chunk = list(itertools.islice(records, chunk_size))
+            if not chunk:
+                break
+
+            values_by_base_file = {}  # type: Dict[str, Dict[str, Any]]
+            for base_file, key, value in chunk:
+                report["records"] += 1
+                if key not in material_settable_keys:
+                    report["skipped"] += 1
+                    self._addFailure(report, base_file, key, "not settable per material")
+                    continue
+                values_by_base_file.setdefault(base_file, {})[key] = value
+
+            for base_file, values in values_by_base_file.items():
+                self._applyMaterialOverrides(report, base_file, values)
+
+        return report
+
+    def _applyMaterialOverrides(
+        self, report: Dict[str, Any], base_file: str, values: Dict[str, Any]
+    ) -> None:
+        if not self._containers_index.getContainers(base_file):
+            report["skipped"] += len(values)
+            for key in values:
+                self._addFailure(report, base_file, key, "unknown material")
+            return
+
+        start_time = time.perf_counter()
+        try:
+            changed_containers = self.setPropertyValues(base_file, values)
+        except Exception as e:
+            Logger.logException("e", "Could not apply settings to material %s" % base_file)
+            changed_containers = 0
+            report["skipped"] += len(values)
+            for key in values:
+                self._addFailure(report, base_file, key, str(e))
+        elapsed_ms = (time.perf_counter() - start_time) * 1000
+
+        material_report = report["materials"].setdefault(
+            base_file, {"values": 0, "containers": 0, "time_ms": 0.0}
+        )
+        material_report["values"] += len(values)
+        material_report["containers"] += changed_containers
+        material_report["time_ms"] += elapsed_ms
+        report["containers"] += changed_containers
+
+    def _addFailure(
+        self, report: Dict[str, Any], base_file: str, key: str, reason: str
+    ) -> None:
+        if len(report["failures"]) < self.MAX_REPORTED_FAILURES:
+            report["failures"].append(
+                {"base_file": base_file, "key": key, "reason": reason}
+            )
@@ -1,7 +1,9 @@
 # Copyright (c) 2026 Aldo Hoeben / fieldOfView
 # The MaterialSettingsPlugin is released under the terms of the AGPLv3 or higher.
 
+import hashlib
 import os.path
+import time
 
 try:
     from cura.ApplicationMetadata import CuraSDKVersion
@@ -24,6 +26,7 @@ else:
 from UM.Extension import Extension
 from UM.Logger import Logger
 from UM.Resources import Resources
+from UM.Signal import postponeSignals, CompressTechnique
 from cura.CuraApplication import CuraApplication
 from cura.Settings.ExtruderManager import ExtruderManager
 from cura.Settings.MaterialSettingsVisibilityHandler import (
@@ -40,10 +43,16 @@ except ImportError:
 from .MaterialSettingsPluginVisibilityHandler import (
     MaterialSettingsPluginVisibilityHandler,
 )
+from .MaterialSettableKeysIndex import MaterialSettableKeysIndex
+from .MaterialSettingsCore import MaterialSettingsCore
 from .MaterialSettingsProxy import MaterialSettingsProxy
+from .MaterialValueFunction import MaterialValueFunction
+from .PluginProfiler import profiled
 
 from UM.i18n import i18nCatalog
 
+from typing import Any, Dict, List, Optional, Union
+
 catalog = i18nCatalog("cura")
 uranium_catalog = i18nCatalog("uranium")
 
@@ -57,14 +66,24 @@ class MaterialSettingsPlugin(Extension):
         )  # the default list
         default_material_settings.append("material_flow")
 
-        CuraApplication.getInstance().getPreferences().addPreference(
+        preferences = CuraApplication.getInstance().getPreferences()
+        preferences.addPreference(
             "material_settings/visible_settings", ";".join(default_material_settings)
         )
+        preferences.addPreference("material_settings/profiling_enabled", False)
+        # A JSON Lines or CSV file with material setting values that is applied when Cura starts
+        preferences.addPreference("material_settings/provisioning_file", "")
+        # The hash of the contents of the provisioning file that was applied last, so it is applied only once
+        preferences.addPreference("material_settings/provisioning_file_hash", "")
+        # Link settings with the plugin's materialValue function; extruderValueFromContainer is the opt-out
+        preferences.addPreference("material_settings/use_material_value_function", True)
 
         CuraApplication.getInstance().engineCreatedSignal.connect(self._onEngineCreated)
 
         # Add item to settings list context menu
         if hasattr(CuraFormulaFunctions, "getValueFromContainerAtIndex"):
+            MaterialValueFunction.getInstance().register()
+
             api = CuraApplication.getInstance().getCuraAPI()
             api.interface.settings.addContextMenuItem(
                 {
@@ -75,8 +94,20 @@ class MaterialSettingsPlugin(Extension):
                 }
             )
 
+            self.setMenuName(catalog.i18nc("@item:inmenu", "Material Settings"))
+            self.addMenuItem(
+                catalog.i18nc(
+                    "@item:inmenu", "Use values from material for all material settings"
+                ),
+                self.useValuesFromMaterialContainer,
+            )
+
         self._proxy = MaterialSettingsProxy()
 
+    def getMaterialSettingsCore(self) -> MaterialSettingsCore:
+        """Entry point for scripts that want to apply material settings without the GUI."""
+        return self._proxy.getCore()
+
     def _onEngineCreated(self) -> None:
         # Make MaterialSettingsProxy available without using qmlRegisterSingletonType
         try:
@@ -97,6 +128,15 @@ class MaterialSettingsPlugin(Extension):
             )
         )
 
+        # The materials and their settings are only known once a printer is active
+        application = CuraApplication.getInstance()
+        if application.getGlobalContainerStack():
+            self._applyProvisioningFile()
+        else:
+            application.globalContainerStackChanged.connect(
+                self._onFirstGlobalContainerStackChanged
+            )
+
         if CuraSDKVersion >= "8.11.0":
             # Cura 5.11+: New PreferencesDialog without removePage/insertPage
             # We need to hook into dialog creation and modify the Materials page
@@ -105,13 +145,87 @@ class MaterialSettingsPlugin(Extension):
             # Cura 5.10 and earlier: Use the old method
             self._setupLegacyPreferencesDialog()
 
+    def _onFirstGlobalContainerStackChanged(self) -> None:
+        application = CuraApplication.getInstance()
+        if not application.getGlobalContainerStack():
+            return
+        application.globalContainerStackChanged.disconnect(
+            self._onFirstGlobalContainerStackChanged
+        )
+        self._applyProvisioningFile()
+
+    def _applyProvisioningFile(self) -> None:
+        preferences = CuraApplication.getInstance().getPreferences()
+        file_path = preferences.getValue("material_settings/provisioning_file")
+        if not file_path:
+            return
+
+        try:
+            with open(file_path, "rb") as stream:
+                file_hash = hashlib.sha256(stream.read()).hexdigest()
+        except OSError:
+            Logger.logException(
+                "e", "Could not read material settings from %s" % file_path
+            )
+            return
+        if file_hash == preferences.getValue("material_settings/provisioning_file_hash"):
+            Logger.log(
+                "d", "Material settings from %s were already applied" % file_path
+            )
+            return
+
+        try:
+            report = self._proxy.importMaterialSettingsFromPath(file_path)
+        except (OSError, ValueError, KeyError, TypeError):
+            Logger.logException(
+                "e", "Could not apply material settings from %s" % file_path
+            )
+            return
+        preferences.setValue("material_settings/provisioning_file_hash", file_hash)
+
+        Logger.log(
+            "i",
+            "Applied material settings from %s: %d records, %d skipped, %d containers changed"
+            % (file_path, report["records"], report["skipped"], report["containers"]),
+        )
+        for base_file, material_report in report["materials"].items():
+            Logger.log(
+                "d",
+                "Material %s: %d values, %d containers changed in %.1f ms"
+                % (
+                    base_file,
+                    material_report["values"],
+                    material_report["containers"],
+                    material_report["time_ms"],
+                ),
+            )
+        for failure in report["failures"]:
+            Logger.log(
+                "w",
+                "Skipped %s of material %s: %s"
+                % (failure["key"], failure["base_file"], failure["reason"]),
+            )
+
     def _setupNewPreferencesDialogHook(self) -> None:
         """Setup hook for Cura 5.11+ PreferencesDialog that uses hardcoded page list."""
         Logger.log(
             "d", "Setting up MaterialSettingsPlugin for Cura 5.11+ PreferencesDialog"
         )
 
-        self._patched_dialogs = set()  # Track dialogs we've already patched
+        # Track dialogs we've already patched; dialogs are forgotten when they are destroyed
+        self._patched_dialogs = set()
+        # Path of child indices from the dialog content item to the pages ListView, found once
+        self._pages_list_view_path = None  # type: Optional[List[int]]
+        self._preferences_title = uranium_catalog.i18nc("@title:window", "Preferences")
+        self._dialog_patch_stats = {
+            "focus_changes": 0,
+            "rejected_windows": 0,
+            "patched_dialogs": 0,
+            "path_cache_hits": 0,
+            "tree_walks": 0,
+            "nodes_visited": 0,
+            "patch_time_ms": 0.0,
+        }  # type: Dict[str, Union[int, float]]
 
         main_window = CuraApplication.getInstance().getMainWindow()
         if not main_window:
@@ -143,102 +257,141 @@ class MaterialSettingsPlugin(Extension):
         """Called when focus changes to a different window (e.g., new dialog opened)."""
         if window is None:
             return
+        self._dialog_patch_stats["focus_changes"] += 1
 
-        # Use a short timer to allow the QML to fully initialize
-        QTimer.singleShot(50, lambda: self._checkWindowForPreferencesDialog(window))
-
-    def _checkWindowForPreferencesDialog(self, window) -> None:
-        """Check if the given window is a PreferencesDialog and patch it if so."""
-        if window is None:
+        if window in self._patched_dialogs:
             return
 
-        # Skip if we've already patched this window
-        window_id = id(window)
-        if window_id in self._patched_dialogs:
+        # Reject windows other than the PreferencesDialog without scheduling anything
+        title = window.title() if hasattr(window, "title") else ""
+        if self._preferences_title not in str(title):
+            self._dialog_patch_stats["rejected_windows"] += 1
             return
 
+        if not self._checkWindowForPreferencesDialog(window):
+            # The QML of the dialog may not be fully initialised yet; try once more a little later
+            QTimer.singleShot(50, lambda: self._checkWindowForPreferencesDialog(window))
+
+    @profiled("MaterialSettingsPlugin.checkWindowForPreferencesDialog")
+    def _checkWindowForPreferencesDialog(self, window) -> bool:
+        """Patch the given PreferencesDialog window. Returns True if the window does not need to be checked again."""
+        if window in self._patched_dialogs:
+            return True
+
         try:
             # Get the contentItem of the window (for QQuickWindow)
             content_item = (
                 window.contentItem() if hasattr(window, "contentItem") else None
             )
             if content_item is None:
-                return
-
-            # Check window title for localized "Preferences"
-            title = window.title() if hasattr(window, "title") else ""
-            preferences_title = uranium_catalog.i18nc("@title:window", "Preferences")
-            if preferences_title not in str(title):
-                return
+                return False
 
             Logger.log("d", "Found Preferences window, attempting to patch...")
 
             # The PreferencesDialog structure: Window > contentItem > UM.Dialog content
             # We need to find the ListView with the page model
-            if self._patchPreferencesDialog(content_item):
-                self._patched_dialogs.add(window_id)
+            start_time = time.perf_counter()
+            patched = self._patchPreferencesDialog(content_item)
+            self._dialog_patch_stats["patch_time_ms"] += (
+                time.perf_counter() - start_time
+            ) * 1000
+            if patched:
+                self._patched_dialogs.add(window)
+                window.destroyed.connect(lambda: self._patched_dialogs.discard(window))
+                self._dialog_patch_stats["patched_dialogs"] += 1
+                Logger.log("d", "PreferencesDialog patch stats: %s" % self._dialog_patch_stats)
+            return patched
 
         except Exception as e:
             Logger.log("d", "Error checking window: %s" % str(e))
+            return False
 
-    def _findListViewWithModel(self, parent, depth=0):
-        """Recursively find a ListView with a model property containing page entries."""
-        if depth > 10:  # Prevent infinite recursion
+    def _getChildren(self, parent) -> List[Any]:
+        # For QQuickItem, use childItems() to get visual children
+        # For QObject, use children() to get QObject children
+        if hasattr(parent, "childItems"):
+            return list(parent.childItems())
+        elif hasattr(parent, "children"):
+            return list(parent.children())
+        return []
+
+    def _isPagesListView(self, item) -> bool:
+        """Check if an item has a model property containing page entries."""
+        try:
+            model = item.property("model") if hasattr(item, "property") else None
+            if model is None:
+                return False
+
+            # Verify it's the page list by checking model structure
+            if hasattr(model, "__len__") and len(model) >= 4:
+                first_item = model[0]
+                if (
+                    hasattr(first_item, "__contains__")
+                    and "name" in first_item
+                    and "item" in first_item
+                ):
+                    return True
+                elif hasattr(first_item, "property"):
+                    # QML object, try property access
+                    name_prop = first_item.property("name")
+                    item_prop = first_item.property("item")
+                    return name_prop is not None and item_prop is not None
+        except Exception:
+            pass
+        return False
+
+    def _findListViewAtCachedPath(self, parent):
+        """Follow the path to the pages ListView found in a previous dialog."""
+        if self._pages_list_view_path is None:
             return None
 
-        try:
-            # For QQuickItem, use childItems() to get visual children
-            # For QObject, use children() to get QObject children
-            if hasattr(parent, "childItems"):
-                children = list(parent.childItems())
-            elif hasattr(parent, "children"):
-                children = list(parent.children())
-            else:
-                children = []
+        item = parent
+        for index in self._pages_list_view_path:
+            children = self._getChildren(item)
+            if index >= len(children):
+                return None
+            item = children[index]
 
-            for child in children:
-                # Check if this child has model and currentIndex (ListView characteristics)
-                try:
-                    model = (
-                        child.property("model") if hasattr(child, "property") else None
-                    )
+        return item if self._isPagesListView(item) else None
 
-                    if model is not None:
-                        # Verify it's the page list by checking model structure
-                        try:
-                            if hasattr(model, "__len__") and len(model) >= 4:
-                                first_item = model[0]
-                                if (
-                                    hasattr(first_item, "__contains__")
-                                    and "name" in first_item
-                                    and "item" in first_item
-                                ):
-                                    return child
-                                elif hasattr(first_item, "property"):
-                                    # QML object, try property access
-                                    name_prop = first_item.property("name")
-                                    item_prop = first_item.property("item")
-                                    if name_prop is not None and item_prop is not None:
-                                        return child
-                        except (TypeError, KeyError, IndexError):
-                            pass
-                except Exception:
-                    pass
+    def _findListViewWithModel(self, parent, depth=0, path=None):
+        """Recursively find a ListView with a model property containing page entries.
+
+        Returns a tuple of the ListView and the path of child indices leading to it."""
+        if depth > 10:  # Prevent infinite recursion
+            return None, None
+        if path is None:
+            path = []
+
+        try:
+            for index, child in enumerate(self._getChildren(parent)):
+                self._dialog_patch_stats["nodes_visited"] += 1
+                if self._isPagesListView(child):
+                    return child, path + [index]
 
                 # Recurse into children
-                result = self._findListViewWithModel(child, depth + 1)
+                result, result_path = self._findListViewWithModel(
+                    child, depth + 1, path + [index]
+                )
                 if result is not None:
-                    return result
+                    return result, result_path
         except Exception:
             pass
 
-        return None
+        return None, None
 
     def _patchPreferencesDialog(self, dialog) -> bool:
         """Patch a PreferencesDialog to use the plugin's MaterialsPage. Returns True if successful."""
         try:
-            # Find the pagesList ListView in the dialog using recursive search
-            list_view = self._findListViewWithModel(dialog)
+            # Find the pagesList ListView in the dialog, using the path found in a previous dialog if possible
+            list_view = self._findListViewAtCachedPath(dialog)
+            if list_view is not None:
+                self._dialog_patch_stats["path_cache_hits"] += 1
+            else:
+                self._dialog_patch_stats["tree_walks"] += 1
+                list_view, self._pages_list_view_path = self._findListViewWithModel(
+                    dialog
+                )
             if list_view is None:
                 Logger.log(
                     "w", "Could not find pagesList ListView in PreferencesDialog"
@@ -317,10 +470,30 @@ class MaterialSettingsPlugin(Extension):
         except KeyError:
             return
 
+        self.useValuesFromMaterialContainer([setting_key])
+
+    @profiled("MaterialSettingsPlugin.useValuesFromMaterialContainer")
+    def useValuesFromMaterialContainer(
+        self, setting_keys: Optional[List[str]] = None
+    ) -> None:
+        """Link a number of settings to the value in the material container.
+
+        If no keys are specified, all material settings that the active material overrides are linked.
+        The formulas are written while the propertyChanged signals of the user containers are
+        postponed, so repeated notifications for a key are dropped; listeners are still notified
+        once per key.
+        """
         global_container_stack = CuraApplication.getInstance().getGlobalContainerStack()
         if not global_container_stack:
             return
+        # Only settings that are settable per extruder are written to the extruder stack
+        extruder_stack = ExtruderManager.getInstance().getActiveExtruderStack()
 
+        # Profiles and project files that use materialValue can only be read when this plugin is installed,
+        # so the user can choose the built-in formula function, which refers to the material by position
+        use_material_value_function = CuraApplication.getInstance().getPreferences().getValue(
+            "material_settings/use_material_value_function"
+        )
         try:
             material_container_index = global_container_stack.getContainers().index(
                 global_container_stack.material
@@ -328,30 +501,69 @@ class MaterialSettingsPlugin(Extension):
         except ValueError:
             return
 
-        settable_per_extruder = global_container_stack.getProperty(
-            setting_key, "settable_per_extruder"
-        )
-        resolve_value = global_container_stack.getProperty(setting_key, "resolve")
-        if not settable_per_extruder and resolve_value is None:
-            # todo: notify user
-            Logger.log("e", "Setting %s can not be set per material" % setting_key)
-            return
-
-        if settable_per_extruder:
-            value_string = '=extruderValueFromContainer(extruder_nr,"%s",%d)' % (
-                setting_key,
-                material_container_index,
-            )
-            ExtruderManager.getInstance().getActiveExtruderStack().userChanges.setProperty(
-                setting_key, "value", value_string
+        if setting_keys is None:
+            if not extruder_stack:
+                return
+            # Only the keys that can be set per material, so eg material_diameter is not linked
+            material_settable_keys = MaterialSettableKeysIndex.getInstance().getKeys(
+                global_container_stack.getBottom()
             )
-        else:
-            active_extruder_index = ExtruderManager.getInstance().activeExtruderIndex
-            value_string = '=extruderValueFromContainer(%d,"%s",%d)' % (
-                active_extruder_index,
-                setting_key,
-                material_container_index,
+            setting_keys = sorted(
+                material_settable_keys.intersection(extruder_stack.material.getAllKeys())
             )
-            global_container_stack.userChanges.setProperty(
-                setting_key, "value", value_string
+
+        active_extruder_index = ExtruderManager.getInstance().activeExtruderIndex
+        extruder_values = {}  # type: Dict[str, str]
+        global_values = {}  # type: Dict[str, str]
+        for setting_key in setting_keys:
+            settable_per_extruder = global_container_stack.getProperty(
+                setting_key, "settable_per_extruder"
             )
+            resolve_value = global_container_stack.getProperty(setting_key, "resolve")
+            if not settable_per_extruder and resolve_value is None:
+                # todo: notify user
+                Logger.log("e", "Setting %s can not be set per material" % setting_key)
+                continue
+            if settable_per_extruder and not extruder_stack:
+                Logger.log("e", "Setting %s can not be linked without an active extruder" % setting_key)
+                continue
+
+            if use_material_value_function:
+                if settable_per_extruder:
+                    extruder_values[setting_key] = '=%s(extruder_nr,"%s")' % (
+                        MaterialValueFunction.OPERATOR_NAME,
+                        setting_key,
+                    )
+                else:
+                    global_values[setting_key] = '=%s(%d,"%s")' % (
+                        MaterialValueFunction.OPERATOR_NAME,
+                        active_extruder_index,
+                        setting_key,
+                    )
+            elif settable_per_extruder:
+                extruder_values[setting_key] = (
+                    '=extruderValueFromContainer(extruder_nr,"%s",%d)'
+                    % (
+                        setting_key,
+                        material_container_index,
+                    )
+                )
+            else:
+                global_values[setting_key] = '=extruderValueFromContainer(%d,"%s",%d)' % (
+                    active_extruder_index,
+                    setting_key,
+                    material_container_index,
+                )
+
+        global_user_changes = global_container_stack.userChanges
+        signals = [global_user_changes.propertyChanged]
+        if extruder_values:
+            extruder_user_changes = extruder_stack.userChanges
+            signals.append(extruder_user_changes.propertyChanged)
+        with postponeSignals(
+            *signals, compress=CompressTechnique.CompressPerParameterValue
+        ):
+            for setting_key, value_string in extruder_values.items():
+                extruder_user_changes.setProperty(setting_key, "value", value_string)
+            for setting_key, value_string in global_values.items():
+                global_user_changes.setProperty(setting_key, "value", value_string)
@@ -6,6 +6,20 @@ from UM.Application import Application
 
 from UM.FlameProfiler import pyqtSlot
 
+try:
+    from cura.ApplicationMetadata import CuraSDKVersion
+except ImportError:  # Cura <= 3.6
+    CuraSDKVersion = "6.0.0"
+if CuraSDKVersion >= "8.0.0":
+    from PyQt6.QtCore import QTimer
+else:
+    from PyQt5.QtCore import QTimer
+
+from typing import List, Optional, Set
+
+from .MaterialSettableKeysIndex import MaterialSettableKeysIndex
+from .PluginProfiler import PluginProfiler, profiled
+
 
 class MaterialSettingsPluginVisibilityHandler(SettingVisibilityHandler):
     def __init__(self, parent=None, *args, **kwargs):
@@ -13,9 +27,21 @@ class MaterialSettingsPluginVisibilityHandler(SettingVisibilityHandler):
 
         self._preferences = Application.getInstance().getPreferences()
 
+        # Changes are collected and applied in one go, so toggling a number of settings in a row results in
+        # a single visibilityChanged signal and a single preference update
+        self._pending_visible = None  # type: Optional[Set[str]]
+        self._update_timer = QTimer()
+        self._update_timer.setInterval(250)
+        self._update_timer.setSingleShot(True)
+        self._update_timer.timeout.connect(self.applyPendingVisibility)
+
         self._loadPreferredSettings()
         self.visibilityChanged.connect(self._updatePreference)
 
+        Application.getInstance().applicationShuttingDown.connect(
+            self.applyPendingVisibility
+        )
+
     def _loadPreferredSettings(self) -> None:
         visibility_string = self._preferences.getValue(
             "material_settings/visible_settings"
@@ -34,21 +60,72 @@ class MaterialSettingsPluginVisibilityHandler(SettingVisibilityHandler):
             self.setVisible(material_settings)
 
     def _updatePreference(self) -> None:
+        profiler = PluginProfiler.getInstance()
+        profiler.increment(
+            "signals.MaterialSettingsPluginVisibilityHandler.visibilityChanged"
+        )
+        profiler.increment("preference_writes")
         visibility_string = ";".join(self.getVisible())
         self._preferences.setValue(
             "material_settings/visible_settings", visibility_string
         )
 
+    def getVisible(self) -> Set[str]:
+        if self._pending_visible is not None:
+            return set(self._pending_visible)
+        return super().getVisible()
+
+    def _scheduleVisible(self, visible_settings: Set[str]) -> None:
+        self._pending_visible = visible_settings
+        self._update_timer.start()
+
+    @pyqtSlot()
+    @profiled("MaterialSettingsPluginVisibilityHandler.applyPendingVisibility")
+    def applyPendingVisibility(self) -> None:
+        self._update_timer.stop()
+        if self._pending_visible is None:
+            return
+
+        visible_settings = self._pending_visible
+        self._pending_visible = None
+        self.setVisible(visible_settings)
+
     # Set a single SettingDefinition's visible state
     @pyqtSlot(str, bool)
     def setSettingVisibility(self, key: str, visible: bool) -> None:
+        self.setSettingsVisibility([key], visible)
+
+    # Set the visible state of a number of SettingDefinitions at once
+    @pyqtSlot("QStringList", bool)
+    @profiled("MaterialSettingsPluginVisibilityHandler.setSettingsVisibility")
+    def setSettingsVisibility(self, keys: List[str], visible: bool) -> None:
         visible_settings = self.getVisible()
         if visible:
-            visible_settings.add(key)
+            visible_settings.update(keys)
         else:
-            try:
-                visible_settings.remove(key)
-            except KeyError:
-                pass
+            visible_settings.difference_update(keys)
 
-        self.setVisible(visible_settings)
+        self._scheduleVisible(visible_settings)
+
+    # Set the visible state of all material-settable settings in a category
+    @pyqtSlot(str, bool)
+    @profiled("MaterialSettingsPluginVisibilityHandler.setCategoryVisibility")
+    def setCategoryVisibility(self, category_key: str, visible: bool) -> None:
+        global_stack = Application.getInstance().getGlobalContainerStack()
+        if not global_stack:
+            return
+        definition_container = global_stack.getBottom()
+
+        categories = definition_container.findDefinitions(key=category_key)
+        if not categories:
+            return
+
+        material_settable_keys = MaterialSettableKeysIndex.getInstance().getKeys(
+            definition_container
+        )
+        keys = [
+            definition.key
+            for definition in categories[0].findDefinitions()
+            if definition.type != "category" and definition.key in material_settable_keys
+        ]
+        self.setSettingsVisibility(keys, visible)
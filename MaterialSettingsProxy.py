@@ -6,19 +6,31 @@ try:
 except ImportError:  # Cura <= 3.6
     CuraSDKVersion = "6.0.0"
 if CuraSDKVersion >= "8.0.0":
-    from PyQt6.QtCore import QObject, pyqtSlot
+    from PyQt6.QtCore import QObject, QTimer, QUrl, pyqtProperty, pyqtSignal, pyqtSlot
 else:
-    from PyQt5.QtCore import QObject, pyqtSlot
+    from PyQt5.QtCore import QObject, QTimer, QUrl, pyqtProperty, pyqtSignal, pyqtSlot
 
+from UM.Logger import Logger
 from cura.CuraApplication import CuraApplication
 
-from typing import Any, Optional
+from typing import Any, Dict, List, Optional
 
 from .MaterialSettingsPluginVisibilityHandler import (
     MaterialSettingsPluginVisibilityHandler,
 )
 from .MaterialSettingDefinitionsModel import MaterialSettingDefinitionsModel
 from .CustomStackProxy import CustomStackProxy
+from .ContainerIdCache import ContainerIdCache
+from .CustomStackPool import CustomStackPool
+from .MaterialContainersIndex import MaterialContainersIndex
+from .MaterialComparisonModel import MaterialComparisonModel
+from .MaterialLibraryValidator import MaterialLibraryValidator
+from .MaterialOverridesIndex import MaterialOverridesIndex
+from .MaterialOverridesTransfer import MaterialOverridesTransfer
+from .MaterialPrefetcher import MaterialPrefetcher
+from .MaterialSettingsCore import MaterialSettingsCore
+from .MaterialWriteCoalescer import MaterialWriteCoalescer
+from .PluginProfiler import PluginProfiler, profiled
 
 
 class MaterialSettingsProxy(QObject):
@@ -27,11 +39,44 @@ class MaterialSettingsProxy(QObject):
 
         self._custom_stacks = []
         self._material_setting_definitions_models = []
-        self._material_settings_visibility_handlers = []
+        self._material_comparison_models = []
+        self._visibility_handler = None  # type: Optional[MaterialSettingsPluginVisibilityHandler]
+        self._overrides_index = None  # type: Optional[MaterialOverridesIndex]
+        self._library_validator = None  # type: Optional[MaterialLibraryValidator]
+        self._prefetcher = None  # type: Optional[MaterialPrefetcher]
+
+        container_registry = CuraApplication.getInstance().getContainerRegistry()
+        self._container_registry = container_registry
+        self._material_containers_index = MaterialContainersIndex(container_registry)
+        self._custom_stack_pool = CustomStackPool(container_registry)
+        self._write_coalescer = MaterialWriteCoalescer(
+            container_registry, self._material_containers_index
+        )
+        self._core = MaterialSettingsCore(
+            container_registry,
+            self._write_coalescer.markDirty,
+            self._material_containers_index,
+        )
+        self._overrides_transfer = MaterialOverridesTransfer(
+            container_registry, self._core
+        )
+
+        self._preferences = CuraApplication.getInstance().getPreferences()
+        self._profiler = PluginProfiler.getInstance()
+        self._profiler.setEnabled(
+            bool(self._preferences.getValue("material_settings/profiling_enabled"))
+        )
+        # Notify QML of new profiling data at most once per interval
+        self._profile_timer = QTimer(self)
+        self._profile_timer.setInterval(1000)
+        self._profile_timer.timeout.connect(self._onProfileTimer)
+        if self._profiler.isEnabled():
+            self._profile_timer.start()
 
     @pyqtSlot(result=QObject)
+    @profiled("MaterialSettingsProxy.makeCustomStack")
     def makeCustomStack(self) -> Optional["QObject"]:
-        stack = CustomStackProxy()
+        stack = CustomStackProxy(self._custom_stack_pool, self._write_coalescer)
         stack.destroyed.connect(self._forgetCustomStack)
         self._custom_stacks.append(stack)
         return stack
@@ -43,7 +88,25 @@ class MaterialSettingsProxy(QObject):
         except ValueError:
             pass
 
+    @pyqtSlot(result="QVariantMap")
+    def getCustomStackPoolStats(self) -> Dict[str, Any]:
+        return self._custom_stack_pool.getStats()
+
+    @pyqtSlot(result="QVariantMap")
+    def getContainerIdCacheStats(self) -> Dict[str, int]:
+        return ContainerIdCache.getInstance().getStats()
+
+    @pyqtSlot(result="QVariantMap")
+    def getMaterialWriteStats(self) -> Dict[str, int]:
+        return self._write_coalescer.getStats()
+
+    # Save the materials that were edited since the last save, eg when the dialog is closed
+    @pyqtSlot()
+    def flushMaterialWrites(self) -> None:
+        self._write_coalescer.flush()
+
     @pyqtSlot(result=QObject)
+    @profiled("MaterialSettingsProxy.makeMaterialSettingDefinitionsModel")
     def makeMaterialSettingDefinitionsModel(self) -> Optional["QObject"]:
         model = MaterialSettingDefinitionsModel()
         model.destroyed.connect(self._forgetMaterialSettingDefinitionsModel)
@@ -58,23 +121,184 @@ class MaterialSettingsProxy(QObject):
             pass
 
     @pyqtSlot(result=QObject)
-    def makeVisibilityHandler(self) -> Optional["QObject"]:
-        visibility_handler = MaterialSettingsPluginVisibilityHandler()
-        visibility_handler.destroyed.connect(self._forgetVisibilityHandler)
-        self._material_settings_visibility_handlers.append(visibility_handler)
-        return visibility_handler
+    @profiled("MaterialSettingsProxy.makeMaterialComparisonModel")
+    def makeMaterialComparisonModel(self) -> Optional["QObject"]:
+        model = MaterialComparisonModel(
+            self._container_registry, self.makeVisibilityHandler()
+        )
+        model.destroyed.connect(self._forgetMaterialComparisonModel)
+        self._material_comparison_models.append(model)
+        return model
 
-    def _forgetVisibilityHandler(self, visibility_handler):
-        visibility_handler.destroyed.disconnect(self._forgetVisibilityHandler)
+    def _forgetMaterialComparisonModel(self, model):
+        model.destroyed.disconnect(self._forgetMaterialComparisonModel)
         try:
-            self._material_settings_visibility_handlers.remove(visibility_handler)
+            self._material_comparison_models.remove(model)
         except ValueError:
             pass
 
+    @pyqtSlot(result=QObject)
+    def makeVisibilityHandler(self) -> Optional["QObject"]:
+        # All views share a single visibility handler, so the preference is only parsed once
+        if self._visibility_handler is None:
+            self._visibility_handler = MaterialSettingsPluginVisibilityHandler(
+                parent=self
+            )
+        return self._visibility_handler
+
+    # Which materials set which of the visible material settings
+    @pyqtProperty(QObject, constant=True)
+    def overridesIndex(self) -> MaterialOverridesIndex:
+        if self._overrides_index is None:
+            self._overrides_index = MaterialOverridesIndex(
+                self._container_registry, self.makeVisibilityHandler(), parent=self
+            )
+        return self._overrides_index
+
+    # Checks the setting values of all materials for the active machine
+    @pyqtProperty(QObject, constant=True)
+    def libraryValidator(self) -> MaterialLibraryValidator:
+        if self._library_validator is None:
+            self._library_validator = MaterialLibraryValidator(
+                self._container_registry, parent=self
+            )
+        return self._library_validator
+
+    # Loads the containers of the materials of the active machine while the Materials page is shown
+    @pyqtProperty(QObject, constant=True)
+    def materialPrefetcher(self) -> MaterialPrefetcher:
+        if self._prefetcher is None:
+            self._prefetcher = MaterialPrefetcher(self._container_registry, parent=self)
+        return self._prefetcher
+
     @pyqtSlot(str, str, "QVariant")
     def setMaterialContainersPropertyValue(
         self, base_file: str, key: str, value: Any
     ) -> None:
-        container_registry = CuraApplication.getInstance().getContainerRegistry()
-        for container in container_registry.findInstanceContainers(base_file=base_file):
-            container.setProperty(key, "value", value)
+        self.setMaterialContainersPropertyValues(base_file, {key: value})
+
+    @pyqtSlot(str, "QVariantMap", result=int)
+    @profiled("MaterialSettingsProxy.setMaterialContainersPropertyValues")
+    def setMaterialContainersPropertyValues(
+        self, base_file: str, values: Dict[str, Any]
+    ) -> int:
+        """Set a number of setting values on all containers derived from a base_file.
+
+        Returns the number of containers that were changed.
+        """
+        return self._core.setPropertyValues(base_file, values)
+
+    @pyqtSlot("QVariantList", result=int)
+    @profiled("MaterialSettingsProxy.applyMaterialContainersPropertyValues")
+    def applyMaterialContainersPropertyValues(self, edits: List[Any]) -> int:
+        """Apply a list of edits, each either a {"base_file": ..., "values": {...}} map or a
+        (base_file, values) tuple. Edits to the same base_file are merged before writing.
+
+        Returns the number of containers that were changed.
+        """
+        return self._core.applyPropertyValues(
+            (edit.get("base_file"), edit.get("values", {}))
+            if isinstance(edit, dict)
+            else edit
+            for edit in edits
+        )
+
+    # The Qt-independent part of this object, for use from scripts
+    def getCore(self) -> MaterialSettingsCore:
+        return self._core
+
+    @pyqtSlot(QUrl, result="QVariantMap")
+    @profiled("MaterialSettingsProxy.exportMaterialSettings")
+    def exportMaterialSettings(self, file_url: QUrl) -> Dict[str, Any]:
+        """Export the material-settable setting values of all materials to a JSON Lines or CSV file."""
+        file_path = file_url.toLocalFile()
+        try:
+            count = self._overrides_transfer.exportToFile(
+                file_path, self._core.getMaterialSettableKeys()
+            )
+        except (OSError, ValueError) as e:
+            Logger.logException("e", "Could not export material settings")
+            return {"status": "error", "message": str(e), "path": file_path}
+
+        return {"status": "success", "path": file_path, "count": count}
+
+    @pyqtSlot(QUrl, result="QVariantMap")
+    @profiled("MaterialSettingsProxy.importMaterialSettings")
+    def importMaterialSettings(self, file_url: QUrl) -> Dict[str, Any]:
+        """Import setting values for materials from a JSON Lines or CSV file."""
+        file_path = file_url.toLocalFile()
+        try:
+            result = self.importMaterialSettingsFromPath(file_path)
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            Logger.logException("e", "Could not import material settings")
+            return {"status": "error", "message": str(e), "path": file_path}
+
+        return dict(result, status="success", path=file_path)
+
+    def importMaterialSettingsFromPath(self, file_path: str) -> Dict[str, Any]:
+        """Import setting values from a file and save the changed materials.
+
+        Returns the report of MaterialSettingsCore.applyOverrides.
+        """
+        result = self._overrides_transfer.importFromFile(file_path)
+        self._write_coalescer.flush()
+        return result
+
+    useMaterialValueFunctionChanged = pyqtSignal()
+
+    def setUseMaterialValueFunction(self, use_material_value_function: bool) -> None:
+        if use_material_value_function == self.useMaterialValueFunction:
+            return
+        self._preferences.setValue(
+            "material_settings/use_material_value_function", use_material_value_function
+        )
+        self.useMaterialValueFunctionChanged.emit()
+
+    # Whether "Use value from material" links settings with materialValue or with extruderValueFromContainer
+    @pyqtProperty(bool, fset=setUseMaterialValueFunction, notify=useMaterialValueFunctionChanged)
+    def useMaterialValueFunction(self) -> bool:
+        return bool(
+            self._preferences.getValue("material_settings/use_material_value_function")
+        )
+
+    profilingChanged = pyqtSignal()
+
+    def setProfilingEnabled(self, enabled: bool) -> None:
+        if enabled == self._profiler.isEnabled():
+            return
+        self._profiler.setEnabled(enabled)
+        self._preferences.setValue("material_settings/profiling_enabled", enabled)
+        if enabled:
+            self._profile_timer.start()
+        else:
+            self._profile_timer.stop()
+        self.profilingChanged.emit()
+
+    @pyqtProperty(bool, fset=setProfilingEnabled, notify=profilingChanged)
+    def profilingEnabled(self) -> bool:
+        return self._profiler.isEnabled()
+
+    # Call counts and latency histograms of the plugin's slots, and counts of registry queries,
+    # stack updates and signal emissions
+    @pyqtProperty("QVariantMap", notify=profilingChanged)
+    def profile(self) -> Dict[str, Any]:
+        return self._profiler.getReport()
+
+    def _onProfileTimer(self) -> None:
+        if self._profiler.hasChanged():
+            self.profilingChanged.emit()
+
+    @pyqtSlot()
+    def resetProfile(self) -> None:
+        self._profiler.reset()
+        self.profilingChanged.emit()
+
+    @pyqtSlot(QUrl, result=bool)
+    def dumpProfile(self, file_url: QUrl) -> bool:
+        """Write the profiling data to a JSON file, to attach to a bug report."""
+        try:
+            self._profiler.dumpToFile(file_url.toLocalFile())
+        except OSError:
+            Logger.logException("e", "Could not write the profiling data")
+            return False
+        return True
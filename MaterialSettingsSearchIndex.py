@@ -0,0 +1,147 @@
+# Copyright (c) 2026 Aldo Hoeben / fieldOfView
+# The MaterialSettingsPlugin is released under the terms of the AGPLv3 or higher.
+
+from UM.Application import Application
+from UM.Settings.DefinitionContainer import DefinitionContainer
+from UM.Settings.SettingDefinition import SettingDefinition
+
+from typing import Any, Dict, FrozenSet, List, Optional, Set
+
+from .MaterialSettableKeysIndex import MaterialSettableKeysIndex
+from .PluginProfiler import PluginProfiler
+
+
+class _SearchIndexEntry:
+    """The searchable texts of the material-settable settings of a single definition container."""
+
+    def __init__(self) -> None:
+        self.texts = {}  # type: Dict[str, str]
+        self.ancestors = {}  # type: Dict[str, List[str]]
+        # Posting lists of the keys whose text contains a trigram, or a word starting with a short prefix
+        self.trigrams = {}  # type: Dict[str, Set[str]]
+        self.prefixes = {}  # type: Dict[str, Set[str]]
+
+
+class MaterialSettingsSearchIndex:
+    """Finds material-settable settings by their (localized) label, key or description.
+
+    The index is built once per definition container and shared by all setting pickers.
+    Terms of three or more characters are looked up by trigram, shorter terms match the
+    start of a word. Results include the ancestors of the matching settings, so the model
+    can show them in their categories.
+    """
+
+    PREFIX_LENGTH = 2
+
+    __instance = None  # type: Optional[MaterialSettingsSearchIndex]
+
+    @classmethod
+    def getInstance(cls) -> "MaterialSettingsSearchIndex":
+        if cls.__instance is None:
+            cls.__instance = cls()
+        return cls.__instance
+
+    def __init__(self) -> None:
+        self._entries = {}  # type: Dict[str, _SearchIndexEntry]
+
+        Application.getInstance().globalContainerStackChanged.connect(
+            self._onGlobalContainerStackChanged
+        )
+
+    def search(
+        self,
+        definition_container: DefinitionContainer,
+        text: str,
+        i18n_catalog: Any = None,
+    ) -> FrozenSet[str]:
+        """Return the keys of the settings that match all terms in text, and of their ancestors."""
+        entry = self._getEntry(definition_container, i18n_catalog)
+
+        matches = None  # type: Optional[Set[str]]
+        for term in text.lower().split():
+            term_matches = self._findTerm(entry, term)
+            matches = term_matches if matches is None else matches & term_matches
+            if not matches:
+                return frozenset()
+        if matches is None:
+            return frozenset(entry.texts.keys())
+
+        result = set(matches)
+        for key in matches:
+            result.update(entry.ancestors[key])
+        return frozenset(result)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def _findTerm(self, entry: _SearchIndexEntry, term: str) -> Set[str]:
+        if len(term) <= self.PREFIX_LENGTH:
+            return entry.prefixes.get(term, set())
+
+        # Narrow down the candidates with the rarest trigrams, then check the full term
+        trigrams = sorted(
+            (entry.trigrams.get(term[i : i + 3], set()) for i in range(len(term) - 2)),
+            key=len,
+        )
+        candidates = trigrams[0]
+        for postings in trigrams[1:]:
+            if not candidates:
+                break
+            candidates = candidates & postings
+        return {key for key in candidates if term in entry.texts[key]}
+
+    def _getEntry(
+        self, definition_container: DefinitionContainer, i18n_catalog: Any
+    ) -> _SearchIndexEntry:
+        definition_id = definition_container.getId()
+        try:
+            return self._entries[definition_id]
+        except KeyError:
+            pass
+
+        PluginProfiler.getInstance().increment("search_index_builds")
+        material_settable_keys = MaterialSettableKeysIndex.getInstance().getKeys(
+            definition_container
+        )
+        entry = _SearchIndexEntry()
+        for definition in definition_container.findDefinitions():
+            if definition.type == "category" or definition.key not in material_settable_keys:
+                continue
+            self._addDefinition(entry, definition, i18n_catalog)
+
+        self._entries[definition_id] = entry
+        return entry
+
+    def _addDefinition(
+        self, entry: _SearchIndexEntry, definition: SettingDefinition, i18n_catalog: Any
+    ) -> None:
+        key = definition.key
+        label = definition.label or ""
+        description = definition.description or ""
+        if i18n_catalog is not None:
+            label = i18n_catalog.i18nc(key + " label", label)
+            description = i18n_catalog.i18nc(key + " description", description)
+
+        text = "\n".join([label, key, key.replace("_", " "), description]).lower()
+        entry.texts[key] = text
+
+        ancestors = []
+        parent = definition.parent
+        while parent is not None:
+            ancestors.append(parent.key)
+            parent = parent.parent
+        entry.ancestors[key] = ancestors
+
+        for i in range(len(text) - 2):
+            entry.trigrams.setdefault(text[i : i + 3], set()).add(key)
+        for word in text.split():
+            for length in range(1, min(len(word), self.PREFIX_LENGTH) + 1):
+                entry.prefixes.setdefault(word[:length], set()).add(key)
+
+    def _onGlobalContainerStackChanged(self) -> None:
+        global_stack = Application.getInstance().getGlobalContainerStack()
+        active_definition_id = global_stack.getBottom().getId() if global_stack else None
+
+        for definition_id in list(self._entries.keys()):
+            if definition_id != active_definition_id:
+                del self._entries[definition_id]
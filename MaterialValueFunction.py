@@ -0,0 +1,202 @@
+# Copyright (c) 2026 Aldo Hoeben / fieldOfView
+# The MaterialSettingsPlugin is released under the terms of the AGPLv3 or higher.
+
+import functools
+import threading
+
+from UM.Settings.ContainerStack import ContainerStack
+from UM.Settings.Interfaces import ContainerInterface
+from UM.Settings.PropertyEvaluationContext import PropertyEvaluationContext
+from UM.Settings.SettingFunction import SettingFunction
+from cura.CuraApplication import CuraApplication
+from cura.Settings.ExtruderManager import ExtruderManager
+
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .PluginProfiler import PluginProfiler
+
+
+class MaterialValueFunction:
+    """The materialValue(extruder_position, key) formula function.
+
+    Returns the value of a setting as it is resolved from the material container of an
+    extruder downwards, the same way extruderValueFromContainer does for a fixed container
+    index. The material container is found by its role in the stack rather than by its
+    position, so the link keeps working when containers are added to the stack.
+
+    The container that provides the value is cached per (extruder_position, key). The cache
+    is invalidated when a value changes in the material container or a container below it,
+    and when the containers of an extruder stack are swapped. Formulas are also evaluated
+    while slicing, so the cache is guarded by a lock; the signals that invalidate it are
+    only connected on the main thread, when the global stack or its extruders change.
+    """
+
+    OPERATOR_NAME = "materialValue"
+
+    __instance = None  # type: Optional[MaterialValueFunction]
+
+    @classmethod
+    def getInstance(cls) -> "MaterialValueFunction":
+        if cls.__instance is None:
+            cls.__instance = cls()
+        return cls.__instance
+
+    def __init__(self) -> None:
+        self._application = CuraApplication.getInstance()
+
+        # (extruder_position, key) -> (container index, raw value)
+        self._cache = {}  # type: Dict[Tuple[int, str], Tuple[int, Any]]
+        self._cache_lock = threading.Lock()
+        # Incremented whenever cached values are invalidated, so values that were resolved meanwhile are not stored
+        self._generation = 0
+        # The signals of containers keep weak references, so the connected callbacks are kept here
+        self._connected_stacks = {}  # type: Dict[int, Tuple[ContainerStack, Callable]]
+        self._connected_containers = []  # type: List[Tuple[ContainerInterface, Callable]]
+
+        # The ExtruderManager is created after the plugins are loaded, so it is connected when the global stack is set
+        self._extruder_manager_connected = False
+        self._application.globalContainerStackChanged.connect(self._onGlobalStackChanged)
+
+    def register(self) -> None:
+        SettingFunction.registerOperator(self.OPERATOR_NAME, self)
+        self._onGlobalStackChanged()
+
+    def __call__(self, extruder_position: int, key: str, context: Any = None) -> Any:
+        machine_manager = self._application.getMachineManager()
+        global_stack = machine_manager.activeMachine
+        if global_stack is None:
+            return None
+
+        extruder_position = int(extruder_position)
+        if extruder_position == -1:
+            extruder_position = int(machine_manager.defaultExtruderPosition)
+        try:
+            extruder_stack = global_stack.extruderList[extruder_position]
+        except IndexError:
+            return None
+
+        profiler = PluginProfiler.getInstance()
+        with self._cache_lock:
+            cached = self._cache.get((extruder_position, key))
+        if cached is not None:
+            profiler.increment("material_value_cache_hits")
+            container_index, value = cached
+        else:
+            profiler.increment("material_value_cache_misses")
+            container_index, value = self._resolve(extruder_position, extruder_stack, key)
+
+        if not isinstance(value, SettingFunction):
+            return value
+
+        # Formulas are evaluated like the stack does when starting at the container that has the value
+        evaluation_context = self._application.getCuraFormulaFunctions().createContextForDefaultValueEvaluation(
+            extruder_stack
+        )  # type: PropertyEvaluationContext
+        evaluation_context.context["evaluate_from_container_index"] = container_index
+        evaluation_context.pushContainer(extruder_stack)
+        result = value(extruder_stack, evaluation_context)
+        evaluation_context.popContainer()
+        return result
+
+    def clear(self) -> None:
+        for stack, callback in self._connected_stacks.values():
+            stack.containersChanged.disconnect(callback)
+        self._disconnectContainers()
+        with self._cache_lock:
+            self._connected_stacks.clear()
+            self._cache.clear()
+            self._generation += 1
+
+    def _resolve(
+        self, extruder_position: int, extruder_stack: ContainerStack, key: str
+    ) -> Tuple[int, Any]:
+        """Find the container from the material down that has a value for key."""
+        with self._cache_lock:
+            generation = self._generation
+
+        containers = extruder_stack.getContainers()
+        try:
+            material_index = containers.index(extruder_stack.material)
+        except ValueError:
+            return len(containers), None
+
+        container_index = len(containers)
+        value = None
+        for index in range(material_index, len(containers)):
+            value = containers[index].getProperty(key, "value")
+            if value is not None:
+                container_index = index
+                break
+
+        with self._cache_lock:
+            # Values are only cached for stacks whose changes invalidate the cache
+            connected_stack = self._connected_stacks.get(extruder_position)
+            if (
+                generation == self._generation
+                and connected_stack is not None
+                and connected_stack[0] is extruder_stack
+            ):
+                self._cache[(extruder_position, key)] = (container_index, value)
+        return container_index, value
+
+    def _onGlobalStackChanged(self, *args) -> None:
+        if not self._extruder_manager_connected:
+            extruder_manager = ExtruderManager.getInstance()
+            if extruder_manager is not None:
+                extruder_manager.extrudersChanged.connect(self._onGlobalStackChanged)
+                self._extruder_manager_connected = True
+
+        self.clear()
+        global_stack = self._application.getGlobalContainerStack()
+        if global_stack is None:
+            return
+        for extruder_position, extruder_stack in enumerate(global_stack.extruderList):
+            self._connectStack(extruder_position, extruder_stack)
+
+    def _connectStack(self, extruder_position: int, extruder_stack: ContainerStack) -> None:
+        callback = functools.partial(self._onContainersChanged, extruder_position)
+        with self._cache_lock:
+            self._connected_stacks[extruder_position] = (extruder_stack, callback)
+        extruder_stack.containersChanged.connect(callback)
+        self._connectContainers(extruder_position, extruder_stack)
+
+    def _connectContainers(self, extruder_position: int, extruder_stack: ContainerStack) -> None:
+        containers = extruder_stack.getContainers()
+        try:
+            material_index = containers.index(extruder_stack.material)
+        except ValueError:
+            return
+        for container in containers[material_index:]:
+            callback = functools.partial(self._onPropertyChanged, extruder_position)
+            self._connected_containers.append((container, callback))
+            container.propertyChanged.connect(callback)
+
+    def _disconnectContainers(self, extruder_position: Optional[int] = None) -> None:
+        connected_containers = []  # type: List[Tuple[ContainerInterface, Callable]]
+        for container, callback in self._connected_containers:
+            if extruder_position is None or callback.args[0] == extruder_position:
+                container.propertyChanged.disconnect(callback)
+            else:
+                connected_containers.append((container, callback))
+        self._connected_containers = connected_containers
+
+    def _invalidateExtruder(self, extruder_position: int) -> None:
+        with self._cache_lock:
+            self._generation += 1
+            for cache_key in [
+                cache_key for cache_key in self._cache if cache_key[0] == extruder_position
+            ]:
+                del self._cache[cache_key]
+
+    def _onContainersChanged(self, extruder_position: int, *args) -> None:
+        # A material, variant or other container was swapped; the container indices may have shifted too
+        self._invalidateExtruder(extruder_position)
+        self._disconnectContainers(extruder_position)
+        stack = self._connected_stacks[extruder_position][0]
+        self._connectContainers(extruder_position, stack)
+
+    def _onPropertyChanged(self, extruder_position: int, key: str, property_name: str) -> None:
+        if property_name == "value":
+            with self._cache_lock:
+                self._cache.pop((extruder_position, key), None)
+                self._generation += 1
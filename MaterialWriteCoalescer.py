@@ -0,0 +1,112 @@
+# Copyright (c) 2026 Aldo Hoeben / fieldOfView
+# The MaterialSettingsPlugin is released under the terms of the AGPLv3 or higher.
+
+from UM.Application import Application
+from UM.Logger import Logger
+from UM.Settings.ContainerRegistry import ContainerRegistry
+
+try:
+    from cura.ApplicationMetadata import CuraSDKVersion
+except ImportError:  # Cura <= 3.6
+    CuraSDKVersion = "6.0.0"
+if CuraSDKVersion >= "8.0.0":
+    from PyQt6.QtCore import QTimer
+else:
+    from PyQt5.QtCore import QTimer
+
+from typing import Dict
+
+from .ContainerIdCache import ContainerIdCache
+from .MaterialContainersIndex import MaterialContainersIndex
+from .PluginProfiler import PluginProfiler, profiled
+
+
+class MaterialWriteCoalescer:
+    """Saves the material base files touched by the plugin's edits once per time window.
+
+    Every derived container of an fdm_material that is marked dirty causes the whole base
+    file to be serialized when the dirty containers are saved. Instead, the base files that
+    were edited are collected and each one is saved once when the window ends or when
+    flush() is called, after which its derived containers are marked clean.
+    """
+
+    def __init__(
+        self,
+        container_registry: ContainerRegistry,
+        containers_index: MaterialContainersIndex,
+        interval: int = 2000,
+    ) -> None:
+        self._container_registry = container_registry
+        self._containers_index = containers_index
+
+        # Number of container writes requested per base_file in the current window
+        self._pending = {}  # type: Dict[str, int]
+
+        self._requested_writes = 0
+        self._performed_writes = 0
+
+        # The window starts with the first edit, so a continuous stream of edits is still saved regularly
+        self._flush_timer = QTimer()
+        self._flush_timer.setInterval(interval)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.timeout.connect(self.flush)
+
+        Application.getInstance().applicationShuttingDown.connect(self.flush)
+
+    def markDirty(self, base_file: str, container_count: int = 1) -> None:
+        """Record that a number of containers derived from base_file were changed."""
+        if not base_file or container_count <= 0:
+            return
+        self._pending[base_file] = self._pending.get(base_file, 0) + container_count
+        self._requested_writes += container_count
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+
+    def hasPendingWrites(self) -> bool:
+        return bool(self._pending)
+
+    @profiled("MaterialWriteCoalescer.flush")
+    def flush(self) -> None:
+        """Save each base file that was edited since the last flush."""
+        self._flush_timer.stop()
+        if not self._pending:
+            return
+
+        pending = self._pending
+        self._pending = {}
+
+        profiler = PluginProfiler.getInstance()
+        container_id_cache = ContainerIdCache.getInstance()
+        with self._container_registry.lockFile():
+            for base_file, requested_writes in pending.items():
+                containers = self._containers_index.getContainers(base_file)
+                if not any(container.isDirty() for container in containers):
+                    continue  # already saved, eg by the autosave of Cura
+
+                base_container = container_id_cache.findContainer(base_file)
+                if base_container is None or base_container.isReadOnly():
+                    continue
+
+                # Serializing the base file includes the values of all derived containers
+                base_container.setDirty(True)
+                try:
+                    self._container_registry.saveContainer(base_container)
+                except OSError:
+                    Logger.logException("e", "Could not save material %s" % base_file)
+                    continue
+                for container in containers:
+                    container.setDirty(False)
+
+                self._performed_writes += 1
+                profiler.increment("material_writes")
+                profiler.increment("material_writes_saved", requested_writes - 1)
+
+    def getStats(self) -> Dict[str, int]:
+        return {
+            "pending": len(self._pending),
+            "requested": self._requested_writes,
+            "written": self._performed_writes,
+            "saved": self._requested_writes
+            - self._performed_writes
+            - sum(self._pending.values()),
+        }
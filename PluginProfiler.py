@@ -0,0 +1,122 @@
+# Copyright (c) 2026 Aldo Hoeben / fieldOfView
+# The MaterialSettingsPlugin is released under the terms of the AGPLv3 or higher.
+
+import bisect
+import functools
+import json
+import time
+
+from typing import Any, Callable, Dict, Optional
+
+
+class PluginProfiler:
+    """Opt-in instrumentation of the plugin's slots, registry queries and signal emissions.
+
+    When profiling is disabled, profiled functions are called directly and counters are not
+    updated, so the instrumentation costs no more than a flag check.
+    """
+
+    # Upper bounds in milliseconds of the latency histogram buckets; the last bucket is unbounded
+    HISTOGRAM_BOUNDS = [0.1, 0.5, 1.0, 5.0, 10.0, 50.0, 100.0, 500.0]
+
+    __instance = None  # type: Optional[PluginProfiler]
+
+    @classmethod
+    def getInstance(cls) -> "PluginProfiler":
+        if cls.__instance is None:
+            cls.__instance = cls()
+        return cls.__instance
+
+    def __init__(self) -> None:
+        self._enabled = False
+        self._changed = False
+        self._timings = {}  # type: Dict[str, Dict[str, Any]]
+        self._counters = {}  # type: Dict[str, int]
+
+    def isEnabled(self) -> bool:
+        return self._enabled
+
+    def setEnabled(self, enabled: bool) -> None:
+        self._enabled = enabled
+
+    def reset(self) -> None:
+        self._timings.clear()
+        self._counters.clear()
+        self._changed = True
+
+    def hasChanged(self) -> bool:
+        """Check if data was added since the previous call."""
+        changed = self._changed
+        self._changed = False
+        return changed
+
+    def increment(self, name: str, count: int = 1) -> None:
+        if not self._enabled:
+            return
+        self._counters[name] = self._counters.get(name, 0) + count
+        self._changed = True
+
+    def addTiming(self, name: str, duration_ms: float) -> None:
+        try:
+            timing = self._timings[name]
+        except KeyError:
+            timing = {
+                "calls": 0,
+                "total_ms": 0.0,
+                "max_ms": 0.0,
+                "histogram": [0] * (len(self.HISTOGRAM_BOUNDS) + 1),
+            }
+            self._timings[name] = timing
+
+        timing["calls"] += 1
+        timing["total_ms"] += duration_ms
+        timing["max_ms"] = max(timing["max_ms"], duration_ms)
+        timing["histogram"][bisect.bisect_left(self.HISTOGRAM_BOUNDS, duration_ms)] += 1
+        self._changed = True
+
+    def getReport(self) -> Dict[str, Any]:
+        bucket_names = ["<=%gms" % bound for bound in self.HISTOGRAM_BOUNDS] + [
+            ">%gms" % self.HISTOGRAM_BOUNDS[-1]
+        ]
+        timings = {}
+        for name, timing in self._timings.items():
+            timings[name] = {
+                "calls": timing["calls"],
+                "total_ms": timing["total_ms"],
+                "mean_ms": timing["total_ms"] / timing["calls"],
+                "max_ms": timing["max_ms"],
+                "histogram": dict(zip(bucket_names, timing["histogram"])),
+            }
+        return {
+            "enabled": self._enabled,
+            "timings": timings,
+            "counters": dict(self._counters),
+        }
+
+    def dumpToFile(self, file_path: str) -> None:
+        with open(file_path, "w", encoding="utf-8") as f:
+            json.dump(self.getReport(), f, indent=2, sort_keys=True)
+
+
+def profiled(name: str) -> Callable:
+    """Decorator that records call counts and latencies of a function when profiling is enabled.
+
+    Place it below @pyqtSlot, so the slot signature is applied to the wrapped function.
+    """
+
+    def decorator(function: Callable) -> Callable:
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            profiler = PluginProfiler.getInstance()
+            if not profiler.isEnabled():
+                return function(*args, **kwargs)
+
+            start_time = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                profiler.addTiming(name, (time.perf_counter() - start_time) * 1000)
+
+        return wrapper
+
+    return decorator
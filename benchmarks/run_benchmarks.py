@@ -0,0 +1,321 @@
+# Copyright (c) 2026 Aldo Hoeben / fieldOfView
+# The MaterialSettingsPlugin is released under the terms of the AGPLv3 or higher.
+
+"""Headless benchmarks for the hot paths of the MaterialSettingsPlugin.
+
+Uses the stand-ins from tests/stubs.py instead of Uranium and Cura, so only PyQt is needed:
+
+    python benchmarks/run_benchmarks.py --sizes 100 1000 10000 --output bench_output.json
+
+Results are written as JSON, one entry per benchmark and library size.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tests"))
+import stubs
+
+stubs.install()
+
+from PyQt6.QtCore import QCoreApplication
+
+from typing import Any, Callable, Dict, List
+
+VARIANTS_PER_MATERIAL = 4
+SETTINGS_PER_CATEGORY = 100
+
+
+def buildDefinition(definition_count: int) -> stubs.DefinitionContainer:
+    categories = []
+    for category_index in range(max(1, definition_count // SETTINGS_PER_CATEGORY)):
+        category = stubs.SettingDefinition("category_%d" % category_index, "category")
+        for setting_index in range(SETTINGS_PER_CATEGORY):
+            key = "setting_%d_%d" % (category_index, setting_index)
+            definition = stubs.SettingDefinition(
+                key,
+                settable_per_extruder=setting_index % 3 != 0,
+                resolve="max(extruderValues('%s'))" % key if setting_index % 9 == 0 else None,
+                parent=category,
+            )
+            definition.maximum_value = 100
+            category.children.append(definition)
+        categories.append(category)
+    definition = stubs.DefinitionContainer("benchmark_printer", categories)
+    definition.getMetaData()["has_machine_materials"] = True
+    return definition
+
+
+def buildLibrary(application: stubs.Application, material_count: int, definition: stubs.DefinitionContainer) -> List[str]:
+    registry = application.getContainerRegistry()
+    registry.addContainer(definition)
+    for variant_index in range(VARIANTS_PER_MATERIAL):
+        registry.addContainer(stubs.InstanceContainer("variant_%d" % variant_index, {"type": "variant", "definition": definition.getId()}))
+
+    keys = sorted(definition.getAllKeys())
+    base_files = []
+    for material_index in range(material_count):
+        base_file = "material_%d" % material_index
+        base_files.append(base_file)
+        containers_metadata = [{"id": base_file, "definition": "fdmprinter"}] + [
+            {"id": "%s_variant_%d" % (base_file, v), "definition": definition.getId(), "variant_name": "variant_%d" % v}
+            for v in range(VARIANTS_PER_MATERIAL)
+        ]
+        for metadata in containers_metadata:
+            container = stubs.InstanceContainer(metadata.pop("id"), dict(metadata, type="material", base_file=base_file))
+            for key in keys[material_index % 50 : material_index % 50 + 5]:
+                container.setProperty(key, "value", material_index)
+            container.setDirty(False)
+            registry.addContainer(container)
+
+    global_stack = stubs.ContainerStack("benchmark_global_stack")
+    global_stack.addContainer(definition)
+    application.setGlobalContainerStack(global_stack)
+    return base_files
+
+
+def measure(name: str, iterations: int, function: Callable[[int], Any], extra: Callable[[], Dict[str, Any]] = None) -> Dict[str, Any]:
+    start_time = time.perf_counter()
+    for iteration in range(iterations):
+        function(iteration)
+    total_time = time.perf_counter() - start_time
+    result = {
+        "benchmark": name,
+        "iterations": iterations,
+        "total_s": total_time,
+        "mean_us": total_time / iterations * 1e6 if iterations else 0.0,
+    }
+    if extra is not None:
+        result.update(extra())
+    return result
+
+
+def runSize(material_count: int, definition_count: int, iterations: int, profile: bool) -> List[Dict[str, Any]]:
+    application = stubs.Application()
+    stubs.ExtruderManager()
+    definition = buildDefinition(definition_count)
+    base_files = buildLibrary(application, material_count, definition)
+    registry = application.getContainerRegistry()
+    application.getPreferences().addPreference("material_settings/visible_settings", ";".join(sorted(definition.getAllKeys())[:100]))
+    application.getPreferences().addPreference("material_settings/profiling_enabled", profile)
+
+    proxy_module = stubs.importPluginModule("MaterialSettingsProxy")
+    model_module = stubs.importPluginModule("MaterialSettingDefinitionsModel")
+    keys_index_module = stubs.importPluginModule("MaterialSettableKeysIndex")
+    keys_index_module.MaterialSettableKeysIndex.getInstance().clear()
+    # Shared caches hold on to the registry of the previous library size
+    container_id_cache_class = stubs.importPluginModule("ContainerIdCache").ContainerIdCache
+    container_id_cache_class._ContainerIdCache__instance = None
+
+    proxy = proxy_module.MaterialSettingsProxy()
+    rng = random.Random(material_count)
+    keys = sorted(definition.getAllKeys())
+    results = []
+
+    # Switching materials in the settings tab
+    stack = proxy.makeCustomStack()
+    queries_before = registry.query_count
+
+    def switchMaterial(iteration: int) -> None:
+        base_file = base_files[rng.randrange(material_count)]
+        stack.setContainerIds([definition.getId(), "variant_%d" % (iteration % VARIANTS_PER_MATERIAL), base_file + "_variant_0"])
+        stack.getStack()  # applies the container ids
+
+    results.append(measure(
+        "custom_stack_set_container_ids", iterations, switchMaterial,
+        lambda: dict(
+            registry_queries=registry.query_count - queries_before,
+            container_id_cache=container_id_cache_class.getInstance().getStats(),
+        ),
+    ))
+
+    # Switching machine, variant and material one after another in the same event loop turn
+    def switchConfiguration(iteration: int) -> None:
+        base_file = base_files[rng.randrange(material_count)]
+        variant_id = "variant_%d" % (iteration % VARIANTS_PER_MATERIAL)
+        current_ids = stack.containerIds
+        stack.setContainerIds([definition.getId(), variant_id, current_ids[2]])
+        stack.setContainerIds([definition.getId(), variant_id, base_file + "_variant_0"])
+        QCoreApplication.processEvents()
+
+    # With --profile, the suppressed_stack_rebuilds counter shows the intermediate states that were skipped
+    results.append(measure("custom_stack_coalesced_reconfiguration", iterations, switchConfiguration, lambda: {"changes_per_iteration": 2}))
+
+    # Switching materials with 300 setting rows shown, resolved in one pass per switch
+    properties_model = stack.propertiesModel
+    for key in keys[:300]:
+        properties_model.getRow(key)
+    QCoreApplication.processEvents()
+
+    def switchMaterialWithRows(iteration: int) -> None:
+        switchMaterial(iteration)
+        QCoreApplication.processEvents()
+
+    results.append(measure("properties_model_switch_material", iterations, switchMaterialWithRows, lambda: {"rows": 300}))
+
+    # Editing a single setting of a material, fanned out to all its containers
+    def setSingleValue(iteration: int) -> None:
+        proxy.setMaterialContainersPropertyValue(base_files[rng.randrange(material_count)], keys[iteration % len(keys)], iteration)
+
+    results.append(measure("set_material_containers_property_value", iterations, setSingleValue))
+
+    # Editing ten settings of a material in one batch
+    def setBatchValues(iteration: int) -> None:
+        values = {keys[(iteration + offset) % len(keys)]: iteration for offset in range(10)}
+        proxy.setMaterialContainersPropertyValues(base_files[rng.randrange(material_count)], values)
+
+    results.append(measure("set_material_containers_property_values_x10", iterations, setBatchValues))
+
+    # Saving the materials that were edited by the benchmarks above
+    saves_before = registry.save_count
+    results.append(measure(
+        "flush_material_writes", 1, lambda iteration: proxy.flushMaterialWrites(),
+        lambda: dict(container_saves=registry.save_count - saves_before, writes=proxy.getMaterialWriteStats()),
+    ))
+
+    # Finding the materials that set a value for a setting, and the settings a material sets a value for
+    overrides_index = proxy.overridesIndex
+
+    def queryOverrides(iteration: int) -> None:
+        overrides_index.getOverridingMaterials(keys[iteration % len(keys)])
+        overrides_index.getOverriddenKeys(base_files[rng.randrange(material_count)])
+
+    results.append(measure("overrides_index_build", 1, queryOverrides))
+    results.append(measure("overrides_index_query", iterations, queryOverrides))
+
+    # Checking the setting values of all materials in all variants, one time slice at a time
+    validator = proxy.libraryValidator
+
+    def validateLibrary(iteration: int) -> None:
+        validator.start()
+        while validator.running:
+            validator._validateNextTasks()
+
+    results.append(measure(
+        "library_validation", 1, validateLibrary,
+        lambda: dict(validated_containers=validator.finishedCount, total_containers=validator.totalCount, invalid_materials=len(validator.results)),
+    ))
+
+    # Comparing 20 materials on 300 settings, resolving all rows and reading every cell
+    comparison_module = stubs.importPluginModule("MaterialComparisonModel")
+    comparison_visibility = stubs.SettingVisibilityHandler()
+    comparison_visibility.setVisible(set(keys[:300]))
+    comparison_model = comparison_module.MaterialComparisonModel(registry, comparison_visibility)
+    comparison_roles = [comparison_model.ValuesRole, comparison_model.DifferingRole]
+
+    def compareMaterials(iteration: int) -> None:
+        comparison_model.compare(base_files[:20])
+        while comparison_model.canFetchMore():
+            comparison_model.fetchMore()
+        for row in range(comparison_model.rowCount()):
+            index = comparison_model.index(row, 0)
+            for role in comparison_roles:
+                comparison_model.data(index, role)
+
+    results.append(measure(
+        "material_comparison_20x300", 10, compareMaterials,
+        lambda: dict(
+            rows=comparison_model.rowCount(),
+            differing_rows=sum(
+                comparison_model.data(comparison_model.index(row, 0), comparison_model.DiffersRole)
+                for row in range(comparison_model.rowCount())
+            ),
+        ),
+    ))
+
+    # Loading the materials of the machine around the selected material, one timer tick at a time
+    prefetcher = proxy.materialPrefetcher
+
+    def prefetchMaterials(iteration: int) -> None:
+        prefetcher.start(base_files[material_count // 2])
+        while prefetcher.running:
+            prefetcher._loadNextMaterial()
+
+    results.append(measure("material_prefetch", 1, prefetchMaterials, prefetcher.getStats))
+
+    # Filtering the definitions in the setting picker
+    model = model_module.MaterialSettingDefinitionsModel()
+    model._container = definition
+    all_definitions = definition.findDefinitions()
+
+    def filterDefinitions(iteration: int) -> None:
+        for setting_definition in all_definitions:
+            model._isDefinitionVisible(setting_definition)
+
+    keys_index_module.MaterialSettableKeysIndex.getInstance().clear()
+    results.append(measure("definitions_model_filter_cold", 1, filterDefinitions, lambda: {"definitions": len(all_definitions)}))
+    results.append(measure("definitions_model_filter_warm", max(1, iterations // 100), filterDefinitions, lambda: {"definitions": len(all_definitions)}))
+
+    # Typing a search term in the setting picker, one keystroke at a time
+    search_terms = ["s", "se", "set", "setting 1", "setting_2_4", "zzz"]
+
+    def searchDefinitions(iteration: int) -> None:
+        model.searchText = search_terms[iteration % len(search_terms)]
+        filterDefinitions(iteration)
+
+    results.append(measure(
+        "definitions_model_search", max(1, iterations // 10), searchDefinitions,
+        lambda: {"matches": len(model._search_keys or ())},
+    ))
+    model.searchText = ""
+
+    # Toggling 50 settings in the setting picker
+    handler = proxy.makeVisibilityHandler()
+    preferences = application.getPreferences()
+    writes_before = preferences.write_count
+
+    def toggleSettings(iteration: int) -> None:
+        for key in keys[:50]:
+            handler.setSettingVisibility(key, iteration % 2 == 0)
+        handler.applyPendingVisibility()
+
+    results.append(measure(
+        "visibility_handler_toggle_x50", max(1, iterations // 10), toggleSettings,
+        lambda: {"preference_writes": preferences.write_count - writes_before},
+    ))
+
+    for result in results:
+        result["materials"] = material_count
+        result["containers"] = material_count * (VARIANTS_PER_MATERIAL + 1)
+        result["definition_count"] = len(all_definitions)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000], help="numbers of materials in the synthetic library")
+    parser.add_argument("--definitions", type=int, default=3000, help="number of setting definitions")
+    parser.add_argument("--iterations", type=int, default=1000)
+    parser.add_argument("--output", help="file to write the JSON results to; defaults to stdout")
+    parser.add_argument("--profile", action="store_true", help="include the plugin's own instrumentation data")
+    args = parser.parse_args()
+
+    application = QCoreApplication.instance() or QCoreApplication(sys.argv[:1])
+    profiler = stubs.importPluginModule("PluginProfiler").PluginProfiler.getInstance()
+
+    results = []
+    for material_count in args.sizes:
+        results.extend(runSize(material_count, args.definitions, args.iterations, args.profile))
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    if args.profile:
+        report["profile"] = profiler.getReport()
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+// Copyright (c) 2026 Aldo Hoeben / fieldOfView
+// The MaterialSettingsPlugin is released under the terms of the AGPLv3 or higher.
+
+import QtQuick 2.15
+import QtQuick.Controls 2.4
+
+import UM 1.5 as UM
+import Cura 1.0 as Cura
+
+UM.Dialog
+{
+    id: comparisonDialog
+
+    title: catalog.i18nc("@title:window", "Compare Material Family")
+    width: screenScaleFactor * 800
+    height: screenScaleFactor * 500
+
+    backgroundColor: UM.Theme.getColor("background_1")
+
+    // The material to compare with the other materials of the same brand and type
+    property string baseFile: ""
+
+    property var comparisonModel: null
+    property real labelColumnWidth: UM.Theme.getSize("setting_control").width
+    property real valueColumnWidth: screenScaleFactor * 100
+
+    onVisibilityChanged:
+    {
+        if(visible)
+        {
+            if(comparisonModel == null)
+            {
+                comparisonModel = MaterialSettingsPlugin.makeMaterialComparisonModel()
+            }
+            comparisonModel.compareFamily(baseFile)
+        }
+    }
+
+    UM.Label
+    {
+        id: statusLabel
+
+        anchors
+        {
+            top: parent.top
+            left: parent.left
+            right: differencesCheckBox.left
+        }
+
+        wrapMode: Text.Wrap
+        text: comparisonModel && comparisonModel.baseFiles.length > 0 ? catalog.i18nc("@label", "Setting values of %1 materials for %2. Values that differ from those of %3 are highlighted.").arg(comparisonModel.baseFiles.length).arg(Cura.MachineManager.activeMachine.name).arg(comparisonModel.materialNames[comparisonModel.referenceColumn]) : ""
+    }
+
+    UM.CheckBox
+    {
+        id: differencesCheckBox
+
+        anchors
+        {
+            top: parent.top
+            right: parent.right
+        }
+
+        text: catalog.i18nc("@option:check", "Only show differences")
+        checked: comparisonModel ? comparisonModel.showOnlyDifferences : false
+        onClicked: comparisonModel.showOnlyDifferences = checked
+    }
+
+    Flickable
+    {
+        id: comparisonFlickable
+
+        anchors
+        {
+            top: statusLabel.bottom
+            topMargin: UM.Theme.getSize("default_margin").height
+            left: parent.left
+            right: parent.right
+            bottom: parent.bottom
+        }
+
+        clip: true
+        contentWidth: labelColumnWidth + (comparisonModel ? comparisonModel.baseFiles.length : 0) * valueColumnWidth
+        contentHeight: height
+        flickableDirection: Flickable.HorizontalFlick
+        ScrollBar.horizontal: UM.ScrollBar {}
+
+        Row
+        {
+            id: headerRow
+
+            Item
+            {
+                width: labelColumnWidth
+                height: 1
+            }
+
+            Repeater
+            {
+                model: comparisonModel ? comparisonModel.materialNames : []
+
+                UM.Label
+                {
+                    width: valueColumnWidth
+                    font: UM.Theme.getFont("default_bold")
+                    // The material that the others are compared with
+                    color: index == comparisonModel.referenceColumn ? UM.Theme.getColor("primary") : UM.Theme.getColor("text")
+                    elide: Text.ElideRight
+                    text: modelData
+                }
+            }
+        }
+
+        // Rows are resolved by the model as the list asks for them
+        ListView
+        {
+            id: comparisonList
+
+            anchors
+            {
+                top: headerRow.bottom
+                topMargin: UM.Theme.getSize("narrow_margin").height
+                bottom: parent.bottom
+            }
+            width: comparisonFlickable.contentWidth
+
+            ScrollBar.vertical: UM.ScrollBar {}
+            clip: true
+
+            model: comparisonModel
+
+            delegate: Row
+            {
+                height: UM.Theme.getSize("section").height
+
+                UM.Label
+                {
+                    width: labelColumnWidth
+                    height: parent.height
+                    elide: Text.ElideRight
+                    font: model.differs ? UM.Theme.getFont("default_bold") : UM.Theme.getFont("default")
+                    text: model.label
+                }
+
+                Repeater
+                {
+                    model: values
+
+                    Rectangle
+                    {
+                        width: valueColumnWidth
+                        height: parent.height
+                        color: differing[index] ? UM.Theme.getColor("setting_validation_warning_background") : "transparent"
+
+                        UM.Label
+                        {
+                            anchors.fill: parent
+                            anchors.leftMargin: UM.Theme.getSize("narrow_margin").width
+                            elide: Text.ElideRight
+                            // Values that are set by the material itself are shown in bold
+                            font: overridden[index] ? UM.Theme.getFont("default_bold") : UM.Theme.getFont("default")
+                            text: modelData
+                        }
+                    }
+                }
+            }
+        }
+    }
+
+    rightButtons: [
+        Cura.TertiaryButton
+        {
+            text: catalog.i18nc("@action:button", "Close")
+            onClicked: comparisonDialog.visible = false
+        }
+    ]
+
+    Item
+    {
+        UM.I18nCatalog { id: catalog; name: "cura"; }
+    }
+}
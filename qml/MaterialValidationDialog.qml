@@ -0,0 +1,124 @@
+// Copyright (c) 2026 Aldo Hoeben / fieldOfView
+// The MaterialSettingsPlugin is released under the terms of the AGPLv3 or higher.
+
+import QtQuick 2.15
+import QtQuick.Controls 2.4
+
+import UM 1.5 as UM
+import Cura 1.0 as Cura
+
+UM.Dialog
+{
+    id: validationDialog
+
+    title: catalog.i18nc("@title:window", "Check Material Settings")
+    width: screenScaleFactor * 480
+    height: screenScaleFactor * 400
+
+    backgroundColor: UM.Theme.getColor("background_1")
+
+    property var validator: MaterialSettingsPlugin.libraryValidator
+
+    onVisibilityChanged:
+    {
+        if(visible)
+        {
+            validator.start()
+        }
+        else
+        {
+            validator.cancel()
+        }
+    }
+
+    UM.Label
+    {
+        id: statusLabel
+
+        anchors
+        {
+            top: parent.top
+            left: parent.left
+            right: parent.right
+        }
+
+        wrapMode: Text.Wrap
+        text:
+        {
+            if(validator.running)
+            {
+                return catalog.i18nc("@label", "Checked %1 of %2 material profiles for %3...").arg(validator.finishedCount).arg(validator.totalCount).arg(Cura.MachineManager.activeMachine.name)
+            }
+            if(validator.results.length == 0)
+            {
+                return catalog.i18nc("@label", "All %1 material profiles for %2 have valid setting values.").arg(validator.totalCount).arg(Cura.MachineManager.activeMachine.name)
+            }
+            return catalog.i18nc("@label", "%1 materials have setting values that are out of range for %2.").arg(validator.results.length).arg(Cura.MachineManager.activeMachine.name)
+        }
+    }
+
+    ListView
+    {
+        id: resultsList
+
+        anchors
+        {
+            top: statusLabel.bottom
+            topMargin: UM.Theme.getSize("default_margin").height
+            left: parent.left
+            right: parent.right
+            bottom: parent.bottom
+        }
+
+        ScrollBar.vertical: UM.ScrollBar {}
+        clip: true
+        spacing: UM.Theme.getSize("narrow_margin").height
+
+        model: validator.results
+
+        delegate: Column
+        {
+            width: resultsList.width - UM.Theme.getSize("default_margin").width
+
+            UM.Label
+            {
+                width: parent.width
+                font: UM.Theme.getFont("default_bold")
+                elide: Text.ElideRight
+                text: catalog.i18nc("@label", "%1: %2 errors, %3 warnings").arg(modelData.name).arg(modelData.errors).arg(modelData.warnings)
+            }
+
+            Repeater
+            {
+                model: modelData.entries
+
+                UM.Label
+                {
+                    width: parent.width
+                    leftPadding: UM.Theme.getSize("default_margin").width
+                    elide: Text.ElideRight
+                    color: modelData.error ? UM.Theme.getColor("setting_validation_error") : UM.Theme.getColor("setting_validation_warning")
+                    text: modelData.variant != "" ? "%1 = %2 (%3)".arg(modelData.key).arg(modelData.value).arg(modelData.variant) : "%1 = %2".arg(modelData.key).arg(modelData.value)
+                }
+            }
+        }
+    }
+
+    rightButtons: [
+        Cura.SecondaryButton
+        {
+            text: validator.running ? catalog.i18nc("@action:button", "Cancel") : catalog.i18nc("@action:button", "Check again")
+            onClicked: validator.running ? validator.cancel() : validator.start()
+        },
+        Cura.TertiaryButton
+        {
+            text: catalog.i18nc("@action:button", "Close")
+            onClicked: validationDialog.visible = false
+        }
+    ]
+
+    Item
+    {
+        UM.I18nCatalog { id: catalog; name: "cura"; }
+    }
+}
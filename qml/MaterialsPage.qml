@@ -6,6 +6,7 @@
 import QtQuick 2.7
 import QtQuick.Controls 2.15
 import QtQuick.Dialogs
+import QtQuick.Window 2.2
 
 import UM 1.5 as UM
 import Cura 1.5 as Cura
@@ -52,12 +53,37 @@ UM.ManagementPage
     {
         resetExpandedActiveMaterial()
         base.newRootMaterialIdToSwitchTo = active_root_material_id
+        MaterialSettingsPlugin.materialPrefetcher.start(active_root_material_id)
+    }
+
+    // Stop loading materials in the background when the page is closed
+    Component.onDestruction: MaterialSettingsPlugin.materialPrefetcher.cancel()
+
+    // The page is kept while the Preferences dialog is closed, so stop and resume with the dialog
+    Connections
+    {
+        target: base.Window.window
+        function onVisibleChanged()
+        {
+            if(base.Window.window.visible)
+            {
+                MaterialSettingsPlugin.materialPrefetcher.start(active_root_material_id)
+            }
+            else
+            {
+                MaterialSettingsPlugin.materialPrefetcher.cancel()
+            }
+        }
     }
 
     // Every time the selected item has changed, notify to the details panel
     onCurrentItemChanged:
     {
         forceActiveFocus()
+        if(currentItem != null)
+        {
+            MaterialSettingsPlugin.materialPrefetcher.setCurrentMaterial(currentItem.root_material_id)
+        }
         if(materialDetailsPanel.currentItem != currentItem)
         {
             materialDetailsPanel.currentItem = currentItem
@@ -205,6 +231,59 @@ UM.ManagementPage
                 }
                 enabled: base.hasCurrentItem
             }
+            Cura.MenuSeparator {}
+            Cura.MenuItem
+            {
+                id: exportSettingsMenuButton
+                text: catalog.i18nc("@action:button", "Export Material Settings...")
+                onClicked:
+                {
+                    forceActiveFocus();
+                    exportMaterialSettingsDialog.open();
+                }
+            }
+            Cura.MenuItem
+            {
+                id: importSettingsMenuButton
+                text: catalog.i18nc("@action:button", "Import Material Settings...")
+                onClicked:
+                {
+                    forceActiveFocus();
+                    importMaterialSettingsDialog.open();
+                }
+            }
+            Cura.MenuItem
+            {
+                id: validateSettingsMenuButton
+                text: catalog.i18nc("@action:button", "Check Material Settings...")
+                onClicked:
+                {
+                    forceActiveFocus();
+                    materialValidationDialog.visible = true;
+                }
+            }
+            Cura.MenuItem
+            {
+                id: compareFamilyMenuButton
+                text: catalog.i18nc("@action:button", "Compare Material Family...")
+                enabled: base.hasCurrentItem
+                onClicked:
+                {
+                    forceActiveFocus();
+                    materialComparisonDialog.baseFile = base.currentItem.root_material_id;
+                    materialComparisonDialog.visible = true;
+                }
+            }
+        }
+
+        MaterialValidationDialog
+        {
+            id: materialValidationDialog
+        }
+
+        MaterialComparisonDialog
+        {
+            id: materialComparisonDialog
         }
 
         // Dialogs
@@ -283,6 +362,64 @@ UM.ManagementPage
             }
         }
 
+        FileDialog
+        {
+            id: exportMaterialSettingsDialog
+            title: catalog.i18nc("@title:window", "Export Material Settings")
+            fileMode: FileDialog.SaveFile
+            nameFilters: ["JSON Lines (*.jsonl)", "CSV (*.csv)"]
+            currentFolder: CuraApplication.getDefaultPath("dialog_material_path")
+            onAccepted:
+            {
+                const result = MaterialSettingsPlugin.exportMaterialSettings(selectedFile);
+
+                const messageDialog = Qt.createQmlObject("import Cura 1.5 as Cura; Cura.MessageDialog { onClosed: destroy() }", base);
+                messageDialog.title = catalog.i18nc("@title:window", "Export Material Settings");
+                messageDialog.standardButtons = Dialog.Ok;
+                switch (result.status)
+                {
+                    case "error":
+                        messageDialog.text = catalog.i18nc("@info:status Don't translate the XML tags <filename> and <message>!", "Failed to export material settings to <filename>%1</filename>: <message>%2</message>").arg(result.path).arg(result.message);
+                        break;
+                    case "success":
+                        messageDialog.text = catalog.i18nc("@info:status Don't translate the XML tag <filename>!", "Exported %1 material setting values to <filename>%2</filename>").arg(result.count).arg(result.path);
+                        break;
+                }
+                messageDialog.open();
+
+                CuraApplication.setDefaultPath("dialog_material_path", currentFolder);
+            }
+        }
+
+        FileDialog
+        {
+            id: importMaterialSettingsDialog
+            title: catalog.i18nc("@title:window", "Import Material Settings")
+            fileMode: FileDialog.OpenFile
+            nameFilters: ["JSON Lines (*.jsonl)", "CSV (*.csv)"]
+            currentFolder: CuraApplication.getDefaultPath("dialog_material_path")
+            onAccepted:
+            {
+                const result = MaterialSettingsPlugin.importMaterialSettings(selectedFile);
+
+                const messageDialog = Qt.createQmlObject("import Cura 1.5 as Cura; Cura.MessageDialog { onClosed: destroy() }", base);
+                messageDialog.title = catalog.i18nc("@title:window", "Import Material Settings");
+                messageDialog.standardButtons = Dialog.Ok;
+                switch (result.status)
+                {
+                    case "error":
+                        messageDialog.text = catalog.i18nc("@info:status Don't translate the XML tags <filename> and <message>!", "Could not import material settings from <filename>%1</filename>: <message>%2</message>").arg(result.path).arg(result.message);
+                        break;
+                    case "success":
+                        messageDialog.text = catalog.i18nc("@info:status", "Imported %1 material setting values, skipped %2. %3 material containers were changed.").arg(result.records - result.skipped).arg(result.skipped).arg(result.containers);
+                        break;
+                }
+                messageDialog.open();
+
+                CuraApplication.setDefaultPath("dialog_material_path", currentFolder);
+            }
+        }
+
         UM.I18nCatalog { id: catalog; name: "cura" }
     }
 }
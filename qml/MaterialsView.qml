@@ -561,157 +561,230 @@ Item
                 onClicked: settingPickDialog.visible = true
             }
 
-            ListView
+            UM.Label
             {
-                id: settingsPage
-                clip: true
+                id: overriddenSettingsLabel
+                property var overridesIndex: MaterialSettingsPlugin.overridesIndex
 
-                property var customStack:
+                anchors
                 {
-                    var stack = MaterialSettingsPlugin.makeCustomStack()
-                    stack.containerIds = Qt.binding(function() { return [
-                        Cura.MachineManager.activeMachine.definition.id,
-                        Cura.MachineManager.activeStack.variant.id,
-                        base.containerId
-                    ]})
-                    return stack
+                    left: customiseSettingsButton.right
+                    leftMargin: UM.Theme.getSize("default_margin").width
+                    right: parent.right
+                    verticalCenter: customiseSettingsButton.verticalCenter
                 }
+                elide: Text.ElideRight
+                visible: parent.visible
+                text:
+                {
+                    if (!visible || overridesIndex.revision < 0)
+                    {
+                        return ""
+                    }
+                    const count = overridesIndex.getOverriddenKeys(base.containerId).length
+                    return catalog.i18ncp("@label", "This material sets %1 setting", "This material sets %1 settings", count).arg(count)
+                }
+            }
 
+            // The custom stack, definitions model and setting providers are only created while the tab is shown
+            Loader
+            {
+                id: settingsPageLoader
                 anchors
                 {
                     left: parent.left
-                    leftMargin: UM.Theme.getSize("default_margin").width
                     right: parent.right
-                    rightMargin: UM.Theme.getSize("default_margin").width
                     bottom: customiseSettingsButton.top
                     top: parent.top
-                    topMargin: UM.Theme.getSize("default_margin").height
                 }
+                active: parent.visible
+                sourceComponent: settingsPageComponent
+            }
+        }
+    }
 
-                spacing: UM.Theme.getSize("narrow_margin").height
+    Component
+    {
+        id: settingsPageComponent
 
-                ScrollBar.vertical: UM.ScrollBar
-                {
-                    parent: settingsPage.parent
-                    anchors
-                    {
-                        top: settingsPage.top
-                        right: parent.right
-                        bottom: settingsPage.bottom
-                    }
-                    visible: settingsPage.visible
-                }
+        ListView
+        {
+            id: settingsPage
+            clip: true
+
+            property var customStack:
+            {
+                var stack = MaterialSettingsPlugin.makeCustomStack()
+                stack.containerIds = Qt.binding(function() { return [
+                    Cura.MachineManager.activeMachine.definition.id,
+                    Cura.MachineManager.activeStack.variant.id,
+                    base.containerId
+                ]})
+                return stack
+            }
+            // Resolves the properties of all shown settings in one pass, instead of a pair of providers per setting
+            property var propertiesModel: customStack.propertiesModel
+
+            // Return the stack to the pool right away, instead of when the proxy is garbage collected, and
+            // save the materials that were edited while the tab was shown
+            Component.onDestruction:
+            {
+                customStack.releaseStack()
+                // Drop the binding, so changes of the active machine are no longer passed to the released stack
+                customStack.containerIds = []
+                MaterialSettingsPlugin.flushMaterialWrites()
+            }
 
-                model: UM.SettingDefinitionsModel
+            anchors
+            {
+                left: parent.left
+                leftMargin: UM.Theme.getSize("default_margin").width
+                right: parent.right
+                rightMargin: UM.Theme.getSize("default_margin").width
+                bottom: parent.bottom
+                top: parent.top
+                topMargin: UM.Theme.getSize("default_margin").height
+            }
+
+            spacing: UM.Theme.getSize("narrow_margin").height
+
+            ScrollBar.vertical: UM.ScrollBar
+            {
+                parent: settingsPage.parent
+                anchors
                 {
-                    containerId: Cura.MachineManager.activeMachine != null ? Cura.MachineManager.activeMachine.definition.id: ""
-                    visibilityHandler: base.visibilityHandler
-                    expanded: ["*"]
+                    top: settingsPage.top
+                    right: parent.right
+                    bottom: settingsPage.bottom
                 }
+                visible: settingsPage.visible
+            }
 
-                delegate: Loader
-                {
-                    height: UM.Theme.getSize("section").height
+            model: UM.SettingDefinitionsModel
+            {
+                containerId: Cura.MachineManager.activeMachine != null ? Cura.MachineManager.activeMachine.definition.id: ""
+                visibilityHandler: base.visibilityHandler
+                expanded: ["*"]
+            }
 
-                    anchors.left: parent.left
-                    anchors.leftMargin: UM.Theme.getSize("default_margin").width
-                    anchors.right: parent.right
-                    anchors.rightMargin: UM.Theme.getSize("default_margin").width
+            delegate: Loader
+            {
+                height: UM.Theme.getSize("section").height
 
-                    property var definition: model
-                    property var settingDefinitionsModel: settingsPage.model
-                    property var propertyProvider: provider
-                    property var globalPropertyProvider: inheritStackProvider
-                    property var externalResetHandler: resetToDefault
+                anchors.left: parent.left
+                anchors.leftMargin: UM.Theme.getSize("default_margin").width
+                anchors.right: parent.right
+                anchors.rightMargin: UM.Theme.getSize("default_margin").width
 
-                    function resetToDefault()
-                    {
-                        settingsPage.customStack.removeInstanceFromTop(model.key)
-                    }
+                property var definition: model
+                property var settingDefinitionsModel: settingsPage.model
+                // The row also holds limit_to_extruder from the global stack
+                property var propertyProvider: settingsPage.propertiesModel.getRow(model.key)
+                property var globalPropertyProvider: propertyProvider
+                property var externalResetHandler: resetToDefault
 
-                    Component.onCompleted:
-                    {
-                        provider.containerStackId = settingsPage.customStack.stackId
-                    }
+                function resetToDefault()
+                {
+                    settingsPage.customStack.removeInstanceFromTop(model.key)
+                }
 
-                    Connections
+                Connections
+                {
+                    target: base
+                    function onEditingEnabledChanged()
                     {
-                        target: base
-                        function onContainerIdChanged()
-                        {
-                            provider.containerStackId = settingsPage.customStack.stackId
-                        }
+                        item.enabled = base.editingEnabled;
+                        item.showRevertButton = base.editingEnabled;
                     }
+                }
 
-                    Connections
-                    {
-                        target: base
-                        function onEditingEnabledChanged()
-                        {
-                            item.enabled = base.editingEnabled;
-                            item.showRevertButton = base.editingEnabled;
-                        }
-                    }
 
+                //Qt5.4.2 and earlier has a bug where this causes a crash: https://bugreports.qt.io/browse/QTBUG-35989
+                //In addition, while it works for 5.5 and higher, the ordering of the actual combo box drop down changes,
+                //causing nasty issues when selecting different options. So disable asynchronous loading of enum type completely.
+                asynchronous: model.type != "enum" && model.type != "extruder"
 
-                    //Qt5.4.2 and earlier has a bug where this causes a crash: https://bugreports.qt.io/browse/QTBUG-35989
-                    //In addition, while it works for 5.5 and higher, the ordering of the actual combo box drop down changes,
-                    //causing nasty issues when selecting different options. So disable asynchronous loading of enum type completely.
-                    asynchronous: model.type != "enum" && model.type != "extruder"
+                onLoaded: {
+                    item.showRevertButton = base.editingEnabled
+                    item.showInheritButton = false
+                    item.showLinkedSettingIcon = false
+                    item.doDepthIndentation = false
+                    item.doQualityUserSettingEmphasis = false
+                    item.enabled = base.editingEnabled
+                }
 
-                    onLoaded: {
-                        item.showRevertButton = base.editingEnabled
-                        item.showInheritButton = false
-                        item.showLinkedSettingIcon = false
-                        item.doDepthIndentation = false
-                        item.doQualityUserSettingEmphasis = false
-                        item.enabled = base.editingEnabled
+                sourceComponent:
+                {
+                    switch(model.type)
+                    {
+                        case "int":
+                            return settingTextField
+                        case "[int]":
+                            return settingTextField
+                        case "float":
+                            return settingTextField
+                        case "enum":
+                            return settingComboBox
+                        case "extruder":
+                            return settingExtruder
+                        case "optional_extruder":
+                            return settingOptionalExtruder
+                        case "bool":
+                            return settingCheckBox
+                        case "str":
+                            return settingTextField
+                        case "category":
+                            return settingCategory
+                        default:
+                            return settingUnknown
                     }
+                }
+
+                // Marks the settings that this material sets a value for
+                Rectangle
+                {
+                    id: overrideBadge
+                    property var overridesIndex: MaterialSettingsPlugin.overridesIndex
 
-                    sourceComponent:
+                    anchors
                     {
-                        switch(model.type)
-                        {
-                            case "int":
-                                return settingTextField
-                            case "[int]":
-                                return settingTextField
-                            case "float":
-                                return settingTextField
-                            case "enum":
-                                return settingComboBox
-                            case "extruder":
-                                return settingExtruder
-                            case "optional_extruder":
-                                return settingOptionalExtruder
-                            case "bool":
-                                return settingCheckBox
-                            case "str":
-                                return settingTextField
-                            case "category":
-                                return settingCategory
-                            default:
-                                return settingUnknown
-                        }
+                        right: parent.left
+                        rightMargin: UM.Theme.getSize("narrow_margin").width
+                        verticalCenter: parent.verticalCenter
                     }
+                    width: UM.Theme.getSize("narrow_margin").width
+                    height: width
+                    radius: width / 2
+                    color: UM.Theme.getColor("primary")
+                    visible: model.type != "category" && overridesIndex.revision >= 0 && overridesIndex.isOverridden(base.containerId, model.key)
 
-                    UM.SettingPropertyProvider
+                    MouseArea
                     {
-                        id: provider
-                        containerStackId: "" // to be specified when the component loads
-                        key: model.key
-                        storeIndex: 0
-                        watchedProperties: [ "value", "enabled", "state", "validationState" ]
+                        id: overrideBadgeMouseArea
+                        anchors.fill: parent
+                        hoverEnabled: true
+                        acceptedButtons: Qt.NoButton
                     }
 
-                    // Specialty provider that only watches global_inherits (we cant filter on what property changed we get events
-                    // so we bypass that to make a dedicated provider).
-                    UM.SettingPropertyProvider
+                    UM.ToolTip
                     {
-                        id: inheritStackProvider
-                        containerStackId: Cura.MachineManager.activeMachine.id
-                        key: model.key
-                        watchedProperties: [ "limit_to_extruder" ]
+                        visible: overrideBadgeMouseArea.containsMouse
+                        tooltipText:
+                        {
+                            if (!visible)
+                            {
+                                return ""
+                            }
+                            const base_files = Object.keys(overrideBadge.overridesIndex.getOverridingMaterials(model.key)).sort()
+                            let text = catalog.i18nc("@info:tooltip", "This material sets a value for this setting. Materials that set a value for it: %1").arg(base_files.join(", "))
+                            // Materials are only indexed once Cura has loaded them
+                            const unloaded_count = overrideBadge.overridesIndex.unloadedMaterialsCount
+                            if (unloaded_count > 0)
+                            {
+                                text += " " + catalog.i18ncp("@info:tooltip", "%1 material is not loaded yet and is not included.", "%1 materials are not loaded yet and are not included.", unloaded_count).arg(unloaded_count)
+                            }
+                            return text
+                        }
                     }
                 }
             }
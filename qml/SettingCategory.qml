@@ -21,4 +21,38 @@ Cura.CategoryButton
     signal contextMenuRequested()
 
     onClicked: expanded ? settingDefinitionsModel.collapseRecursive(definition.key) : settingDefinitionsModel.expandRecursive(definition.key)
+
+    Row
+    {
+        anchors
+        {
+            right: parent.right
+            rightMargin: 3 * UM.Theme.getSize("default_margin").width
+            verticalCenter: parent.verticalCenter
+        }
+        spacing: UM.Theme.getSize("default_margin").width
+
+        UM.Label
+        {
+            text: catalog.i18nc("@action:button", "All")
+            color: UM.Theme.getColor("text_link")
+            MouseArea
+            {
+                anchors.fill: parent
+                cursorShape: Qt.PointingHandCursor
+                onClicked: settingDefinitionsModel.visibilityHandler.setCategoryVisibility(definition.key, true)
+            }
+        }
+        UM.Label
+        {
+            text: catalog.i18nc("@action:button", "None")
+            color: UM.Theme.getColor("text_link")
+            MouseArea
+            {
+                anchors.fill: parent
+                cursorShape: Qt.PointingHandCursor
+                onClicked: settingDefinitionsModel.visibilityHandler.setCategoryVisibility(definition.key, false)
+            }
+        }
+    }
 }
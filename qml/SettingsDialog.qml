@@ -17,24 +17,57 @@ UM.Dialog {
 
     property var visibilityHandler
 
+    // The definitions model is only created while the dialog is shown
+    property var definitionsModel: null
+
+    function createDefinitionsModel()
+    {
+        var model = MaterialSettingsPlugin.makeMaterialSettingDefinitionsModel()
+        model.containerId = Cura.MachineManager.activeMachine.definition.id
+        model.visibilityHandler = settingsDialog.visibilityHandler
+        model.showAll = toggleShowAll.checked
+        model.showAncestors = true
+        model.expanded = [ "*" ]
+        model.exclude = [ "machine_settings", "command_line_settings" ]
+        return model
+    }
+
     onVisibilityChanged:
     {
         if(visible)
         {
+            if(definitionsModel == null)
+            {
+                definitionsModel = createDefinitionsModel()
+            }
             updateFilter()
         }
+        else
+        {
+            visibilityHandler.applyPendingVisibility()
+            definitionsModel = null
+        }
     }
 
     function updateFilter()
     {
-        var new_filter = {};
-
-        if(filterInput.text != "")
+        filterTimer.stop();
+        if(definitionsModel == null)
         {
-            new_filter["i18n_label"] = "*" + filterInput.text;
+            return;
         }
 
-        listview.model.filter = new_filter;
+        // The search index matches labels, keys and descriptions and adds the ancestors of matches
+        definitionsModel.searchText = filterInput.text;
+    }
+
+    // Wait for a pause in typing before searching
+    Timer
+    {
+        id: filterTimer
+        interval: 150
+        repeat: false
+        onTriggered: settingsDialog.updateFilter()
     }
 
     Cura.TextField {
@@ -49,7 +82,7 @@ UM.Dialog {
 
         placeholderText: catalog.i18nc("@label:textbox", "Filter...");
 
-        onTextChanged: settingsDialog.updateFilter()
+        onTextChanged: filterTimer.restart()
     }
 
     UM.CheckBox
@@ -62,10 +95,13 @@ UM.Dialog {
         }
 
         text: catalog.i18nc("@label:checkbox", "Show all")
-        checked: listview.model.showAll
+        checked: true
         onClicked:
         {
-            listview.model.showAll = checked;
+            if(settingsDialog.definitionsModel != null)
+            {
+                settingsDialog.definitionsModel.showAll = checked;
+            }
         }
     }
 
@@ -84,17 +120,7 @@ UM.Dialog {
         ScrollBar.vertical: UM.ScrollBar { id: scrollBar }
         clip: true
 
-        property var definitionsModel:
-        {
-            var model = MaterialSettingsPlugin.makeMaterialSettingDefinitionsModel()
-            model.containerId = Cura.MachineManager.activeMachine.definition.id
-            model.visibilityHandler = settingsDialog.visibilityHandler
-            model.showAll = true
-            model.showAncestors = true
-            model.expanded = [ "*" ]
-            model.exclude = [ "machine_settings", "command_line_settings" ]
-            return model
-        }
+        property var definitionsModel: settingsDialog.definitionsModel
         model: definitionsModel
 
         delegate:Loader
@@ -119,9 +145,23 @@ UM.Dialog {
                 }
             }
         }
-        Component.onCompleted: settingsDialog.updateFilter()
     }
 
+    leftButtons: [
+        UM.CheckBox
+        {
+            text: catalog.i18nc("@label:checkbox", "Link with materialValue()")
+            checked: MaterialSettingsPlugin.useMaterialValueFunction
+            onClicked: MaterialSettingsPlugin.useMaterialValueFunction = checked
+
+            UM.ToolTip
+            {
+                visible: parent.hovered
+                tooltipText: catalog.i18nc("@info:tooltip", "\"Use value from material\" links settings with a formula that finds the material wherever it is in the stack. Profiles that contain it can only be read with this plugin installed; uncheck to link settings by the position of the material instead.")
+            }
+        }
+    ]
+
     rightButtons: [
         Cura.TertiaryButton {
             text: catalog.i18nc("@action:button", "Close");
@@ -203,6 +203,32 @@ Item
             }
             enabled: base.hasCurrentItem
         }
+
+        // Import material settings button
+        Button
+        {
+            id: importSettingsMenuButton
+            text: catalog.i18nc("@action:button", "Import Settings")
+            iconName: "document-import"
+            onClicked:
+            {
+                forceActiveFocus();
+                importMaterialSettingsDialog.open();
+            }
+        }
+
+        // Export material settings button
+        Button
+        {
+            id: exportSettingsMenuButton
+            text: catalog.i18nc("@action:button", "Export Settings")
+            iconName: "document-export"
+            onClicked:
+            {
+                forceActiveFocus();
+                exportMaterialSettingsDialog.open();
+            }
+        }
     }
 
     Item {
@@ -380,6 +406,60 @@ Item
         }
     }
 
+    FileDialog
+    {
+        id: exportMaterialSettingsDialog
+        title: catalog.i18nc("@title:window", "Export Material Settings")
+        selectExisting: false
+        nameFilters: ["JSON Lines (*.jsonl)", "CSV (*.csv)"]
+        folder: CuraApplication.getDefaultPath("dialog_material_path")
+        onAccepted:
+        {
+            var result = MaterialSettingsPlugin.exportMaterialSettings(fileUrl);
+
+            messageDialog.title = catalog.i18nc("@title:window", "Export Material Settings");
+            if (result.status == "error")
+            {
+                messageDialog.icon = StandardIcon.Critical;
+                messageDialog.text = catalog.i18nc("@info:status Don't translate the XML tags <filename> and <message>!", "Failed to export material settings to <filename>%1</filename>: <message>%2</message>").arg(result.path).arg(result.message);
+            }
+            else
+            {
+                messageDialog.icon = StandardIcon.Information;
+                messageDialog.text = catalog.i18nc("@info:status Don't translate the XML tag <filename>!", "Exported %1 material setting values to <filename>%2</filename>").arg(result.count).arg(result.path);
+            }
+            messageDialog.open();
+            CuraApplication.setDefaultPath("dialog_material_path", folder);
+        }
+    }
+
+    FileDialog
+    {
+        id: importMaterialSettingsDialog
+        title: catalog.i18nc("@title:window", "Import Material Settings")
+        selectExisting: true
+        nameFilters: ["JSON Lines (*.jsonl)", "CSV (*.csv)"]
+        folder: CuraApplication.getDefaultPath("dialog_material_path")
+        onAccepted:
+        {
+            var result = MaterialSettingsPlugin.importMaterialSettings(fileUrl);
+
+            messageDialog.title = catalog.i18nc("@title:window", "Import Material Settings");
+            if (result.status == "error")
+            {
+                messageDialog.icon = StandardIcon.Critical;
+                messageDialog.text = catalog.i18nc("@info:status Don't translate the XML tags <filename> and <message>!", "Could not import material settings from <filename>%1</filename>: <message>%2</message>").arg(result.path).arg(result.message);
+            }
+            else
+            {
+                messageDialog.icon = StandardIcon.Information;
+                messageDialog.text = catalog.i18nc("@info:status", "Imported %1 material setting values, skipped %2. %3 material containers were changed.").arg(result.records - result.skipped).arg(result.skipped).arg(result.containers);
+            }
+            messageDialog.open();
+            CuraApplication.setDefaultPath("dialog_material_path", folder);
+        }
+    }
+
     MessageDialog
     {
         id: messageDialog
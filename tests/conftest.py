@@ -0,0 +1,97 @@
+# Copyright (c) 2026 Aldo Hoeben / fieldOfView
+# The MaterialSettingsPlugin is released under the terms of the AGPLv3 or higher.
+
+"""Fixtures for the tests in this folder, which use the stand-ins from stubs.py:
+
+    python -m pytest tests
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import stubs
+
+stubs.install()
+
+import pytest
+from PyQt6.QtCore import QCoreApplication
+
+# Plugin classes that are shared through getInstance()
+SINGLETONS = [
+    "ContainerIdCache",
+    "MaterialSettableKeysIndex",
+    "MaterialSettingsSearchIndex",
+    "MaterialValueFunction",
+    "PluginProfiler",
+]
+
+
+@pytest.fixture(scope="session")
+def qt_application() -> QCoreApplication:
+    return QCoreApplication.instance() or QCoreApplication(sys.argv[:1])
+
+
+@pytest.fixture
+def application(qt_application) -> stubs.Application:
+    """A fresh application with an empty container registry and no plugin singletons."""
+    for name in SINGLETONS:
+        setattr(stubs.importPluginModule(name).__dict__[name], "_%s__instance" % name, None)
+    stubs.ExtruderManager._instance = None
+
+    application = stubs.Application()
+    stubs.ExtruderManager()
+    application.getPreferences().addPreference("material_settings/visible_settings", "")
+    application.getPreferences().addPreference("material_settings/profiling_enabled", False)
+    return application
+
+
+@pytest.fixture
+def registry(application) -> stubs.ContainerRegistry:
+    return application.getContainerRegistry()
+
+
+@pytest.fixture
+def definition() -> stubs.DefinitionContainer:
+    """A printer with one setting of each of the types that material values are converted to."""
+    category = stubs.SettingDefinition("material", "category")
+    for key, setting_type, settable_per_extruder in [
+        ("material_flow", "float", True),
+        ("material_print_temperature", "int", True),
+        ("material_crystallinity", "bool", True),
+        ("machine_head_polygon", "polygon", True),
+        ("material_brand_note", "str", True),
+        ("machine_name", "str", False),
+    ]:
+        category.children.append(
+            stubs.SettingDefinition(
+                key, setting_type, settable_per_extruder=settable_per_extruder, parent=category
+            )
+        )
+    return stubs.DefinitionContainer("test_printer", [category])
+
+
+@pytest.fixture
+def global_stack(application, registry, definition) -> stubs.ContainerStack:
+    registry.addContainer(definition)
+    global_stack = stubs.ContainerStack("test_global_stack")
+    global_stack.addContainer(definition)
+    application.setGlobalContainerStack(global_stack)
+    return global_stack
+
+
+@pytest.fixture
+def make_material():
+    """Returns a function that creates a material container with some setting values."""
+
+    def makeMaterial(container_id: str, base_file: str = None, **values) -> stubs.InstanceContainer:
+        container = stubs.InstanceContainer(
+            container_id,
+            {"type": "material", "base_file": base_file or container_id, "definition": "fdmprinter"},
+        )
+        for key, value in values.items():
+            container.setProperty(key, "value", value)
+        container.setDirty(False)
+        return container
+
+    return makeMaterial
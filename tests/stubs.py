@@ -0,0 +1,656 @@
+# Copyright (c) 2026 Aldo Hoeben / fieldOfView
+# The MaterialSettingsPlugin is released under the terms of the AGPLv3 or higher.
+
+"""Lightweight stand-ins for the parts of Uranium and Cura that the plugin uses.
+
+They implement just enough behaviour to drive the plugin's hot paths without a GUI. They
+are not a replacement for Uranium and only exist for the tests in this folder and the benchmarks.
+"""
+
+import contextlib
+import enum
+import importlib
+import os
+import sys
+import types
+
+from PyQt6.QtCore import QObject, pyqtSignal, pyqtSlot
+
+from typing import Any, Dict, List, Optional
+
+
+class Signal:
+    """Minimal version of UM.Signal.Signal, including postponed emits."""
+
+    def __init__(self) -> None:
+        self._slots = []  # type: List[Any]
+        self._postponed = None  # type: Optional[List[tuple]]
+        self.emit_count = 0
+
+    def connect(self, slot) -> None:
+        self._slots.append(slot)
+
+    def disconnect(self, slot) -> None:
+        try:
+            self._slots.remove(slot)
+        except ValueError:
+            pass
+
+    def emit(self, *args) -> None:
+        if self._postponed is not None:
+            self._postponed.append(args)
+            return
+        self.emit_count += 1
+        for slot in list(self._slots):
+            slot(*args)
+
+    def __call__(self, *args) -> None:
+        self.emit(*args)
+
+
+class CompressTechnique(enum.Enum):
+    NoCompression = 0
+    CompressSingle = 1
+    CompressPerParameterValue = 2
+
+
+@contextlib.contextmanager
+def postponeSignals(*signals, compress=CompressTechnique.NoCompression):
+    for signal in signals:
+        signal._postponed = []
+    try:
+        yield
+    finally:
+        for signal in signals:
+            postponed = signal._postponed
+            signal._postponed = None
+            if compress == CompressTechnique.CompressSingle and postponed:
+                postponed = postponed[-1:]
+            elif compress == CompressTechnique.CompressPerParameterValue:
+                postponed = list(dict.fromkeys(postponed))
+            for args in postponed:
+                signal.emit(*args)
+
+
+class SettingFunction:
+    def __init__(self, code: str) -> None:
+        self._code = code
+
+    def __str__(self) -> str:
+        return "=" + self._code
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, SettingFunction) and other._code == self._code
+
+    def __hash__(self) -> int:
+        return hash(self._code)
+
+    def __call__(self, value_provider: Any, context: Any = None) -> Any:
+        class Values(dict):
+            def __missing__(self, name: str) -> Any:
+                return value_provider.getProperty(name, "value", context)
+
+        try:
+            return eval(self._code, {"__builtins__": {"max": max, "min": min, "round": round}}, Values())
+        except Exception:
+            return None
+
+
+class ValidatorState(enum.Enum):
+    Exception = "Exception"
+    Unknown = "Unknown"
+    Valid = "Valid"
+    Invalid = "Invalid"
+    MinimumError = "MinimumError"
+    MinimumWarning = "MinimumWarning"
+    MaximumError = "MaximumError"
+    MaximumWarning = "MaximumWarning"
+
+
+class Validator:
+    def __init__(self, key: str) -> None:
+        self._key = key
+
+    def __call__(self, stack: "ContainerStack") -> ValidatorState:
+        value = stack.getProperty(self._key, "value")
+        if isinstance(value, SettingFunction):
+            return ValidatorState.Unknown
+        minimum_value = stack.getProperty(self._key, "minimum_value")
+        if minimum_value is not None and value < minimum_value:
+            return ValidatorState.MinimumError
+        maximum_value = stack.getProperty(self._key, "maximum_value")
+        if maximum_value is not None and value > maximum_value:
+            return ValidatorState.MaximumError
+        return ValidatorState.Valid
+
+
+class RelationType(enum.IntEnum):
+    RequiresTarget = 1
+    RequiredByTarget = 2
+
+
+class SettingRelation:
+    def __init__(self, owner: "SettingDefinition", target: "SettingDefinition", relation_type: RelationType) -> None:
+        self.owner = owner
+        self.target = target
+        self.type = relation_type
+
+
+class SettingDefinition:
+    def __init__(
+        self,
+        key: str,
+        setting_type: str = "float",
+        settable_per_extruder: bool = True,
+        resolve: Optional[str] = None,
+        default_value: Any = 0,
+        label: str = "",
+        description: str = "",
+        parent: Optional["SettingDefinition"] = None,
+    ) -> None:
+        self.key = key
+        self.type = setting_type
+        self.settable_per_extruder = settable_per_extruder
+        self.resolve = resolve
+        self.default_value = default_value
+        self.label = label or key.replace("_", " ")
+        self.description = description
+        self.parent = parent
+        self.children = []  # type: List[SettingDefinition]
+        self.relations = []  # type: List[SettingRelation]
+        self.minimum_value = None  # type: Optional[float]
+        self.maximum_value = None  # type: Optional[float]
+
+    @staticmethod
+    def getValidatorForType(setting_type: str):
+        return Validator if setting_type in ("int", "float") else None
+
+    def findDefinitions(self, **kwargs) -> List["SettingDefinition"]:
+        result = []
+        for child in self.children:
+            if all(getattr(child, name, None) == value for name, value in kwargs.items()):
+                result.append(child)
+            result.extend(child.findDefinitions(**kwargs))
+        return result
+
+
+class ContainerInterface:
+    pass
+
+
+class DefinitionContainer(ContainerInterface):
+    def __init__(self, container_id: str, definitions: List[SettingDefinition]) -> None:
+        self._id = container_id
+        self.definitions = definitions
+        self._metadata = {"id": container_id, "type": "machine"}
+        self._definitions_by_key = {}  # type: Dict[str, SettingDefinition]
+        for definition in self.findDefinitions():
+            self._definitions_by_key[definition.key] = definition
+        self.propertyChanged = Signal()
+
+    def getId(self) -> str:
+        return self._id
+
+    def getMetaData(self) -> Dict[str, Any]:
+        return self._metadata
+
+    def getMetaDataEntry(self, entry: str, default: Any = None) -> Any:
+        return self._metadata.get(entry, default)
+
+    def findDefinitions(self, **kwargs) -> List[SettingDefinition]:
+        if set(kwargs.keys()) == {"key"}:
+            definition = getattr(self, "_definitions_by_key", {}).get(kwargs["key"])
+            if definition is not None:
+                return [definition]
+        result = []
+        for definition in self.definitions:
+            if all(getattr(definition, name, None) == value for name, value in kwargs.items()):
+                result.append(definition)
+            result.extend(definition.findDefinitions(**kwargs))
+        return result
+
+    def getAllKeys(self):
+        return set(self._definitions_by_key.keys())
+
+    def getProperty(self, key: str, property_name: str, context=None) -> Any:
+        definition = self._definitions_by_key.get(key)
+        if definition is None:
+            return None
+        if property_name == "value":
+            return definition.default_value
+        return getattr(definition, property_name, None)
+
+    def isReadOnly(self) -> bool:
+        return True
+
+
+class InstanceContainer(ContainerInterface):
+    def __init__(self, container_id: str, metadata: Optional[Dict[str, Any]] = None) -> None:
+        self._id = container_id
+        self._metadata = dict(metadata or {})
+        self._metadata["id"] = container_id
+        self._values = {}  # type: Dict[str, Any]
+        self._dirty = False
+        self._read_only = False
+        self.propertyChanged = Signal()
+        self.dirty_count = 0
+
+    def getId(self) -> str:
+        return self._id
+
+    def getMetaData(self) -> Dict[str, Any]:
+        return self._metadata
+
+    def getMetaDataEntry(self, entry: str, default: Any = None) -> Any:
+        return self._metadata.get(entry, default)
+
+    def getName(self) -> str:
+        return self._metadata.get("name", self._id)
+
+    def getAllKeys(self):
+        return set(self._values.keys())
+
+    def getProperty(self, key: str, property_name: str, context=None) -> Any:
+        if property_name == "value":
+            return self._values.get(key)
+        if property_name == "state" and key in self._values:
+            return "InstanceState.User"
+        return None
+
+    def setProperty(self, key: str, property_name: str, property_value: Any, container=None, set_from_cache=False) -> None:
+        if isinstance(property_value, str) and property_value.startswith("="):
+            property_value = SettingFunction(property_value[1:])
+        self._values[key] = property_value
+        if not set_from_cache:
+            self.setDirty(True)
+            self.propertyChanged.emit(key, property_name)
+
+    def removeInstance(self, key: str, postpone_emit: bool = False) -> None:
+        if self._values.pop(key, None) is not None:
+            self.propertyChanged.emit(key, "value")
+
+    def isReadOnly(self) -> bool:
+        return self._read_only
+
+    def setDirty(self, dirty: bool) -> None:
+        if dirty:
+            self.dirty_count += 1
+        self._dirty = dirty
+
+    def isDirty(self) -> bool:
+        return self._dirty
+
+
+class ContainerStack(ContainerInterface):
+    def __init__(self, stack_id: str) -> None:
+        self._id = stack_id
+        self._containers = []  # type: List[ContainerInterface]
+        self._postponed_emits = []  # type: List[tuple]
+        self._dirty = False
+        self._metadata = {"id": stack_id}
+        self.containersChanged = Signal()
+        self.propertyChanged = Signal()
+        self.propertiesChanged = Signal()
+        # The extruder stacks of a global stack
+        self.extruderList = []  # type: List[ContainerStack]
+
+    def getId(self) -> str:
+        return self._id
+
+    @property
+    def id(self) -> str:
+        return self._id
+
+    @property
+    def material(self) -> Optional[ContainerInterface]:
+        for container in self._containers:
+            if container.getMetaDataEntry("type") == "material":
+                return container
+        return None
+
+    def getMetaData(self) -> Dict[str, Any]:
+        return self._metadata
+
+    def getMetaDataEntry(self, entry: str, default: Any = None) -> Any:
+        return self._metadata.get(entry, default)
+
+    def getContainers(self) -> List[ContainerInterface]:
+        return self._containers[:]
+
+    def getContainer(self, index: int) -> ContainerInterface:
+        return self._containers[index]
+
+    def getTop(self) -> Optional[ContainerInterface]:
+        return self._containers[0] if self._containers else None
+
+    def getBottom(self) -> Optional[ContainerInterface]:
+        return self._containers[-1] if self._containers else None
+
+    def addContainer(self, container: ContainerInterface) -> None:
+        self._containers.insert(0, container)
+        container.propertyChanged.connect(self._onContainerPropertyChanged)
+        self.containersChanged.emit(container)
+
+    def removeContainer(self, index: int = 0) -> None:
+        container = self._containers.pop(index)
+        container.propertyChanged.disconnect(self._onContainerPropertyChanged)
+        self.containersChanged.emit(container)
+
+    def replaceContainer(self, index: int, container: ContainerInterface, postpone_emit: bool = False) -> None:
+        self._containers[index].propertyChanged.disconnect(self._onContainerPropertyChanged)
+        container.propertyChanged.connect(self._onContainerPropertyChanged)
+        self._containers[index] = container
+        if postpone_emit:
+            self._postponed_emits.append((self.containersChanged, container))
+        else:
+            self.containersChanged.emit(container)
+
+    def _onContainerPropertyChanged(self, key: str, property_name: str) -> None:
+        self.propertyChanged.emit(key, property_name)
+        self.propertiesChanged.emit(key, {property_name})
+
+    def sendPostponedEmits(self) -> None:
+        while self._postponed_emits:
+            signal, container = self._postponed_emits.pop(0)
+            signal.emit(container)
+
+    def getProperty(self, key: str, property_name: str, context=None) -> Any:
+        for container in self._containers:
+            value = container.getProperty(key, property_name)
+            if value is not None:
+                return value
+        return None
+
+    def getSettingDefinition(self, key: str) -> Optional[SettingDefinition]:
+        definitions = self.getBottom().findDefinitions(key=key)
+        return definitions[0] if definitions else None
+
+    def setDirty(self, dirty: bool) -> None:
+        self._dirty = dirty
+
+    def isReadOnly(self) -> bool:
+        return False
+
+
+class ContainerRegistry:
+    """Registry with a per-query cache and lazily loaded containers, like the one in Uranium."""
+
+    def __init__(self) -> None:
+        self._containers = {}  # type: Dict[str, ContainerInterface]
+        # Containers whose metadata is known, but that are only "loaded" when they are queried
+        self._unloaded_containers = {}  # type: Dict[str, ContainerInterface]
+        self._query_cache = {}  # type: Dict[Any, List[ContainerInterface]]
+        self.load_count = 0
+        self.query_count = 0
+        self.save_count = 0
+        self.containerAdded = Signal()
+        self.containerRemoved = Signal()
+        self.containerLoadComplete = Signal()
+
+    def addContainer(self, container: ContainerInterface) -> None:
+        self._containers[container.getId()] = container
+        self._query_cache.clear()
+        self.containerAdded.emit(container)
+
+    def addUnloadedContainer(self, container: ContainerInterface) -> None:
+        self._unloaded_containers[container.getId()] = container
+        self._query_cache.clear()
+
+    def isLoaded(self, container_id: str) -> bool:
+        return container_id in self._containers
+
+    def removeContainer(self, container_id: str) -> None:
+        container = self._containers.pop(container_id, None)
+        self._unloaded_containers.pop(container_id, None)
+        self._query_cache.clear()
+        if container is not None:
+            self.containerRemoved.emit(container)
+
+    def _load(self, container: ContainerInterface) -> None:
+        container_id = container.getId()
+        del self._unloaded_containers[container_id]
+        self.load_count += 1
+        self.addContainer(container)
+        self.containerLoadComplete.emit(container_id)
+
+    def _matches(self, container_type, kwargs) -> List[ContainerInterface]:
+        if set(kwargs.keys()) == {"id"}:
+            container = self._containers.get(kwargs["id"], self._unloaded_containers.get(kwargs["id"]))
+            return [container] if container is not None and isinstance(container, container_type) else []
+
+        cache_key = (container_type, frozenset(kwargs.items()))
+        try:
+            return self._query_cache[cache_key]
+        except KeyError:
+            pass
+        result = [
+            container
+            for containers in (self._containers, self._unloaded_containers)
+            for container in containers.values()
+            if isinstance(container, container_type)
+            and all(container.getMetaDataEntry(key) == value for key, value in kwargs.items())
+        ]
+        self._query_cache[cache_key] = result
+        return result
+
+    def _query(self, container_type, kwargs) -> List[ContainerInterface]:
+        self.query_count += 1
+        result = self._matches(container_type, kwargs)
+        for container in result:
+            if container.getId() in self._unloaded_containers:
+                self._load(container)
+        return result
+
+    @contextlib.contextmanager
+    def lockFile(self):
+        yield
+
+    def saveContainer(self, container: ContainerInterface) -> None:
+        if container.isDirty():
+            self.save_count += 1
+            container.setDirty(False)
+
+    def findContainers(self, **kwargs) -> List[ContainerInterface]:
+        return self._query(ContainerInterface, kwargs)
+
+    def findInstanceContainers(self, **kwargs) -> List[InstanceContainer]:
+        return self._query(InstanceContainer, kwargs)
+
+    def findContainerStacks(self, **kwargs) -> List[ContainerStack]:
+        return self._query(ContainerStack, kwargs)
+
+    def findInstanceContainersMetadata(self, **kwargs) -> List[Dict[str, Any]]:
+        self.query_count += 1
+        return [container.getMetaData() for container in self._matches(InstanceContainer, kwargs)]
+
+
+class Preferences:
+    def __init__(self) -> None:
+        self._values = {}  # type: Dict[str, Any]
+        self._defaults = {}  # type: Dict[str, Any]
+        self.write_count = 0
+
+    def addPreference(self, key: str, default_value: Any) -> None:
+        self._defaults[key] = default_value
+        self._values.setdefault(key, default_value)
+
+    def getValue(self, key: str) -> Any:
+        return self._values.get(key)
+
+    def setValue(self, key: str, value: Any) -> None:
+        self.write_count += 1
+        self._values[key] = value
+
+    def resetPreference(self, key: str) -> None:
+        self._values[key] = self._defaults.get(key)
+
+
+class PropertyEvaluationContext:
+    def __init__(self, source_stack: Any = None) -> None:
+        self.stack_of_containers = []  # type: List[Any]
+        self.context = {}  # type: Dict[str, Any]
+
+    def pushContainer(self, container: Any) -> None:
+        self.stack_of_containers.append(container)
+
+    def popContainer(self) -> None:
+        self.stack_of_containers.pop()
+
+
+class CuraFormulaFunctions:
+    def createContextForDefaultValueEvaluation(self, source_stack: Any) -> PropertyEvaluationContext:
+        return PropertyEvaluationContext(source_stack)
+
+
+class MachineManager:
+    defaultExtruderPosition = "0"
+
+    def __init__(self, application: "Application") -> None:
+        self._application = application
+
+    @property
+    def activeMachine(self) -> Optional[ContainerStack]:
+        return self._application.getGlobalContainerStack()
+
+
+class Application:
+    _instance = None  # type: Optional[Application]
+
+    def __init__(self) -> None:
+        Application._instance = self
+        self._container_registry = ContainerRegistry()
+        self._preferences = Preferences()
+        self._global_container_stack = None  # type: Optional[ContainerStack]
+        self.globalContainerStackChanged = Signal()
+        self.applicationShuttingDown = Signal()
+        self.engineCreatedSignal = Signal()
+        self._machine_manager = MachineManager(self)
+        self._formula_functions = CuraFormulaFunctions()
+
+    @classmethod
+    def getInstance(cls) -> "Application":
+        return cls._instance
+
+    def getContainerRegistry(self) -> ContainerRegistry:
+        return self._container_registry
+
+    def getPreferences(self) -> Preferences:
+        return self._preferences
+
+    def getMachineManager(self) -> MachineManager:
+        return self._machine_manager
+
+    def getCuraFormulaFunctions(self) -> CuraFormulaFunctions:
+        return self._formula_functions
+
+    def getGlobalContainerStack(self) -> Optional[ContainerStack]:
+        return self._global_container_stack
+
+    def setGlobalContainerStack(self, stack: ContainerStack) -> None:
+        self._global_container_stack = stack
+        self.globalContainerStackChanged.emit()
+
+    def callLater(self, func, *args, **kwargs) -> None:
+        func(*args, **kwargs)
+
+
+class Logger:
+    @staticmethod
+    def log(*args, **kwargs) -> None:
+        pass
+
+    @staticmethod
+    def logException(*args, **kwargs) -> None:
+        pass
+
+
+class SettingDefinitionsModel(QObject):
+    def __init__(self, parent=None, *args, **kwargs) -> None:
+        super().__init__(parent)
+        self._container = None  # type: Optional[DefinitionContainer]
+
+    def _isDefinitionVisible(self, definition, **kwargs) -> bool:
+        return True
+
+    def _update(self) -> None:
+        pass
+
+
+class SettingVisibilityHandler(QObject):
+    visibilityChanged = pyqtSignal()
+
+    def __init__(self, parent=None, *args, **kwargs) -> None:
+        super().__init__(parent)
+        self._visible = set()
+
+    def setVisible(self, visible) -> None:
+        if visible != self._visible:
+            self._visible = visible
+            self.visibilityChanged.emit()
+
+    def getVisible(self):
+        return self._visible.copy()
+
+
+class ExtruderManager:
+    """Like in Cura, the instance only exists once the application created it."""
+
+    _instance = None  # type: Optional[ExtruderManager]
+
+    @classmethod
+    def getInstance(cls) -> Optional["ExtruderManager"]:
+        return cls._instance
+
+    def __init__(self) -> None:
+        ExtruderManager._instance = self
+        self.extrudersChanged = Signal()
+
+    def getActiveExtruderStack(self) -> Optional[ContainerStack]:
+        return None
+
+
+def parseBool(value: Any) -> bool:
+    return value in [True, "True", "true", "Yes", "yes", 1]
+
+
+def _module(name: str, **attributes) -> types.ModuleType:
+    module = types.ModuleType(name)
+    module.__dict__.update(attributes)
+    sys.modules[name] = module
+    return module
+
+
+def install() -> None:
+    """Register the stand-ins under the module names used by the plugin."""
+    for package in ["UM", "UM.Settings", "UM.Settings.Models", "cura", "cura.Settings"]:
+        _module(package, __path__=[])
+
+    _module("UM.Application", Application=Application)
+    _module("UM.Logger", Logger=Logger)
+    _module("UM.Util", parseBool=parseBool)
+    _module("UM.Signal", Signal=Signal, postponeSignals=postponeSignals, CompressTechnique=CompressTechnique)
+    _module("UM.FlameProfiler", pyqtSlot=pyqtSlot)
+    _module("UM.Settings.ContainerStack", ContainerStack=ContainerStack)
+    _module("UM.Settings.ContainerRegistry", ContainerRegistry=ContainerRegistry)
+    _module("UM.Settings.Interfaces", ContainerInterface=ContainerInterface)
+    _module("UM.Settings.InstanceContainer", InstanceContainer=InstanceContainer)
+    _module("UM.Settings.DefinitionContainer", DefinitionContainer=DefinitionContainer)
+    _module("UM.Settings.SettingDefinition", SettingDefinition=SettingDefinition)
+    _module("UM.Settings.SettingFunction", SettingFunction=SettingFunction)
+    _module("UM.Settings.PropertyEvaluationContext", PropertyEvaluationContext=PropertyEvaluationContext)
+    _module("UM.Settings.Validator", ValidatorState=ValidatorState)
+    _module("UM.Settings.SettingRelation", RelationType=RelationType, SettingRelation=SettingRelation)
+    _module("UM.Settings.Models.SettingDefinitionsModel", SettingDefinitionsModel=SettingDefinitionsModel)
+    _module("UM.Settings.Models.SettingVisibilityHandler", SettingVisibilityHandler=SettingVisibilityHandler)
+
+    _module("cura.ApplicationMetadata", CuraSDKVersion="8.0.0")
+    _module("cura.CuraApplication", CuraApplication=Application)
+    _module("cura.Settings.ExtruderManager", ExtruderManager=ExtruderManager)
+
+
+def importPluginModule(name: str) -> types.ModuleType:
+    """Import a module of the plugin without running the plugin's __init__.py."""
+    if "MaterialSettingsPlugin" not in sys.modules:
+        plugin_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        _module("MaterialSettingsPlugin", __path__=[plugin_path])
+    return importlib.import_module("MaterialSettingsPlugin." + name)
@@ -0,0 +1,76 @@
+# Copyright (c) 2026 Aldo Hoeben / fieldOfView
+# The MaterialSettingsPlugin is released under the terms of the AGPLv3 or higher.
+
+import stubs
+
+
+def test_container_id_cache_hits(registry, make_material):
+    ContainerIdCache = stubs.importPluginModule("ContainerIdCache").ContainerIdCache
+    material = make_material("generic_pla")
+    registry.addContainer(material)
+
+    cache = ContainerIdCache.getInstance()
+    assert cache.findContainer("generic_pla") is material
+    assert cache.findContainer("generic_pla") is material
+    assert cache.getStats() == {"size": 1, "hits": 1, "misses": 1}
+
+
+def test_container_id_cache_invalidation(registry, make_material):
+    ContainerIdCache = stubs.importPluginModule("ContainerIdCache").ContainerIdCache
+    cache = ContainerIdCache.getInstance()
+    assert cache.findContainer("generic_pla") is None
+
+    # A container that is added later is found
+    material = make_material("generic_pla")
+    registry.addContainer(material)
+    assert cache.findContainer("generic_pla") is material
+
+    # A container that replaces a cached container with the same id is found
+    replacement = make_material("generic_pla")
+    registry.addContainer(replacement)
+    assert cache.findContainer("generic_pla") is replacement
+
+    registry.removeContainer("generic_pla")
+    assert cache.findContainer("generic_pla") is None
+
+
+def test_container_id_cache_load_complete(registry, make_material):
+    ContainerIdCache = stubs.importPluginModule("ContainerIdCache").ContainerIdCache
+    cache = ContainerIdCache.getInstance()
+    material = make_material("generic_pla")
+    registry.addUnloadedContainer(material)
+
+    assert cache.findContainer("generic_pla") is material
+    assert registry.isLoaded("generic_pla")
+
+    # Loading the container again drops the cached entry, so it is looked up again
+    cache._containers["generic_pla"] = make_material("generic_pla")
+    registry.containerLoadComplete.emit("generic_pla")
+    assert cache.findContainer("generic_pla") is material
+
+
+def test_material_containers_index(registry, make_material):
+    MaterialContainersIndex = stubs.importPluginModule("MaterialContainersIndex").MaterialContainersIndex
+    base = make_material("generic_pla")
+    derived = make_material("generic_pla_0.4", "generic_pla")
+    registry.addContainer(base)
+    registry.addContainer(derived)
+
+    index = MaterialContainersIndex(registry)
+    assert index.getContainers("generic_pla") == [base, derived]
+    query_count = registry.query_count
+    assert index.getContainers("generic_pla") == [base, derived]
+    assert registry.query_count == query_count
+
+    added = make_material("generic_pla_0.6", "generic_pla")
+    registry.addContainer(added)
+    registry.addContainer(make_material("generic_petg"))
+    assert index.getContainers("generic_pla") == [base, derived, added]
+
+    registry.removeContainer("generic_pla_0.4")
+    assert index.getContainers("generic_pla") == [base, added]
+    assert registry.query_count == query_count
+
+    index.clear()
+    assert index.getContainers("generic_pla") == [base, added]
+    assert registry.query_count == query_count + 1
@@ -0,0 +1,91 @@
+# Copyright (c) 2026 Aldo Hoeben / fieldOfView
+# The MaterialSettingsPlugin is released under the terms of the AGPLv3 or higher.
+
+from PyQt6.QtCore import QCoreApplication
+
+import stubs
+
+
+def test_released_stacks_are_reused(registry):
+    CustomStackPool = stubs.importPluginModule("CustomStackPool").CustomStackPool
+    pool = CustomStackPool(registry)
+
+    stack = pool.acquire(["definition", "pla"])
+    assert registry.findContainerStacks(id=stack.getId()) == [stack]
+    pool.release(stack, ["definition", "pla"])
+
+    # The same containers get the same stack back
+    assert pool.acquire(["definition", "pla"]) is stack
+    pool.release(stack, ["definition", "pla"])
+    # Other containers get an idle stack rather than a new one
+    assert pool.acquire(["definition", "petg"]) is stack
+
+    stats = pool.getStats()
+    assert (stats["hits"], stats["misses"], stats["created"]) == (1, 2, 1)
+    assert (stats["in_use"], stats["idle"]) == (1, 0)
+
+
+def test_least_recently_released_stacks_are_evicted(registry):
+    CustomStackPool = stubs.importPluginModule("CustomStackPool").CustomStackPool
+    pool = CustomStackPool(registry, max_idle_stacks=2)
+
+    stacks = [pool.acquire(["material_%d" % index]) for index in range(3)]
+    for index, stack in enumerate(stacks):
+        pool.release(stack, ["material_%d" % index])
+
+    assert registry.findContainerStacks(id=stacks[0].getId()) == []
+    assert pool.acquire(["material_2"]) is stacks[2]
+    stats = pool.getStats()
+    assert (stats["size"], stats["idle"], stats["evicted"]) == (2, 1, 1)
+
+    pool.clear()
+    assert registry.findContainerStacks(id=stacks[1].getId()) == []
+    assert pool.getStats()["evicted"] == 2
+
+
+def test_lease_acquires_lazily_and_releases_once(registry):
+    pool_module = stubs.importPluginModule("CustomStackPool")
+    pool = pool_module.CustomStackPool(registry)
+    lease = pool_module.CustomStackLease(pool)
+    lease.container_ids = ["definition", "pla"]
+    assert not lease.hasStack()
+    assert pool.getStats()["size"] == 0
+
+    stack = lease.getStack()
+    assert lease.hasStack()
+    assert lease.getStack() is stack
+    assert pool.getStats()["in_use"] == 1
+
+    lease.release()
+    lease.release()
+    assert not lease.hasStack()
+    assert (pool.getStats()["in_use"], pool.getStats()["idle"]) == (0, 1)
+    assert pool.acquire(["definition", "pla"]) is stack
+
+
+def test_released_proxy_no_longer_uses_its_stack(registry, global_stack, definition, make_material):
+    CustomStackPool = stubs.importPluginModule("CustomStackPool").CustomStackPool
+    CustomStackProxy = stubs.importPluginModule("CustomStackProxy").CustomStackProxy
+    MaterialContainersIndex = stubs.importPluginModule("MaterialContainersIndex").MaterialContainersIndex
+    MaterialWriteCoalescer = stubs.importPluginModule("MaterialWriteCoalescer").MaterialWriteCoalescer
+    registry.addContainer(make_material("generic_pla", material_flow=95))
+    registry.addContainer(make_material("generic_petg", material_flow=90))
+
+    pool = CustomStackPool(registry)
+    proxy = CustomStackProxy(pool, MaterialWriteCoalescer(registry, MaterialContainersIndex(registry)))
+    proxy.containerIds = [definition.getId(), "generic_pla"]
+    stack = proxy.getStack()
+    assert stack.getProperty("material_flow", "value") == 95
+
+    proxy.releaseStack()
+    assert proxy.getStack() is None
+    assert proxy.stackId == ""
+    assert pool.getStats()["in_use"] == 0
+
+    # QML bindings that change the containers after the release do not touch the pooled stack
+    proxy.containerIds = [definition.getId(), "generic_petg"]
+    QCoreApplication.processEvents()
+    assert proxy.getStack() is None
+    assert stack.getProperty("material_flow", "value") == 95
+    assert pool.acquire([definition.getId(), "generic_pla"]) is stack
+    proxy.deleteLater()
@@ -0,0 +1,70 @@
+# Copyright (c) 2026 Aldo Hoeben / fieldOfView
+# The MaterialSettingsPlugin is released under the terms of the AGPLv3 or higher.
+
+import pytest
+
+import stubs
+
+
+@pytest.fixture
+def comparison_model(registry, global_stack, make_material):
+    for container_id, values in [
+        ("brand_pla_black", {"material_flow": 95, "material_print_temperature": 200}),
+        ("brand_pla_white", {"material_flow": 100, "material_print_temperature": 200}),
+        ("brand_pla_red", {"material_flow": 95, "material_print_temperature": 210}),
+        ("brand_petg_black", {"material_flow": 90}),
+    ]:
+        material = make_material(container_id, **values)
+        material.getMetaData().update(
+            {"brand": "Brand", "material": container_id.split("_")[1].upper(), "name": container_id}
+        )
+        registry.addContainer(material)
+
+    MaterialComparisonModel = stubs.importPluginModule("MaterialComparisonModel").MaterialComparisonModel
+    visibility_handler = stubs.SettingVisibilityHandler()
+    visibility_handler.setVisible({"material_flow", "material_print_temperature", "material_crystallinity"})
+    model = MaterialComparisonModel(registry, visibility_handler)
+    yield model
+    model.deleteLater()
+    visibility_handler.deleteLater()
+
+
+def getRows(model, role):
+    return {
+        model.data(model.index(row, 0), model.KeyRole): model.data(model.index(row, 0), role)
+        for row in range(model.rowCount())
+    }
+
+
+def test_cells_that_differ_from_the_reference_are_marked(comparison_model):
+    comparison_model.compareFamily("brand_pla_red")
+    assert comparison_model.baseFiles == ["brand_pla_black", "brand_pla_red", "brand_pla_white"]
+    assert comparison_model.referenceColumn == 1
+
+    comparison_model.fetchMore()
+    assert getRows(comparison_model, comparison_model.ValuesRole) == {
+        "material_flow": ["95", "95", "100"],
+        "material_print_temperature": ["200", "210", "200"],
+        "material_crystallinity": ["0", "0", "0"],
+    }
+    assert getRows(comparison_model, comparison_model.DifferingRole) == {
+        "material_flow": [False, False, True],
+        "material_print_temperature": [True, False, True],
+        "material_crystallinity": [False, False, False],
+    }
+    assert getRows(comparison_model, comparison_model.DiffersRole) == {
+        "material_flow": True,
+        "material_print_temperature": True,
+        "material_crystallinity": False,
+    }
+
+    comparison_model.showOnlyDifferences = True
+    assert comparison_model.rowCount() == 2
+
+
+def test_first_material_is_the_default_reference(comparison_model):
+    comparison_model.compare(["brand_pla_white", "brand_pla_black"])
+    assert comparison_model.referenceColumn == 0
+
+    comparison_model.fetchMore()
+    assert getRows(comparison_model, comparison_model.DifferingRole)["material_flow"] == [False, True]
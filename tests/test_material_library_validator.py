@@ -0,0 +1,51 @@
+# Copyright (c) 2026 Aldo Hoeben / fieldOfView
+# The MaterialSettingsPlugin is released under the terms of the AGPLv3 or higher.
+
+import pytest
+
+import stubs
+
+
+@pytest.fixture
+def validator(registry, global_stack):
+    MaterialLibraryValidator = stubs.importPluginModule("MaterialLibraryValidator").MaterialLibraryValidator
+    validator = MaterialLibraryValidator(registry)
+    yield validator
+    validator.cancel()
+    validator.deleteLater()
+
+
+def validate(validator):
+    validator.start()
+    while validator.running:
+        validator._validateNextTasks()
+
+
+def test_only_materials_the_machine_can_use_are_validated(registry, definition, validator, make_material):
+    definition.findDefinitions(key="material_flow")[0].maximum_value = 150
+    registry.addContainer(make_material("generic_pla", material_flow=200))
+    registry.addContainer(make_material("generic_petg", material_flow=100))
+    other_printer_pla = make_material("other_printer_pla", material_flow=200)
+    other_printer_pla.getMetaData()["definition"] = "other_printer"
+    registry.addContainer(other_printer_pla)
+
+    validate(validator)
+    assert validator.totalCount == 2
+    assert validator.finishedCount == 2
+    assert [(result["base_file"], result["errors"]) for result in validator.results] == [("generic_pla", 1)]
+
+
+def test_machine_materials_are_validated_in_their_variant(registry, global_stack, definition, validator, make_material):
+    definition.getMetaData()["has_machine_materials"] = True
+    for variant_name in ["0.4mm", "0.8mm"]:
+        registry.addContainer(
+            stubs.InstanceContainer(variant_name, {"type": "variant", "definition": "test_printer", "name": variant_name})
+        )
+    registry.addContainer(make_material("generic_pla"))
+    for variant_name in ["0.4mm", "0.8mm"]:
+        material = make_material("generic_pla_%s" % variant_name, "generic_pla")
+        material.getMetaData().update({"definition": "test_printer", "variant_name": variant_name})
+        registry.addContainer(material)
+
+    tasks = validator._createTasks(global_stack, None)
+    assert sorted((container_id, variant.getName()) for _, container_id, variant in tasks) == [("generic_pla_0.4mm", "0.4mm"), ("generic_pla_0.8mm", "0.8mm")]
@@ -0,0 +1,97 @@
+# Copyright (c) 2026 Aldo Hoeben / fieldOfView
+# The MaterialSettingsPlugin is released under the terms of the AGPLv3 or higher.
+
+import pytest
+from PyQt6.QtCore import QCoreApplication
+
+import stubs
+
+
+@pytest.fixture
+def overrides_index(registry):
+    MaterialOverridesIndex = stubs.importPluginModule("MaterialOverridesIndex").MaterialOverridesIndex
+    visibility_handler = stubs.SettingVisibilityHandler()
+    visibility_handler.setVisible({"material_flow", "material_print_temperature"})
+    index = MaterialOverridesIndex(registry, visibility_handler)
+    yield index
+    index.deleteLater()
+    visibility_handler.deleteLater()
+
+
+def test_only_loaded_containers_are_indexed(registry, overrides_index, make_material):
+    registry.addContainer(make_material("generic_pla", material_flow=95))
+    registry.addUnloadedContainer(make_material("generic_petg", material_flow=90))
+
+    assert overrides_index.getOverridingMaterials("material_flow") == {"generic_pla": 95}
+    assert not registry.isLoaded("generic_petg")
+    # The results are marked as partial
+    assert overrides_index.unloadedMaterialsCount == 1
+
+    # Containers are added when the registry loads them
+    registry.findContainers(id="generic_petg")
+    assert overrides_index.getOverridingMaterials("material_flow") == {"generic_pla": 95, "generic_petg": 90}
+    assert overrides_index.isOverridden("generic_petg", "material_flow")
+    assert overrides_index.unloadedMaterialsCount == 0
+
+
+def test_unloaded_materials_are_counted_per_material(registry, overrides_index, make_material):
+    registry.addUnloadedContainer(make_material("generic_pla"))
+    registry.addUnloadedContainer(make_material("generic_pla_0.4", "generic_pla"))
+    registry.addUnloadedContainer(make_material("generic_petg"))
+    assert overrides_index.unloadedMaterialsCount == 2
+
+    registry.findContainers(id="generic_pla")
+    assert overrides_index.unloadedMaterialsCount == 2
+    registry.findContainers(id="generic_pla_0.4")
+    assert overrides_index.unloadedMaterialsCount == 1
+    registry.findContainers(id="generic_petg")
+    assert overrides_index.unloadedMaterialsCount == 0
+
+
+def test_property_changes_update_the_index(registry, overrides_index, make_material):
+    material = make_material("generic_pla", material_flow=95)
+    derived = make_material("generic_pla_0.4", "generic_pla")
+    registry.addContainer(material)
+    registry.addContainer(derived)
+    assert overrides_index.getOverriddenKeys("generic_pla_0.4") == ["material_flow"]
+    revision = overrides_index.revision
+
+    derived.setProperty("material_print_temperature", "value", 210)
+    material.setProperty("material_flow", "value", 98)
+    assert overrides_index.getOverridingMaterials("material_print_temperature") == {"generic_pla": 210}
+    assert overrides_index.getOverridingMaterials("material_flow") == {"generic_pla": 98}
+    assert overrides_index.getOverriddenKeys("generic_pla") == ["material_flow", "material_print_temperature"]
+
+    # Notifications are sent once per batch of changes
+    QCoreApplication.processEvents()
+    assert overrides_index.revision == revision + 1
+
+    material.removeInstance("material_flow")
+    assert overrides_index.getOverridingMaterialsCount("material_flow") == 0
+    assert not overrides_index.isOverridden("generic_pla", "material_flow")
+
+
+def test_removed_containers_are_dropped(registry, overrides_index, make_material):
+    material = make_material("generic_pla", material_flow=95)
+    derived = make_material("generic_pla_0.4", "generic_pla", material_flow=96)
+    registry.addContainer(material)
+    registry.addContainer(derived)
+    assert overrides_index.getOverridingMaterials("material_flow") == {"generic_pla": 95}
+
+    registry.removeContainer("generic_pla")
+    assert overrides_index.getOverridingMaterials("material_flow") == {"generic_pla": 96}
+    registry.removeContainer("generic_pla_0.4")
+    assert overrides_index.getOverridingMaterialsCount("material_flow") == 0
+
+    # Changes to removed containers are no longer tracked
+    derived.setProperty("material_flow", "value", 97)
+    assert overrides_index.getOverridingMaterialsCount("material_flow") == 0
+
+
+def test_visibility_changes(registry, overrides_index, make_material):
+    registry.addContainer(make_material("generic_pla", material_flow=95, material_crystallinity=True))
+    assert overrides_index.getOverriddenKeys("generic_pla") == ["material_flow"]
+
+    overrides_index._visibility_handler.setVisible({"material_crystallinity"})
+    assert overrides_index.getOverriddenKeys("generic_pla") == ["material_crystallinity"]
+    assert overrides_index.getOverridingMaterialsCount("material_flow") == 0
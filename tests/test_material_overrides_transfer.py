@@ -0,0 +1,152 @@
+# Copyright (c) 2026 Aldo Hoeben / fieldOfView
+# The MaterialSettingsPlugin is released under the terms of the AGPLv3 or higher.
+
+import types
+
+import pytest
+
+import stubs
+
+VALUES = {
+    "material_flow": 95.5,
+    "material_print_temperature": 210,
+    "material_crystallinity": True,
+    "machine_head_polygon": [[-20, 10], [10, 10]],
+    "material_brand_note": "Dry before use",
+}
+
+
+@pytest.fixture
+def materials(registry, global_stack, make_material):
+    materials = [
+        make_material("generic_pla", **VALUES),
+        make_material("generic_pla_0.4", "generic_pla", **VALUES),
+        make_material("generic_petg", material_flow="=material_print_temperature / 2"),
+    ]
+    for material in materials:
+        registry.addContainer(material)
+    return materials
+
+
+@pytest.fixture
+def transfer(registry):
+    core = stubs.importPluginModule("MaterialSettingsCore").MaterialSettingsCore(registry)
+    MaterialOverridesTransfer = stubs.importPluginModule("MaterialOverridesTransfer").MaterialOverridesTransfer
+    return MaterialOverridesTransfer(registry, core)
+
+
+def getValues(container):
+    return {key: container.getProperty(key, "value") for key in container.getAllKeys()}
+
+
+@pytest.mark.parametrize("file_name", ["overrides.jsonl", "overrides.csv"])
+def test_round_trip(tmp_path, materials, transfer, file_name):
+    file_path = str(tmp_path / file_name)
+    keys = transfer._core.getMaterialSettableKeys()
+    assert transfer.exportToFile(file_path, keys) == len(VALUES) + 1
+
+    expected_values = [getValues(material) for material in materials]
+    for material in materials:
+        for key in list(material.getAllKeys()):
+            material.removeInstance(key)
+
+    report = transfer.importFromFile(file_path)
+    assert (report["records"], report["skipped"], report["containers"]) == (len(VALUES) + 1, 0, 3)
+    # CSV values are converted to the type of their setting
+    assert [getValues(material) for material in materials] == expected_values
+    assert isinstance(materials[2].getProperty("material_flow", "value"), stubs.SettingFunction)
+
+
+def test_csv_values_are_converted(tmp_path, materials, transfer):
+    file_path = tmp_path / "overrides.csv"
+    file_path.write_text(
+        "base_file,key,value\n"
+        "generic_petg,material_flow,90\n"
+        "generic_petg,material_print_temperature,230\n"
+        "generic_petg,material_crystallinity,0\n"
+        'generic_petg,machine_head_polygon,"[[1, 2], [3, 4]]"\n'
+        "generic_petg,material_brand_note,90\n"
+    )
+    transfer.importFromFile(str(file_path))
+
+    assert getValues(materials[2]) == {
+        "material_flow": 90.0,
+        "material_print_temperature": 230,
+        "material_crystallinity": False,
+        "machine_head_polygon": [[1, 2], [3, 4]],
+        "material_brand_note": "90",
+    }
+    assert isinstance(materials[2].getProperty("material_flow", "value"), float)
+
+
+@pytest.mark.parametrize(
+    "file_name, contents, message",
+    [
+        ("overrides.csv", "base_file,key,value\ngeneric_pla,material_flow,90\ngeneric_pla,material_print_temperature,hot\n", "Line 3"),
+        ("overrides.csv", "base_file,key,value\ngeneric_pla,material_crystallinity,maybe\n", "Line 2"),
+        ("overrides.csv", "base_file,key\ngeneric_pla,material_flow\n", "Line 2 has no value"),
+        ("overrides.jsonl", '{"base_file": "generic_pla", "key": "material_flow", "value": 90}\n{"base_file": "generic_pla"\n', "Line 2 is not valid JSON"),
+        ("overrides.jsonl", '{"base_file": "generic_pla", "key": "material_flow", "value": 90}\n\n["generic_pla"]\n', "Line 3"),
+        ("overrides.jsonl", '{"base_file": "", "key": "material_flow", "value": 90}\n', "invalid base_file"),
+        ("overrides.jsonl", '{"base_file": "generic_pla", "key": 5, "value": 90}\n', "invalid key"),
+    ],
+)
+def test_malformed_files_change_nothing(tmp_path, materials, transfer, file_name, contents, message):
+    file_path = tmp_path / file_name
+    file_path.write_text(contents)
+
+    with pytest.raises(ValueError, match=message):
+        transfer.importFromFile(str(file_path))
+    assert materials[0].getProperty("material_flow", "value") == 95.5
+    assert not materials[0].isDirty()
+
+
+def test_malformed_records_change_nothing(materials, transfer):
+    for records in [
+        [("generic_pla", "material_flow", 90), ("generic_pla", "material_flow")],
+        [("generic_pla", "material_flow", 90), ("generic_pla", None, 90)],
+        [("generic_pla", "material_flow", 90), "generic_pla"],
+    ]:
+        with pytest.raises(ValueError, match="2"):
+            transfer.importRecords(records)
+    assert materials[0].getProperty("material_flow", "value") == 95.5
+
+
+def test_unknown_keys_and_materials_are_skipped(materials, transfer):
+    report = transfer.importRecords(
+        [
+            ("generic_pla", "material_flow", 90.0),
+            ("generic_pla", "machine_name", "Printer"),
+            ("generic_pla", "no_such_setting", 1),
+            ("generic_abs", "material_flow", 90.0),
+        ]
+    )
+
+    assert (report["records"], report["skipped"], report["containers"]) == (4, 3, 2)
+    assert [(failure["base_file"], failure["key"], failure["reason"]) for failure in report["failures"]] == [
+        ("generic_pla", "machine_name", "not settable per material"),
+        ("generic_pla", "no_such_setting", "not settable per material"),
+        ("generic_abs", "material_flow", "unknown material"),
+    ]
+    assert materials[0].getProperty("material_flow", "value") == 90.0
+    assert materials[0].getProperty("machine_name", "value") is None
+
+
+@pytest.mark.parametrize("file_name", ["overrides.jsonl", "overrides.csv"])
+def test_files_are_applied_as_a_stream(tmp_path, materials, transfer, file_name):
+    file_path = str(tmp_path / file_name)
+    transfer.exportToFile(file_path, transfer._core.getMaterialSettableKeys())
+
+    apply_overrides = transfer._core.applyOverrides
+    applied_records = []
+
+    def applyOverrides(records, chunk_size):
+        # The records are read from the file while they are applied
+        assert isinstance(records, types.GeneratorType)
+        records = list(records)
+        applied_records.extend(records)
+        return apply_overrides(records, chunk_size)
+
+    transfer._core.applyOverrides = applyOverrides
+    transfer.importFromFile(file_path)
+    assert len(applied_records) == len(VALUES) + 1
@@ -0,0 +1,65 @@
+# Copyright (c) 2026 Aldo Hoeben / fieldOfView
+# The MaterialSettingsPlugin is released under the terms of the AGPLv3 or higher.
+
+import pytest
+
+import stubs
+
+
+@pytest.fixture
+def prefetcher(registry, global_stack):
+    MaterialPrefetcher = stubs.importPluginModule("MaterialPrefetcher").MaterialPrefetcher
+    prefetcher = MaterialPrefetcher(registry)
+    yield prefetcher
+    prefetcher.cancel()
+    prefetcher.deleteLater()
+
+
+def addMaterial(registry, make_material, container_id, base_file=None, **metadata):
+    material = make_material(container_id, base_file)
+    material.getMetaData().update(metadata)
+    registry.addUnloadedContainer(material)
+
+
+def prefetch(prefetcher, current_base_file=""):
+    prefetcher.start(current_base_file)
+    while prefetcher.running:
+        prefetcher._loadNextMaterial()
+
+
+def test_only_materials_for_the_filament_diameter_are_loaded(registry, global_stack, prefetcher, make_material):
+    addMaterial(registry, make_material, "generic_pla", approximate_diameter="3")
+    addMaterial(registry, make_material, "generic_pla_175", approximate_diameter="2")
+    addMaterial(registry, make_material, "other_printer_pla", definition="other_printer")
+
+    user_changes = stubs.InstanceContainer("test_user_changes", {"type": "user"})
+    user_changes.setProperty("material_diameter", "value", 2.85)
+    global_stack.addContainer(user_changes)
+
+    prefetch(prefetcher, "generic_pla")
+    assert prefetcher.getStats() == {"total": 1, "finished": 1, "pending": 0}
+    assert registry.isLoaded("generic_pla")
+    assert not registry.isLoaded("generic_pla_175")
+    assert not registry.isLoaded("other_printer_pla")
+
+
+def test_machine_materials_replace_the_base_materials(registry, definition, prefetcher, make_material):
+    definition.getMetaData().update(
+        {"has_machine_materials": True, "exclude_materials": ["generic_petg"]}
+    )
+    addMaterial(registry, make_material, "generic_pla")
+    addMaterial(registry, make_material, "generic_pla_test_printer", "generic_pla", definition="test_printer")
+    addMaterial(registry, make_material, "generic_petg")
+
+    prefetch(prefetcher)
+    assert prefetcher.getStats()["total"] == 1
+    assert registry.isLoaded("generic_pla_test_printer")
+    assert not registry.isLoaded("generic_petg")
+
+
+def test_nothing_is_loaded_without_compatible_materials(registry, prefetcher, make_material):
+    addMaterial(registry, make_material, "other_printer_pla", definition="other_printer")
+
+    prefetch(prefetcher)
+    assert prefetcher.getStats()["total"] == 0
+    assert not registry.isLoaded("other_printer_pla")
@@ -0,0 +1,142 @@
+# Copyright (c) 2026 Aldo Hoeben / fieldOfView
+# The MaterialSettingsPlugin is released under the terms of the AGPLv3 or higher.
+
+import pytest
+
+import stubs
+
+
+def makeExtruderStack(stack_id, definition, material):
+    extruder_stack = stubs.ContainerStack(stack_id)
+    extruder_stack.addContainer(definition)
+    extruder_stack.addContainer(stubs.InstanceContainer(stack_id + "_variant", {"type": "variant"}))
+    extruder_stack.addContainer(material)
+    extruder_stack.addContainer(stubs.InstanceContainer(stack_id + "_user", {"type": "user"}))
+    return extruder_stack
+
+
+@pytest.fixture
+def extruder_stack(global_stack, definition, make_material):
+    extruder_stack = makeExtruderStack(
+        "test_extruder_0",
+        definition,
+        make_material("generic_pla", material_flow=95, material_print_temperature="=material_flow + 100"),
+    )
+    global_stack.extruderList = [extruder_stack]
+    return extruder_stack
+
+
+@pytest.fixture
+def material_value(application, global_stack, extruder_stack):
+    MaterialValueFunction = stubs.importPluginModule("MaterialValueFunction").MaterialValueFunction
+    material_value = MaterialValueFunction.getInstance()
+    # The extruders of the active machine are connected when the global stack changes
+    application.globalContainerStackChanged.emit()
+    yield material_value
+    material_value.clear()
+
+
+def test_values_are_resolved_from_the_material_down(material_value, extruder_stack):
+    extruder_stack.getTop().setProperty("material_flow", "value", 50)
+
+    # The user value on top of the material is ignored
+    assert material_value(0, "material_flow") == 95
+    # Formulas are evaluated
+    assert material_value(0, "material_print_temperature") == 150
+    # The default extruder is used for -1
+    assert material_value(-1, "material_flow") == 95
+    # Values that are not set in the material come from the containers below it
+    assert material_value(0, "material_crystallinity") == 0
+    assert material_value(1, "material_flow") is None
+
+
+def test_values_are_cached(material_value, extruder_stack):
+    assert material_value(0, "material_flow") == 95
+    assert material_value._cache[(0, "material_flow")] == (1, 95)
+
+    # A cached value does not look at the containers again
+    extruder_stack.material._values["material_flow"] = 90
+    assert material_value(0, "material_flow") == 95
+
+
+def test_material_changes_invalidate_the_cache(material_value, extruder_stack):
+    assert material_value(0, "material_flow") == 95
+    assert material_value(0, "material_crystallinity") == 0
+
+    extruder_stack.material.setProperty("material_flow", "value", 90)
+    assert (0, "material_flow") not in material_value._cache
+    assert (0, "material_crystallinity") in material_value._cache
+    assert material_value(0, "material_flow") == 90
+
+    # Containers below the material are watched too
+    extruder_stack.getContainer(2).setProperty("material_crystallinity", "value", True)
+    assert material_value(0, "material_crystallinity") is True
+
+    # Changes to the containers above the material are not relevant
+    extruder_stack.getTop().setProperty("material_flow", "value", 50)
+    assert (0, "material_flow") in material_value._cache
+
+
+def test_container_swaps_invalidate_the_cache(material_value, extruder_stack, make_material):
+    assert material_value(0, "material_flow") == 95
+
+    old_material = extruder_stack.material
+    new_material = make_material("generic_petg", material_flow=90)
+    extruder_stack.replaceContainer(1, new_material)
+    assert material_value._cache == {}
+    assert material_value(0, "material_flow") == 90
+
+    # The new material is watched, the old one is not
+    new_material.setProperty("material_flow", "value", 85)
+    assert material_value(0, "material_flow") == 85
+    old_material.setProperty("material_flow", "value", 70)
+    assert (0, "material_flow") in material_value._cache
+
+
+def test_global_stack_changes_invalidate_the_cache(application, material_value, definition, make_material):
+    assert material_value(0, "material_flow") == 95
+
+    other_global_stack = stubs.ContainerStack("other_global_stack")
+    other_global_stack.addContainer(definition)
+    other_extruder_stack = makeExtruderStack("other_extruder_0", definition, make_material("generic_abs", material_flow=80))
+    other_global_stack.extruderList = [other_extruder_stack]
+    application.setGlobalContainerStack(other_global_stack)
+
+    assert material_value._cache == {}
+    assert material_value(0, "material_flow") == 80
+    assert material_value._cache[(0, "material_flow")] == (1, 80)
+
+
+def test_values_of_unconnected_stacks_are_not_cached(material_value, global_stack, definition, make_material):
+    # The extruders were changed, but extrudersChanged was not emitted yet
+    global_stack.extruderList = [
+        global_stack.extruderList[0],
+        makeExtruderStack("test_extruder_1", definition, make_material("generic_abs", material_flow=80)),
+    ]
+    assert material_value(1, "material_flow") == 80
+    assert (1, "material_flow") not in material_value._cache
+
+    stubs.ExtruderManager.getInstance().extrudersChanged.emit()
+    assert material_value(1, "material_flow") == 80
+    assert (1, "material_flow") in material_value._cache
+
+
+def test_extruder_manager_is_connected_once_it_exists(application, definition, make_material):
+    # Plugins are loaded before Cura creates its ExtruderManager
+    stubs.ExtruderManager._instance = None
+    MaterialValueFunction = stubs.importPluginModule("MaterialValueFunction").MaterialValueFunction
+    material_value = MaterialValueFunction.getInstance()
+    material_value._onGlobalStackChanged()
+
+    extruder_manager = stubs.ExtruderManager()
+    global_stack = stubs.ContainerStack("test_global_stack")
+    global_stack.addContainer(definition)
+    application.setGlobalContainerStack(global_stack)
+
+    global_stack.extruderList = [makeExtruderStack("test_extruder_0", definition, make_material("generic_pla", material_flow=95))]
+    assert material_value(0, "material_flow") == 95
+    assert material_value._cache == {}
+    extruder_manager.extrudersChanged.emit()
+    assert material_value(0, "material_flow") == 95
+    assert (0, "material_flow") in material_value._cache
+    material_value.clear()